@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 from tortoise import Tortoise
 
 
@@ -19,6 +19,59 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRY_IN_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRY_IN_DAYS: int = 7
 
+    # Project generation
+    CODER_MAX_WORKERS: int = 4
+    GENERATION_WORKERS: int = 2
+    GENERATION_POLL_INTERVAL_SECONDS: float = 5.0
+    GENERATION_STALE_AFTER_MINUTES: int = 30
+    SNAPSHOT_CODER_STEPS: bool = True
+
+    # Project file I/O
+    FILE_IO_WORKERS: int = 8
+    FILE_FSYNC_POLICY: Literal["none", "file", "full"] = "file"
+    FILE_BATCH_MAX_OPS: int = 200
+    PROJECT_IMPORT_MAX_UPLOAD_MB: int = 512
+    PROJECT_IMPORT_MAX_UNPACKED_MB: int = 2048
+    PROJECT_IMPORT_MAX_FILES: int = 50000
+
+    # Content-addressed storage of project files
+    BLOB_STORE_ENABLED: bool = False
+
+    # Trash of deleted project files
+    TRASH_REAP_INTERVAL_SECONDS: float = 60.0
+
+    # File change notifications
+    FILE_WATCH_DEBOUNCE_MS: int = 200
+    FILE_WATCH_FORCE_POLLING: bool = False
+
+    # Project tree index
+    TREE_INDEX_MAX_PROJECTS: int = 64
+    TREE_INDEX_IDLE_SECONDS: int = 900
+
+    # Project search index
+    SEARCH_INDEX_MAX_PROJECTS: int = 16
+    SEARCH_MAX_FILE_KB: int = 1024
+    SEARCH_WORKERS: int = 2
+    SEARCH_TIMEOUT_SECONDS: float = 5.0
+
+    # Docker Engine API
+    DOCKER_SOCKET: str = "/var/run/docker.sock"
+    DOCKER_API_VERSION: str = "1.41"
+    DOCKER_MAX_CONNECTIONS: int = 10
+    RUNTIME_POOL_SIZE: int = 0
+    RUNTIME_POOL_IMAGE: str = "python:3.11-slim"
+    RUNTIME_IDLE_MINUTES: int = 30
+    RUNTIME_IDLE_ACTION: Literal["stop", "pause"] = "stop"
+    RUNTIME_LOCK_BACKEND: Literal["local", "postgres"] = "local"
+    RUNTIME_METRICS_HISTORY: int = 300
+
+    # Admission control (host capacity defaults to what Docker reports)
+    RUNTIME_HOST_MEMORY_MB: Optional[int] = None
+    RUNTIME_HOST_CPUS: Optional[float] = None
+    RUNTIME_MEMORY_OVERCOMMIT: float = 1.0
+    RUNTIME_CPU_OVERCOMMIT: float = 4.0
+    RUNTIME_ADMISSION_WAIT_SECONDS: float = 30.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="",
@@ -108,12 +108,28 @@ class ProjectRuntime(Model):
     )
 
     # Docker container lifecycle state
-    # Values: running | stopped
+    # Values: running | stopped | paused | hibernated
+    # (paused / hibernated: suspended by the idle reaper, resumed on demand)
     status = fields.CharField(
         max_length=32,
         default="stopped",
     )
 
+    # Resource profile: small | medium | large | custom
+    # memory_mb / cpus hold the resolved container limits
+    profile = fields.CharField(
+        max_length=16,
+        default="medium",
+    )
+
+    memory_mb = fields.IntField(
+        default=2048,
+    )
+
+    cpus = fields.FloatField(
+        default=2.0,
+    )
+
     # Optional audit field for last executed command
     # (purely informational, not a source of truth)
     last_command = fields.TextField(
@@ -134,3 +150,69 @@ class ProjectRuntime(Model):
 
     def __str__(self):
         return f"<Runtime {self.project_name} ({self.status})>"
+
+
+class GenerationJob(Model):
+    """
+    Persistent queue entry for an asynchronous project generation.
+
+    Design Principles:
+    ------------------
+    - The table IS the queue: workers claim `queued` rows with
+      SELECT ... FOR UPDATE SKIP LOCKED, so several API nodes can
+      drain it safely.
+    - Progress is written by the worker that owns the job only.
+    """
+
+    id = fields.UUIDField(pk=True)
+
+    owner = fields.ForeignKeyField(
+        "models.User",
+        related_name="generation_jobs",
+        on_delete=fields.CASCADE,
+    )
+
+    prompt = fields.TextField()
+
+    # Job lifecycle state
+    # Values: queued | running | succeeded | failed
+    status = fields.CharField(
+        max_length=32,
+        default="queued",
+        index=True,
+    )
+
+    # Pipeline stage currently executing
+    # Values: planner | architect | coder | done
+    stage = fields.CharField(
+        max_length=32,
+        null=True,
+    )
+
+    total_steps = fields.IntField(default=0)
+    completed_steps = fields.IntField(default=0)
+
+    # Per-step progress: [{"step", "filepath", "status"}]
+    progress = fields.JSONField(default=list)
+
+    # Set once generation succeeded and the project row exists
+    project = fields.ForeignKeyField(
+        "models.Project",
+        related_name="generation_jobs",
+        null=True,
+        on_delete=fields.SET_NULL,
+    )
+
+    error = fields.TextField(null=True)
+
+    # Metadata
+    created_at = fields.DatetimeField(auto_now_add=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "generation_jobs"
+
+    def __str__(self):
+        return f"<GenerationJob {self.id} ({self.status})>"
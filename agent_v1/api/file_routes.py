@@ -0,0 +1,609 @@
+"""
+Purpose:
+--------
+HTTP API for project files and folders (editor backend).
+
+Design:
+-------
+- Every request builds its own ProjectFS (no global project root)
+- All disk I/O goes through `file_service`, off the event loop
+- Listings are served from the in-memory `tree_index`; mutations
+  invalidate the paths they touched
+- Reads carry an ETag (mtime + size) and answer If-None-Match with
+  304; `/files/raw` streams bytes with Range support
+- Whole projects move as zip / tar.gz archives, streamed both ways
+- `/projects/{name}/search` answers text / regex queries from the
+  per-project trigram index (`search_index`)
+- File changes (agent, API or container terminal) are pushed over
+  `/projects/{name}/ws/files`, debounced and coalesced per client
+
+Security:
+---------
+- JWT protected
+- Project ownership enforced
+- File operations rate-limited
+"""
+
+import asyncio
+import logging
+import shutil
+from typing import Dict, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+
+from agent_v1.api.auth.dependencies import AuthDependency
+from agent_v1.api.auth.rate_limits import file_ops_limit
+from agent_v1.api.db.models import User
+from agent_v1.api.db.config import Config
+from agent_v1.api.file_service import UploadTooLarge, file_service
+from agent_v1.api.file_watcher import FileChange, coalesce, file_watch_hub
+from agent_v1.api.guards import (
+    WebSocketAuthError,
+    ensure_project_access,
+    ensure_websocket_project_access,
+)
+from agent_v1.api.search_index import search_index
+from agent_v1.api.tree_index import tree_index
+from agent_v1.storage.reaper import trash_reaper
+from agent_v1.api.schemas.graph import (
+    BatchFileRequest,
+    BatchFileResponse,
+    BatchFileResult,
+    ImportArchiveResponse,
+    FileEntry,
+    ListFilesResponse,
+    ReadFileResponse,
+    SearchMatch,
+    SearchResponse,
+    WriteFileRequest,
+)
+from agent_v1.tools.archive import (
+    ARCHIVE_FORMATS,
+    api_export_archive,
+    api_import_archive,
+    make_staging_dir,
+)
+from agent_v1.tools.listing import IgnoreRules
+from agent_v1.tools.utils import ProjectFS, file_etag
+
+logger = logging.getLogger("files")
+
+router = APIRouter(prefix="/projects", tags=["files"])
+
+# Change events are buffered for this long and sent as one coalesced batch
+FILE_EVENTS_FLUSH_SECONDS = 0.25
+
+# Above this many distinct paths per batch, clients are told to re-list
+FILE_EVENTS_MAX_BATCH = 500
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+async def _project_fs(project_name: str, user: User) -> ProjectFS:
+    project = await ensure_project_access(project_name, user)
+    return ProjectFS(project.project_root, Config.FILE_FSYNC_POLICY)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison and may list several tags."""
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+# -------------------------------------------------------------------
+# Files
+# -------------------------------------------------------------------
+
+@router.get(
+    "/{project_name}/files",
+    response_model=ListFilesResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def list_project_files(
+    project_name: str,
+    directory: str = Query(".", description="Relative directory to list"),
+    depth: Optional[int] = Query(None, ge=1, description="Max depth below `directory`"),
+    limit: int = Query(1000, ge=1, le=10000),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    metadata: bool = Query(False, description="Include size, mtime and type"),
+    include_dirs: bool = Query(False),
+    include_ignored: bool = Query(False, description="Bypass default and .gitignore rules"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    try:
+        entries, next_cursor = await tree_index.list_entries(
+            fs,
+            directory,
+            max_depth=depth,
+            limit=limit,
+            cursor=cursor,
+            include_dirs=include_dirs,
+            with_metadata=metadata,
+            include_ignored=include_ignored,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"ERROR: {e}")
+
+    return ListFilesResponse(
+        project_name=project_name,
+        files=[entry.path for entry in entries if entry.type == "file"],
+        entries=[
+            FileEntry(
+                path=entry.path,
+                type=entry.type,
+                size=entry.size,
+                mtime=entry.mtime,
+            )
+            for entry in entries
+        ] if metadata or include_dirs else None,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/{project_name}/files/read",
+    response_model=ReadFileResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def read_project_file(
+    project_name: str,
+    file_path: str = Query(..., description="Relative file path"),
+    if_none_match: Optional[str] = Header(None),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    if if_none_match:
+        try:
+            _, st = await file_service.stat_file(fs, file_path)
+        except ValueError:
+            st = None
+
+        if st is not None and _etag_matches(if_none_match, file_etag(st)):
+            return _not_modified(file_etag(st))
+
+    content, etag = await file_service.read_file_versioned(fs, file_path)
+    if content.startswith("ERROR"):
+        raise HTTPException(status_code=400, detail=content)
+
+    return JSONResponse(
+        ReadFileResponse(
+            project_name=project_name,
+            file_path=file_path,
+            content=content,
+        ).model_dump(),
+        headers={"ETag": etag, "Cache-Control": "no-cache"} if etag else None,
+    )
+
+
+@router.get(
+    "/{project_name}/files/raw",
+    dependencies=[Depends(file_ops_limit)],
+    response_class=FileResponse,
+)
+async def read_project_file_raw(
+    project_name: str,
+    file_path: str = Query(..., description="Relative file path"),
+    download: bool = Query(False, description="Send as attachment"),
+    if_none_match: Optional[str] = Header(None),
+    user=Depends(AuthDependency.get_current_user),
+):
+    """
+    Streams the file bytes as-is (binary safe, never loaded in memory).
+    Supports Range / If-Range (206) and If-None-Match (304).
+    """
+    fs = await _project_fs(project_name, user)
+
+    try:
+        path, st = await file_service.stat_file(fs, file_path)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=f"ERROR: {e}")
+
+    etag = file_etag(st)
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    return FileResponse(
+        path,
+        stat_result=st,
+        filename=path.name if download else None,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+@router.post(
+    "/{project_name}/files/write",
+    dependencies=[Depends(file_ops_limit)],
+)
+async def write_project_file(
+    project_name: str,
+    file_path: str = Query(..., description="Relative file path"),
+    payload: WriteFileRequest = Body(...),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    result = await file_service.write_file(fs, file_path, payload.content)
+    if result.startswith("ERROR"):
+        raise HTTPException(status_code=400, detail=result)
+
+    tree_index.invalidate(fs.root, [file_path])
+    search_index.invalidate(fs.root, [file_path])
+
+    return {"result": result}
+
+
+@router.delete(
+    "/{project_name}/files/delete",
+    dependencies=[Depends(file_ops_limit)],
+)
+async def delete_project_file(
+    project_name: str,
+    file_path: str = Query(..., description="Relative file path"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    result = await file_service.delete_file(fs, file_path)
+    if result.startswith("ERROR"):
+        raise HTTPException(status_code=400, detail=result)
+
+    tree_index.invalidate(fs.root, [file_path])
+    search_index.invalidate(fs.root, [file_path])
+
+    return {"result": result}
+
+@router.post(
+    "/{project_name}/files/batch",
+    response_model=BatchFileResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def batch_project_files(
+    project_name: str,
+    payload: BatchFileRequest = Body(...),
+    user=Depends(AuthDependency.get_current_user),
+):
+    """
+    Applies several write / delete / mkdir / move operations with one
+    request (one auth check, one rate-limit hit).
+
+    Writes are staged first and committed by rename, so no file is ever
+    seen half-written. Operations commit in order; after the first
+    failure the rest are skipped (`ok` is false).
+    """
+    if len(payload.operations) > Config.FILE_BATCH_MAX_OPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ERROR: At most {Config.FILE_BATCH_MAX_OPS} operations per batch",
+        )
+
+    fs = await _project_fs(project_name, user)
+    ops = [op.model_dump() for op in payload.operations]
+
+    try:
+        results = await file_service.apply_batch(fs, ops)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"ERROR: {e}")
+    except OSError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"ERROR: Batch could not be staged, nothing was applied ({e.strerror or e})",
+        )
+
+    changed = [op["path"] for op in ops] + [op["to"] for op in ops if op["to"]]
+    tree_index.invalidate(fs.root, changed)
+    search_index.invalidate(fs.root, changed)
+    if any(op["op"] == "delete" for op in ops):
+        trash_reaper.notify()
+
+    return BatchFileResponse(
+        project_name=project_name,
+        ok=all(result["status"] == "ok" for result in results),
+        results=[BatchFileResult(**result) for result in results],
+    )
+
+# -------------------------------------------------------------------
+# Folders
+# -------------------------------------------------------------------
+
+@router.post(
+    "/{project_name}/folders/create",
+    dependencies=[Depends(file_ops_limit)],
+)
+async def create_project_folder(
+    project_name: str,
+    folder_path: str = Query(..., description="Relative folder path"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    result = await file_service.create_folder(fs, folder_path)
+    if result.startswith("ERROR"):
+        raise HTTPException(status_code=400, detail=result)
+
+    tree_index.invalidate(fs.root, [folder_path])
+
+    return {"result": result}
+
+
+@router.delete(
+    "/{project_name}/folders/delete",
+    dependencies=[Depends(file_ops_limit)],
+)
+async def delete_project_folder(
+    project_name: str,
+    folder_path: str = Query(..., description="Relative folder path"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    result = await file_service.delete_folder(fs, folder_path)
+    if result.startswith("ERROR"):
+        raise HTTPException(status_code=400, detail=result)
+
+    tree_index.invalidate(fs.root, [folder_path])
+    search_index.invalidate(fs.root, [folder_path])
+    trash_reaper.notify()
+
+    return {"result": result}
+
+# -------------------------------------------------------------------
+# Search
+# -------------------------------------------------------------------
+
+@router.get(
+    "/{project_name}/search",
+    response_model=SearchResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def search_project_files(
+    project_name: str,
+    q: str = Query(..., min_length=1, description="Text or regular expression"),
+    regex: bool = Query(False),
+    case_sensitive: bool = Query(False),
+    directory: str = Query(".", description="Only search below this directory"),
+    limit: int = Query(200, ge=1, le=2000, description="Max matching lines"),
+    context: int = Query(2, ge=0, le=10, description="Lines around each match"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    fs = await _project_fs(project_name, user)
+
+    try:
+        result = await search_index.search(
+            fs,
+            q,
+            regex=regex,
+            case_sensitive=case_sensitive,
+            directory=directory,
+            limit=limit,
+            context=context,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"ERROR: {e}")
+
+    return SearchResponse(
+        project_name=project_name,
+        query=q,
+        matches=[SearchMatch(**match) for match in result["matches"]],
+        files_indexed=result["files_indexed"],
+        files_searched=result["files_searched"],
+        truncated=result["truncated"],
+    )
+
+# -------------------------------------------------------------------
+# Archives
+# -------------------------------------------------------------------
+
+@router.get(
+    "/{project_name}/export",
+    dependencies=[Depends(file_ops_limit)],
+    response_class=StreamingResponse,
+)
+async def export_project(
+    project_name: str,
+    format: str = Query("zip", description="zip | tar.gz"),
+    include_ignored: bool = Query(False, description="Bypass default and .gitignore rules"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    """
+    Streams the project as an archive built on the fly (chunked, no
+    temp file). Ignore rules apply unless `include_ignored` is set.
+    """
+    if format not in ARCHIVE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"ERROR: Unsupported format: {format}")
+
+    fs = await _project_fs(project_name, user)
+
+    return StreamingResponse(
+        file_service.stream(
+            api_export_archive,
+            fs,
+            format,
+            include_ignored=include_ignored,
+        ),
+        media_type=ARCHIVE_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{project_name}.{format}"',
+        },
+    )
+
+
+@router.post(
+    "/{project_name}/import",
+    response_model=ImportArchiveResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def import_project(
+    project_name: str,
+    request: Request,
+    format: str = Query(..., description="zip | tar.gz"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    """
+    Unpacks an archive sent as the raw request body into the project,
+    overwriting files with the same path.
+
+    The body is spooled to disk (never held in memory), every member is
+    checked against the project root, and nothing is applied unless the
+    whole archive is valid.
+    """
+    if format not in ARCHIVE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"ERROR: Unsupported format: {format}")
+
+    fs = await _project_fs(project_name, user)
+    staging = await file_service.run(make_staging_dir, fs)
+
+    try:
+        archive = staging / "upload"
+        await file_service.spool(
+            request.stream(),
+            archive,
+            max_bytes=Config.PROJECT_IMPORT_MAX_UPLOAD_MB * 1024 * 1024,
+        )
+
+        result = await file_service.run(
+            api_import_archive,
+            fs,
+            archive,
+            format,
+            staging,
+            max_files=Config.PROJECT_IMPORT_MAX_FILES,
+            max_bytes=Config.PROJECT_IMPORT_MAX_UNPACKED_MB * 1024 * 1024,
+        )
+
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"ERROR: Upload exceeds {Config.PROJECT_IMPORT_MAX_UPLOAD_MB} MB",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"ERROR: {e}")
+
+    finally:
+        await file_service.run(shutil.rmtree, staging, True)
+
+    # Many paths changed at once: rebuild the indexes lazily
+    tree_index.forget(fs.root)
+    search_index.forget(fs.root)
+
+    return ImportArchiveResponse(project_name=project_name, **result)
+
+# -------------------------------------------------------------------
+# Change Events (WebSocket)
+# -------------------------------------------------------------------
+
+@router.websocket("/{project_name}/ws/files")
+async def project_files_ws(
+    websocket: WebSocket,
+    project_name: str,
+):
+    """
+    Streams file changes of a project:
+
+        {"type": "changes", "changes": [{"kind": "created", "path": "app.py"}]}
+        {"type": "resync"}   (too many changes: re-list the tree)
+
+    `kind` is the net effect over the flush window: created | modified | deleted.
+    """
+    try:
+        project = await ensure_websocket_project_access(websocket, project_name)
+    except WebSocketAuthError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    fs = ProjectFS(project.project_root)
+    ignore = await file_service.run(IgnoreRules.for_project, fs.root)
+
+    pending: Dict[str, Optional[str]] = {}
+    wakeup = asyncio.Event()
+
+    def on_changes(changes: List[FileChange]):
+        for change in changes:
+            pending[change.path] = coalesce(pending.get(change.path), change.kind)
+        wakeup.set()
+
+    async def push_changes():
+        nonlocal ignore
+
+        while True:
+            await wakeup.wait()
+            await asyncio.sleep(FILE_EVENTS_FLUSH_SECONDS)
+            wakeup.clear()
+
+            batch = dict(pending)
+            pending.clear()
+
+            if ".gitignore" in batch:
+                ignore = await file_service.run(IgnoreRules.for_project, fs.root)
+
+            if len(batch) > FILE_EVENTS_MAX_BATCH:
+                await websocket.send_json({"type": "resync"})
+                continue
+
+            changes = [
+                {"kind": kind, "path": path}
+                for path, kind in sorted(batch.items())
+                # Events do not say whether the path is a directory
+                # (and deleted ones cannot be stat-ed): match as either
+                if kind is not None
+                and not ignore.is_ignored_path(path, True)
+                and not ignore.is_ignored_path(path, False)
+            ]
+
+            if changes:
+                await websocket.send_json({"type": "changes", "changes": changes})
+
+    async def receive_until_disconnect():
+        # Client messages are ignored; receiving detects disconnects
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    unsubscribe = file_watch_hub.subscribe(fs.root, on_changes)
+    pusher = asyncio.create_task(push_changes())
+    receiver = asyncio.create_task(receive_until_disconnect())
+
+    try:
+        await asyncio.wait({pusher, receiver}, return_when=asyncio.FIRST_COMPLETED)
+
+        error = pusher.exception() if pusher.done() else None
+        if error is not None and not isinstance(error, WebSocketDisconnect):
+            logger.error("File change stream of %s failed", project_name, exc_info=error)
+            if not receiver.done():
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+    finally:
+        unsubscribe()
+        for task in (pusher, receiver):
+            task.cancel()
+        await asyncio.wait({pusher, receiver})
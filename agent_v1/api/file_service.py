@@ -0,0 +1,214 @@
+"""
+Purpose:
+--------
+Async facade over the blocking project filesystem helpers
+(`agent_v1.tools.utils.api_*`).
+
+Why this exists:
+----------------
+- File handlers are `async def`; calling `open()`, recursive globbing
+  or unlink loops directly stalls the event loop, and with it every
+  WebSocket terminal served by the worker
+- Disk I/O runs on a dedicated, bounded thread pool (FILE_IO_WORKERS)
+  instead of the loop's default executor, so a burst of large listings
+  cannot starve other `to_thread` users (and vice versa)
+
+Usage:
+------
+    fs = ProjectFS(project.project_root)
+    content = await file_service.read_file(fs, "app.py")
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, TypeVar
+
+from agent_v1.api.db.config import Config
+from agent_v1.tools.utils import (
+    ProjectFS,
+    api_apply_batch,
+    api_list_entries,
+    api_list_files,
+    api_read_file,
+    api_read_file_versioned,
+    api_stat_file,
+    api_write_file,
+    api_delete_file,
+    api_create_folder,
+    api_delete_folder,
+)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+# Chunks buffered between a streaming producer and a slow client
+STREAM_QUEUE_CHUNKS = 8
+
+# Spooled uploads are written in pieces of at least this size
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when a spooled upload exceeds its size limit."""
+    pass
+
+
+class _StreamAborted(Exception):
+    pass
+
+
+class FileService:
+    """
+    Runs project filesystem operations on a bounded disk I/O pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="file-io",
+        )
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run any blocking callable on the disk I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(fn, *args, **kwargs),
+        )
+
+    async def stream(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """
+        Run a blocking producer `fn(*args, emit=..., **kwargs)` on the
+        pool and yield the chunks it emits.
+
+        The producer blocks while STREAM_QUEUE_CHUNKS chunks are waiting
+        (backpressure from slow clients) and is aborted when the consumer
+        goes away. It holds one pool thread for its whole duration.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+        aborted = threading.Event()
+
+        def put(item):
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while True:
+                if aborted.is_set():
+                    future.cancel()
+                    raise _StreamAborted()
+                try:
+                    return future.result(timeout=0.5)
+                except concurrent.futures.TimeoutError:
+                    continue
+
+        def produce():
+            try:
+                fn(*args, emit=put, **kwargs)
+                put(_DONE)
+            except _StreamAborted:
+                pass
+            except Exception as e:
+                try:
+                    put(e)
+                except _StreamAborted:
+                    pass
+
+        task = asyncio.ensure_future(self.run(produce))
+
+        try:
+            while (item := await queue.get()) is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            await task
+        finally:
+            aborted.set()
+
+    async def spool(
+        self,
+        chunks: AsyncIterable[bytes],
+        path: pathlib.Path,
+        max_bytes: int,
+    ) -> int:
+        """
+        Write an async byte stream (e.g. a request body) to `path`
+        without holding it in memory. Raises UploadTooLarge.
+        """
+        f = await self.run(open, path, "wb")
+        size = 0
+        pending: List[bytes] = []
+        pending_size = 0
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+
+                pending.append(chunk)
+                pending_size += len(chunk)
+
+                if pending_size >= SPOOL_CHUNK_SIZE:
+                    await self.run(f.write, b"".join(pending))
+                    pending, pending_size = [], 0
+
+            if pending:
+                await self.run(f.write, b"".join(pending))
+        finally:
+            await self.run(f.close)
+
+        return size
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    async def list_files(self, fs: ProjectFS, directory: str = ".") -> str:
+        return await self.run(api_list_files, fs, directory)
+
+    async def list_entries(self, fs: ProjectFS, directory: str = ".", **options):
+        return await self.run(api_list_entries, fs, directory, **options)
+
+    async def read_file(self, fs: ProjectFS, path: str) -> str:
+        return await self.run(api_read_file, fs, path)
+
+    async def read_file_versioned(self, fs: ProjectFS, path: str):
+        return await self.run(api_read_file_versioned, fs, path)
+
+    async def stat_file(self, fs: ProjectFS, path: str):
+        return await self.run(api_stat_file, fs, path)
+
+    async def write_file(self, fs: ProjectFS, path: str, content: str) -> str:
+        return await self.run(api_write_file, fs, path, content)
+
+    async def delete_file(self, fs: ProjectFS, path: str) -> str:
+        return await self.run(api_delete_file, fs, path)
+
+    async def apply_batch(self, fs: ProjectFS, ops: List[Dict[str, Any]]):
+        return await self.run(api_apply_batch, fs, ops)
+
+    # ------------------------------------------------------------------
+    # Folders
+    # ------------------------------------------------------------------
+
+    async def create_folder(self, fs: ProjectFS, path: str) -> str:
+        return await self.run(api_create_folder, fs, path)
+
+    async def delete_folder(self, fs: ProjectFS, path: str) -> str:
+        return await self.run(api_delete_folder, fs, path)
+
+
+# Singleton instance used across the application
+file_service = FileService(max_workers=Config.FILE_IO_WORKERS)
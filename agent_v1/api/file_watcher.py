@@ -0,0 +1,244 @@
+"""
+Purpose:
+--------
+Shared filesystem watchers for project directories.
+
+Design:
+-------
+- One watcher per project root, however many consumers listen to it
+  (tree index, WebSocket clients, ...); it is stopped when the last
+  listener unsubscribes
+- Backed by `watchfiles` (inotify on Linux). Bind mounts that do not
+  deliver inotify events (Docker Desktop, network filesystems) can
+  switch to polling with FILE_WATCH_FORCE_POLLING
+- Default ignore patterns are excluded at the source, so
+  `pip install` / `npm install` in the container neither flood
+  consumers nor exhaust inotify watches: every directory that is not
+  ignored is watched on its own (non-recursively), listed on the disk
+  I/O pool; ignored trees never get a watch
+- A created directory restarts the watch so it is included; changes
+  inside it made before the restart are not reported (consumers
+  re-scan the created directory as a whole)
+- Remaining events are filtered on the event loop without touching the
+  disk: events do not say whether a path is a directory, so only paths
+  ignored either way are dropped (consumers check the type of what is
+  left)
+- Listeners are plain callbacks run on the event loop with one batch
+  of changes; they must not block
+
+Usage:
+------
+    unsubscribe = file_watch_hub.subscribe(fs.root, on_changes)
+    ...
+    unsubscribe()
+"""
+
+import asyncio
+import logging
+import os
+import pathlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+from watchfiles import Change, awatch
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.file_service import file_service
+from agent_v1.tools.listing import DEFAULT_IGNORE_PATTERNS, IgnoreRules, iter_tree
+
+logger = logging.getLogger("files")
+
+
+@dataclass(slots=True, frozen=True)
+class FileChange:
+    kind: str  # created | modified | deleted
+    path: str  # relative to the project root, "/" separated
+
+
+Listener = Callable[[List[FileChange]], None]
+
+_KINDS = {
+    Change.added: "created",
+    Change.modified: "modified",
+    Change.deleted: "deleted",
+}
+
+
+def coalesce(previous: Optional[str], kind: str) -> Optional[str]:
+    """
+    Merge two changes of one path into their net effect
+    (None: the path did not exist before and does not exist now).
+    """
+    if previous is None:
+        return kind
+    if previous == "created":
+        return None if kind == "deleted" else "created"
+    if previous == "deleted":
+        return "deleted" if kind == "deleted" else "modified"
+    return kind
+
+
+def watched_dirs(root: pathlib.Path, ignore: IgnoreRules) -> List[str]:
+    """`root` and every directory below it that is not ignored."""
+    return [str(root)] + [
+        str(root / entry.path)
+        for entry in iter_tree(root, root, ignore=ignore, include_dirs=True)
+        if entry.type == "dir"
+    ]
+
+
+def _any_dir(paths: List[str]) -> bool:
+    # lstat: symlinked directories are never followed (nor watched)
+    return any(
+        os.path.isdir(path) and not os.path.islink(path)
+        for path in paths
+    )
+
+
+class _Watcher:
+    """
+    Watch task for a single project root.
+    """
+
+    def __init__(self, root: pathlib.Path, debounce_ms: int, force_polling: bool):
+        self.root = root
+        self.listeners: Set[Listener] = set()
+
+        self._ignore = IgnoreRules(DEFAULT_IGNORE_PATTERNS)
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(debounce_ms, force_polling))
+
+    def _filter(self, change: Change, path: str) -> bool:
+        try:
+            rel = pathlib.Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return False
+
+        return not (
+            self._ignore.is_ignored_path(rel, True)
+            and self._ignore.is_ignored_path(rel, False)
+        )
+
+    async def _run(self, debounce_ms: int, force_polling: bool):
+        try:
+            while not self._stop.is_set():
+                dirs = await file_service.run(watched_dirs, self.root, self._ignore)
+                try:
+                    await self._watch(dirs, debounce_ms, force_polling)
+                except FileNotFoundError:
+                    # A directory went away before its watch was placed
+                    if not await file_service.run(os.path.isdir, self.root):
+                        raise
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception:
+            # Typically the project directory was removed
+            logger.exception("File watcher for %s stopped", self.root)
+
+    async def _watch(self, dirs: List[str], debounce_ms: int, force_polling: bool):
+        """Watch `dirs` until stopped or until a directory is created."""
+        async for batch in awatch(
+            *dirs,
+            watch_filter=self._filter,
+            debounce=debounce_ms,
+            stop_event=self._stop,
+            force_polling=force_polling or None,
+            recursive=False,
+        ):
+            changes = [
+                FileChange(
+                    kind=_KINDS[change],
+                    path=pathlib.Path(path).relative_to(self.root).as_posix(),
+                )
+                for change, path in batch
+            ]
+            self._dispatch(changes)
+
+            added = [
+                str(self.root / change.path)
+                for change in changes
+                if change.kind == "created"
+                and not self._ignore.is_ignored_path(change.path, True)
+            ]
+            if added and await file_service.run(_any_dir, added):
+                return
+
+    def _dispatch(self, changes: List[FileChange]):
+        for listener in list(self.listeners):
+            try:
+                listener(changes)
+            except Exception:
+                logger.exception("File change listener failed")
+
+    async def close(self):
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+
+
+class FileWatchHub:
+    """
+    Reference-counted registry of project watchers.
+    """
+
+    def __init__(self, debounce_ms: int, force_polling: bool):
+        self.debounce_ms = debounce_ms
+        self.force_polling = force_polling
+        self._watchers: Dict[pathlib.Path, _Watcher] = {}
+
+    def subscribe(self, root: pathlib.Path, listener: Listener) -> Callable[[], None]:
+        """
+        Start delivering changes under `root` to `listener`.
+        Returns the matching unsubscribe callable.
+        """
+        watcher = self._watchers.get(root)
+        if watcher is None:
+            watcher = _Watcher(root, self.debounce_ms, self.force_polling)
+            self._watchers[root] = watcher
+
+        watcher.listeners.add(listener)
+
+        def unsubscribe():
+            watcher.listeners.discard(listener)
+
+            # May have been replaced by reset(), sharing the listener set
+            current = self._watchers.get(root)
+            if (
+                current is not None
+                and current.listeners is watcher.listeners
+                and not current.listeners
+            ):
+                del self._watchers[root]
+                asyncio.create_task(current.close())
+
+        return unsubscribe
+
+    def reset(self, root: pathlib.Path):
+        """
+        Restart the watcher of `root` (after the directory was replaced),
+        keeping its listeners.
+        """
+        old = self._watchers.get(root)
+        if old is None:
+            return
+
+        watcher = _Watcher(root, self.debounce_ms, self.force_polling)
+        watcher.listeners = old.listeners
+        self._watchers[root] = watcher
+        asyncio.create_task(old.close())
+
+    async def stop(self):
+        watchers = list(self._watchers.values())
+        self._watchers.clear()
+        await asyncio.gather(*(w.close() for w in watchers), return_exceptions=True)
+
+
+# Singleton instance used across the application
+file_watch_hub = FileWatchHub(
+    debounce_ms=Config.FILE_WATCH_DEBOUNCE_MS,
+    force_polling=Config.FILE_WATCH_FORCE_POLLING,
+)
@@ -0,0 +1,219 @@
+"""
+Purpose:
+--------
+HTTP API for asynchronous project generation.
+
+Flow:
+-----
+- POST /projects/generate enqueues a job and returns its id immediately
+- A bounded worker pool runs the agent pipeline in the background
+- Clients poll GET /projects/generate/jobs/{job_id} for status and
+  per-step progress
+- POST /projects/generate/stream enqueues a job the same way and pushes
+  its progress as Server-Sent Events (planner output, task list,
+  each written file) for clients that want to render early; the job
+  keeps running when the client disconnects
+
+Security:
+---------
+- JWT protected
+- Jobs are visible to their owner (and admins) only
+- Job creation rate-limited
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from agent_v1.api.auth.dependencies import AuthDependency
+from agent_v1.api.auth.rate_limits import project_generation_limit
+from agent_v1.api.db.models import GenerationJob, User
+from agent_v1.api.schemas.graph import (
+    GenerateProjectRequest,
+    GenerationJobResponse,
+    GenerationStepProgress,
+)
+from agent_v1.jobs.repository import JobRepository, JobNotFound
+from agent_v1.jobs.worker_pool import generation_workers
+
+router = APIRouter(prefix="/projects/generate", tags=["generation"])
+repo = JobRepository()
+
+# Comment frame sent when the pipeline is silent (long LLM calls),
+# so proxies do not close the idle connection.
+SSE_KEEPALIVE_SECONDS = 15
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def _to_response(job: GenerationJob) -> GenerationJobResponse:
+    project = job.project if job.project_id else None
+
+    return GenerationJobResponse(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        total_steps=job.total_steps,
+        completed_steps=job.completed_steps,
+        steps=[GenerationStepProgress(**entry) for entry in job.progress],
+        project_name=project.name if project else None,
+        project_root=project.project_root if project else None,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _serialize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    kind = event["event"]
+
+    if kind == "plan_ready":
+        return event["plan"].model_dump()
+
+    if kind == "task_plan_ready":
+        return event["task_plan"].model_dump()
+
+    return {k: v for k, v in event.items() if k != "event"}
+
+
+async def _generation_events(
+    job: GenerationJob,
+    user: User,
+    queue: asyncio.Queue,
+    unsubscribe: Callable[[], None],
+) -> AsyncIterator[str]:
+    """
+    Renders the progress events of a queued job as SSE frames.
+
+    Events arrive from the worker pool when this process runs the job;
+    a job claimed by another node only reports through its row, which
+    is checked whenever the stream is idle.
+    """
+    try:
+        yield _sse("job_queued", {"job_id": job.id})
+
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                item = await _finished_event(job.id, user)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+            if item["event"] == "generation_failed":
+                yield _sse("error", {"detail": item["error"]})
+                break
+
+            yield _sse(item["event"], _serialize_event(item))
+
+            if item["event"] == "generation_completed":
+                break
+
+    finally:
+        # Client disconnected or stream finished; the job carries on
+        unsubscribe()
+
+
+async def _finished_event(job_id: UUID, user: User) -> Optional[Dict[str, Any]]:
+    try:
+        job = await repo.get_for_user(job_id, user)
+    except JobNotFound:
+        # Deleted (with its owner) while the stream was open
+        return {"event": "generation_failed", "error": "Job no longer exists"}
+
+    if job.status == "succeeded":
+        if job.project is None:
+            return {"event": "generation_failed", "error": "Generated project was deleted"}
+        return {
+            "event": "generation_completed",
+            "project_name": job.project.name,
+            "project_root": job.project.project_root,
+        }
+    if job.status == "failed":
+        return {"event": "generation_failed", "error": job.error}
+    return None
+
+# -------------------------------------------------------------------
+# Jobs
+# -------------------------------------------------------------------
+
+@router.post(
+    "",
+    response_model=GenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(project_generation_limit)],
+)
+async def generate_project(
+    req: GenerateProjectRequest,
+    user=Depends(AuthDependency.get_current_user),
+):
+    job = await repo.create(owner=user, prompt=req.prompt)
+    generation_workers.notify()
+
+    return _to_response(job)
+
+
+@router.post(
+    "/stream",
+    dependencies=[Depends(project_generation_limit)],
+)
+async def generate_project_stream(
+    req: GenerateProjectRequest,
+    user=Depends(AuthDependency.get_current_user),
+):
+    job = await repo.create(owner=user, prompt=req.prompt)
+
+    # Subscribe before any worker can claim the job
+    queue: asyncio.Queue = asyncio.Queue()
+    unsubscribe = generation_workers.subscribe(job.id, queue.put_nowait)
+    generation_workers.notify()
+
+    return StreamingResponse(
+        _generation_events(job, user, queue, unsubscribe),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get(
+    "/jobs",
+    response_model=List[GenerationJobResponse],
+)
+async def list_generation_jobs(
+    limit: int = Query(50, ge=1, le=200),
+    user=Depends(AuthDependency.get_current_user),
+):
+    jobs = await repo.list_for_user(user, limit=limit)
+    return [_to_response(job) for job in jobs]
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=GenerationJobResponse,
+)
+async def get_generation_job(
+    job_id: UUID,
+    user=Depends(AuthDependency.get_current_user),
+):
+    try:
+        job = await repo.get_for_user(job_id, user)
+    except JobNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generation job not found",
+        )
+
+    return _to_response(job)
@@ -1,6 +1,12 @@
-from fastapi import HTTPException, status
+from fastapi import HTTPException, WebSocket, status
 from agent_v1.api.db.models import Project
 from agent_v1.api.db.models import User
+from agent_v1.core.jwt_manager import JWTManager
+
+
+class WebSocketAuthError(Exception):
+    """Raised when a WebSocket handshake fails authentication."""
+    pass
 
 
 async def ensure_project_access(
@@ -31,3 +37,35 @@ async def ensure_project_access(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="You do not have access to this project",
     )
+
+
+async def ensure_websocket_project_access(
+    websocket: WebSocket,
+    project_name: str,
+) -> Project:
+    """
+    Authenticate a WebSocket handshake (`?token=<access token>`, browsers
+    cannot set headers on WebSocket requests) and check project access.
+
+    Raises WebSocketAuthError; callers close with 1008 (policy violation).
+    """
+    token = websocket.query_params.get("token")
+    if not token:
+        raise WebSocketAuthError("Missing token")
+
+    try:
+        payload = JWTManager.decode_token(token)
+        if payload.get("token_type") != "access":
+            raise ValueError("Invalid token type")
+
+        user = await User.get_or_none(
+            id=payload["sub"],
+            is_active=True,
+        )
+        if not user:
+            raise ValueError("Invalid user")
+
+        return await ensure_project_access(project_name, user)
+
+    except Exception as e:
+        raise WebSocketAuthError(str(e)) from e
@@ -1,4 +1,8 @@
 import pathlib
+from uuid import UUID
+
+from agent_v1.api.db.models import Project
+from agent_v1.storage.blob_store import blob_store
 from agent_v1.tools.project_root import GENERATED_PROJECTS_ROOT
 
 def resolve_project_dir(project_name: str) -> pathlib.Path:
@@ -14,3 +18,18 @@ def resolve_project_dir(project_name: str) -> pathlib.Path:
         raise ValueError(f"Invalid project directory: {project_name}")
 
     return project_dir.resolve()
+
+
+async def create_generated_project(project_root: str, owner_id: UUID) -> Project:
+    """
+    Registers a freshly generated project directory for its owner.
+    Raises IntegrityError if the owner already has a project with that name.
+    """
+    project = await Project.create(
+        name=pathlib.Path(project_root).name,
+        project_root=project_root,
+        owner_id=owner_id,
+    )
+
+    blob_store.schedule_ingest(project_root)
+    return project
@@ -3,6 +3,11 @@ Purpose:
 --------
 HTTP + WebSocket API for runtime management.
 
+Container state changes (including exits and OOM kills not caused by
+the API) are pushed over `/projects/{name}/runtime/ws/events`, so
+clients do not need to poll `/runtime/status`. Resource usage is
+available from `/runtime/metrics` and live over `/runtime/ws/metrics`.
+
 Security:
 ---------
 - JWT protected
@@ -11,7 +16,7 @@ Security:
 """
 
 import asyncio
-from typing import Optional
+from typing import List, Literal, Optional
 
 from fastapi import (
     APIRouter,
@@ -21,17 +26,23 @@ from fastapi import (
     status,
     Depends,
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from agent_v1.api.auth.dependencies import AuthDependency
 from agent_v1.api.auth.rate_limits import runtime_operation_limit
-from agent_v1.api.guards import ensure_project_access
-from agent_v1.core.jwt_manager import JWTManager
+from agent_v1.api.guards import (
+    WebSocketAuthError,
+    ensure_project_access,
+    ensure_websocket_project_access,
+)
 
+from agent_v1.runtime.admission import AdmissionRefused
 from agent_v1.runtime.docker_manager import docker_manager, DockerError
+from agent_v1.runtime.events import RuntimeEvent, runtime_events
+from agent_v1.runtime.idle import idle_reaper
+from agent_v1.runtime.metrics import MetricSample, metrics_collector
 from agent_v1.runtime.repository import RuntimeRepository, RuntimeNotFound
 from agent_v1.runtime.terminal_manager import terminal_manager
-from agent_v1.api.db.models import User
 
 router = APIRouter(prefix="/projects", tags=["runtime"])
 repo = RuntimeRepository()
@@ -52,6 +63,40 @@ class RuntimeStatusResponse(BaseModel):
     container_status: str
     container_id: Optional[str]
     image: str
+    profile: str
+    memory_mb: int
+    cpus: float
+
+
+class RuntimeResourcesRequest(BaseModel):
+    profile: Literal["small", "medium", "large", "custom"]
+    # Required for (and only used by) the custom profile
+    memory_mb: Optional[int] = Field(default=None, ge=128)
+    cpus: Optional[float] = Field(default=None, gt=0)
+
+
+class RuntimeResourcesResponse(BaseModel):
+    project_name: str
+    profile: str
+    memory_mb: int
+    cpus: float
+
+
+class RuntimeMetricSample(BaseModel):
+    time: float
+    cpu_percent: float
+    memory_bytes: int
+    memory_limit_bytes: int
+    network_rx_bytes: int
+    network_tx_bytes: int
+    block_read_bytes: int
+    block_write_bytes: int
+    pids: int
+
+
+class RuntimeMetricsResponse(BaseModel):
+    project_name: str
+    samples: List[RuntimeMetricSample]
 
 
 # -------------------------------------------------------------------
@@ -70,12 +115,7 @@ async def start_runtime(
     project = await ensure_project_access(project_name, user)
 
     try:
-        try:
-            await repo.get(project.name)
-        except RuntimeNotFound:
-            await docker_manager.create_container(project.name)
-
-        await docker_manager.start_container(project.name)
+        await docker_manager.ensure_running(project.name)
         runtime = await repo.get(project.name)
 
         return StartRuntimeResponse(
@@ -85,6 +125,12 @@ async def start_runtime(
             image=runtime.image,
         )
 
+    except AdmissionRefused as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"},
+        )
     except DockerError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,6 +156,9 @@ async def runtime_status(
             container_status=runtime.status,
             container_id=runtime.container_name,
             image=runtime.image,
+            profile=runtime.profile,
+            memory_mb=runtime.memory_mb,
+            cpus=runtime.cpus,
         )
 
     except RuntimeNotFound:
@@ -162,6 +211,87 @@ async def delete_runtime(
             detail="Runtime not found",
         )
 
+@router.put(
+    "/{project_name}/runtime/resources",
+    response_model=RuntimeResourcesResponse,
+    dependencies=[Depends(runtime_operation_limit)],
+)
+async def update_runtime_resources(
+    project_name: str,
+    body: RuntimeResourcesRequest,
+    user: AuthDependency.current_user,
+):
+    """
+    Select the resource profile (small | medium | large | custom) of a
+    runtime. Applied in place; growing a running container is refused
+    (503) when the host has no room for it.
+    """
+    project = await ensure_project_access(project_name, user)
+
+    try:
+        resources = await docker_manager.set_resources(
+            project.name,
+            body.profile,
+            body.memory_mb,
+            body.cpus,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+    except RuntimeNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Runtime not found",
+        )
+    except AdmissionRefused as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+    except DockerError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        )
+
+    return RuntimeResourcesResponse(
+        project_name=project.name,
+        profile=body.profile,
+        memory_mb=resources.memory_mb,
+        cpus=resources.cpus,
+    )
+
+
+# -------------------------------------------------------------------
+# Resource Metrics
+# -------------------------------------------------------------------
+
+@router.get(
+    "/{project_name}/runtime/metrics",
+    response_model=RuntimeMetricsResponse,
+    dependencies=[Depends(runtime_operation_limit)],
+)
+async def runtime_metrics(
+    project_name: str,
+    user: AuthDependency.current_user,
+    since: Optional[float] = None,
+):
+    """
+    Recent resource usage samples (every 10 seconds, about one per second
+    while the metrics WebSocket is open; oldest first); `since` returns
+    only samples newer than that Unix time. Counters
+    (network, block I/O) are cumulative since the container started.
+    """
+    project = await ensure_project_access(project_name, user)
+
+    return RuntimeMetricsResponse(
+        project_name=project.name,
+        samples=[s.to_dict() for s in metrics_collector.samples(project.name, since)],
+    )
+
+
 # -------------------------------------------------------------------
 # WebSocket Terminal
 # -------------------------------------------------------------------
@@ -171,26 +301,16 @@ async def runtime_terminal_ws(
     websocket: WebSocket,
     project_name: str,
 ):
-    token = websocket.query_params.get("token")
-    if not token:
-        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-        return
-
     try:
-        payload = JWTManager.decode_token(token)
-        if payload.get("token_type") != "access":
-            raise ValueError("Invalid token type")
+        await ensure_websocket_project_access(websocket, project_name)
 
-        user = await User.get_or_none(
-            id=payload["sub"],
-            is_active=True,
-        )
-        if not user:
-            raise ValueError("Invalid user")
+        runtime = await repo.get(project_name)
 
-        await ensure_project_access(project_name, user)
+        # Hibernated by the idle reaper: resume transparently
+        if runtime.status in ("hibernated", "paused"):
+            await docker_manager.start_container(project_name)
+            runtime = await repo.get(project_name)
 
-        runtime = await repo.get(project_name)
         if runtime.status != "running":
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
@@ -222,8 +342,122 @@ async def runtime_terminal_ws(
         while True:
             msg = await websocket.receive_text()
             session.write(msg)
+            idle_reaper.touch(project_name)
     except WebSocketDisconnect:
         pass
     finally:
         task.cancel()
         terminal_manager.close(project_name)
+
+
+# -------------------------------------------------------------------
+# WebSocket Status Events
+# -------------------------------------------------------------------
+
+@router.websocket("/{project_name}/runtime/ws/events")
+async def runtime_events_ws(
+    websocket: WebSocket,
+    project_name: str,
+):
+    """
+    Streams container state of a project:
+
+        {"type": "status", "status": "running"}            (on connect)
+        {"type": "event", "action": "die", "status": "stopped",
+         "exit_code": 137, "time": 1700000000.5}
+
+    `action` is the Docker action (start | die | stop | pause | unpause |
+    oom | destroy);
+    `status` is the resulting runtime status, null when unchanged.
+    """
+    try:
+        project = await ensure_websocket_project_access(websocket, project_name)
+    except WebSocketAuthError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    queue: asyncio.Queue[RuntimeEvent] = asyncio.Queue()
+    unsubscribe = runtime_events.subscribe(project.name, queue.put_nowait)
+
+    async def push_events():
+        try:
+            runtime = await repo.get(project.name)
+            current = runtime.status
+        except RuntimeNotFound:
+            current = None
+        await websocket.send_json({"type": "status", "status": current})
+
+        while True:
+            event = await queue.get()
+            await websocket.send_json({
+                "type": "event",
+                "action": event.action,
+                "status": event.status,
+                "exit_code": event.exit_code,
+                "time": event.time,
+            })
+
+    task = asyncio.create_task(push_events())
+
+    try:
+        while True:
+            # Client messages are ignored; receiving detects disconnects
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task.cancel()
+        unsubscribe()
+
+
+# -------------------------------------------------------------------
+# WebSocket Resource Metrics
+# -------------------------------------------------------------------
+
+@router.websocket("/{project_name}/runtime/ws/metrics")
+async def runtime_metrics_ws(
+    websocket: WebSocket,
+    project_name: str,
+):
+    """
+    Streams resource usage of a project's container:
+
+        {"type": "history", "samples": [...]}             (on connect)
+        {"type": "sample", "sample": {"time": ..., "cpu_percent": ...}}
+
+    Samples have the fields of `/runtime/metrics`.
+    """
+    try:
+        project = await ensure_websocket_project_access(websocket, project_name)
+    except WebSocketAuthError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    queue: asyncio.Queue[MetricSample] = asyncio.Queue()
+    unsubscribe = metrics_collector.subscribe(project.name, queue.put_nowait)
+
+    async def push_samples():
+        await websocket.send_json({
+            "type": "history",
+            "samples": [s.to_dict() for s in metrics_collector.samples(project.name)],
+        })
+
+        while True:
+            sample = await queue.get()
+            await websocket.send_json({"type": "sample", "sample": sample.to_dict()})
+
+    task = asyncio.create_task(push_samples())
+
+    try:
+        while True:
+            # Client messages are ignored; receiving detects disconnects
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task.cancel()
+        unsubscribe()
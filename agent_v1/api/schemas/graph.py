@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+from datetime import datetime
+from uuid import UUID
 
 class GenerateProjectRequest(BaseModel):
     prompt: str = Field(..., description="User prompt to generate the project")
@@ -8,9 +10,36 @@ class GenerateProjectResponse(BaseModel):
     project_name: str
     project_root: str
 
+class GenerationStepProgress(BaseModel):
+    step: int
+    filepath: str
+    status: str
+
+class GenerationJobResponse(BaseModel):
+    job_id: UUID
+    status: str
+    stage: Optional[str] = None
+    total_steps: int = 0
+    completed_steps: int = 0
+    steps: List[GenerationStepProgress] = []
+    project_name: Optional[str] = None
+    project_root: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class FileEntry(BaseModel):
+    path: str
+    type: Literal["file", "dir"]
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+
 class ListFilesResponse(BaseModel):
     project_name: str
     files: List[str]
+    entries: Optional[List[FileEntry]] = None
+    next_cursor: Optional[str] = None
 
 class ReadFileResponse(BaseModel):
     project_name: str
@@ -19,3 +48,80 @@ class ReadFileResponse(BaseModel):
 
 class WriteFileRequest(BaseModel):
     content: str
+
+class BatchFileOperation(BaseModel):
+    op: Literal["write", "delete", "mkdir", "move"]
+    path: str = Field(..., min_length=1, description="Relative path")
+    content: Optional[str] = Field(None, description="File content (write)")
+    to: Optional[str] = Field(None, min_length=1, description="Destination path (move)")
+
+    @model_validator(mode="after")
+    def check_arguments(self):
+        if self.op == "write" and self.content is None:
+            raise ValueError("write requires `content`")
+        if self.op == "move" and not self.to:
+            raise ValueError("move requires `to`")
+        return self
+
+class BatchFileRequest(BaseModel):
+    operations: List[BatchFileOperation] = Field(..., min_length=1)
+
+class BatchFileResult(BaseModel):
+    op: str
+    path: str
+    status: Literal["ok", "error", "skipped"]
+    detail: str = ""
+
+class ImportArchiveResponse(BaseModel):
+    project_name: str
+    files: int
+    dirs: int
+    skipped: List[str]
+
+class BatchFileResponse(BaseModel):
+    project_name: str
+    ok: bool
+    results: List[BatchFileResult]
+
+class SearchMatch(BaseModel):
+    path: str
+    line: int
+    column: int
+    text: str
+    before: List[str] = []
+    after: List[str] = []
+
+class SearchResponse(BaseModel):
+    project_name: str
+    query: str
+    matches: List[SearchMatch]
+    files_indexed: int
+    files_searched: int
+    truncated: bool
+
+class CreateSnapshotRequest(BaseModel):
+    label: Optional[str] = Field(None, max_length=200)
+
+class SnapshotResponse(BaseModel):
+    id: str
+    label: Optional[str] = None
+    auto: bool
+    created_at: datetime
+    files: int
+    bytes: int
+    unique_bytes: Optional[int] = None
+
+class SnapshotDiffResponse(BaseModel):
+    project_name: str
+    from_snapshot: str
+    to_snapshot: Optional[str] = None
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+
+class RestoreSnapshotResponse(BaseModel):
+    project_name: str
+    restored: str
+    backup: SnapshotResponse
+    written: int
+    deleted: int
@@ -0,0 +1,300 @@
+"""
+Purpose:
+--------
+Trigram index per project backing full-text and regex search
+(`/projects/{name}/search`).
+
+Why this exists:
+----------------
+- Without it the UI downloads files to grep them client-side
+- Scanning every file per query does not stay interactive on projects
+  with thousands of files; the index narrows a query down to the few
+  files that can match before any file is read
+
+Design:
+-------
+- For every indexed file, the set of casefolded trigrams of its text,
+  plus posting sets (trigram -> files) to intersect at query time
+- A query is pruned with the trigrams of its text, or of the literal
+  runs every match of a regex must contain; candidates are then read
+  and matched for real, so results are always exact
+- Queries too short or too loose to prune (under 3 characters, `a|b`,
+  `\\w+`) scan every indexed file
+- Built lazily on first search and kept fresh like the tree index (see
+  `watched_index`): changed paths only are re-indexed
+- Ignored paths, binary files and files above SEARCH_MAX_FILE_KB are
+  not indexed and never searched
+- LRU bounded (SEARCH_INDEX_MAX_PROJECTS), idle indexes are dropped
+  after TREE_INDEX_IDLE_SECONDS
+- User patterns run on their own small pool (SEARCH_WORKERS), never on
+  the file I/O pool, with a SEARCH_TIMEOUT_SECONDS deadline; patterns
+  with nested repetition (`(a+)+`) are refused, since a running regex
+  cannot be interrupted. Patterns with inline flags are not pruned
+"""
+
+import asyncio
+import functools
+import logging
+import pathlib
+import re
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.file_service import file_service
+from agent_v1.api.watched_index import WatchedIndex, WatchedIndexCache
+from agent_v1.tools.listing import IgnoreRules, normalize_rel_path, path_parts
+from agent_v1.tools.search import (
+    IndexedFile,
+    index_file,
+    index_tree,
+    nested_quantifier,
+    query_trigrams,
+    search_files,
+)
+from agent_v1.tools.utils import ProjectFS
+
+logger = logging.getLogger("files")
+
+MAX_PATTERN_LENGTH = 1000
+
+
+# -------------------------------------------------------------------
+# Disk scans (run on the file I/O pool)
+# -------------------------------------------------------------------
+
+def _scan_tree(
+    root: pathlib.Path,
+    max_bytes: int,
+) -> Tuple[IgnoreRules, List[IndexedFile]]:
+    ignore = IgnoreRules.for_project(root)
+    return ignore, index_tree(root, root, ignore, max_bytes)
+
+
+def _scan_paths(
+    root: pathlib.Path,
+    ignore: IgnoreRules,
+    paths: Iterable[str],
+    max_bytes: int,
+) -> List[Tuple[str, List[IndexedFile]]]:
+    """
+    Current state of each path: [] when gone, ignored or not text,
+    the file itself, or every indexable file of a directory.
+    """
+    result = []
+
+    for rel in sorted(paths):
+        full = root / rel
+        docs: List[IndexedFile] = []
+
+        try:
+            mode = full.lstat().st_mode
+        except OSError:
+            mode = 0
+        is_dir = stat.S_ISDIR(mode)
+
+        if not ignore.is_ignored_path(rel, is_dir):
+            if is_dir:
+                docs = index_tree(root, full, ignore, max_bytes)
+            elif stat.S_ISREG(mode):
+                # index_file also rejects paths below symlinked directories
+                doc = index_file(root, rel, max_bytes)
+                if doc is not None:
+                    docs.append(doc)
+
+        result.append((rel, docs))
+
+    return result
+
+
+# -------------------------------------------------------------------
+# Project Index
+# -------------------------------------------------------------------
+
+class ProjectSearchIndex(WatchedIndex):
+    """
+    Trigram postings of one project tree.
+    """
+
+    def __init__(self, root: pathlib.Path, max_bytes: int):
+        self.max_bytes = max_bytes
+
+        self._files: Dict[str, IndexedFile] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        super().__init__(root)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    async def _build(self):
+        self._ignore, docs = await file_service.run(
+            _scan_tree, self.root, self.max_bytes
+        )
+        self._files = {}
+        self._postings = {}
+        for doc in docs:
+            self._add(doc)
+
+    async def _refresh_paths(self, paths: Set[str]):
+        scanned = await file_service.run(
+            _scan_paths, self.root, self._ignore, paths, self.max_bytes
+        )
+
+        for rel, docs in scanned:
+            prefix = rel + "/"
+            for path in [p for p in self._files if p == rel or p.startswith(prefix)]:
+                self._remove(path)
+            for doc in docs:
+                self._add(doc)
+
+    def _add(self, doc: IndexedFile):
+        self._files[doc.path] = doc
+        for gram in doc.grams:
+            self._postings.setdefault(gram, set()).add(doc.path)
+
+    def _remove(self, path: str):
+        doc = self._files.pop(path, None)
+        if doc is None:
+            return
+
+        for gram in doc.grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(path)
+                if not posting:
+                    del self._postings[gram]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def candidates(self, grams: Optional[Set[str]], directory: str) -> List[str]:
+        """Files that may match, in tree order."""
+        if grams is None:
+            paths: Iterable[str] = self._files
+        else:
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in grams),
+                key=len,
+            )
+            paths = set(postings[0])
+            for posting in postings[1:]:
+                if not paths:
+                    break
+                paths &= posting
+
+        if directory:
+            prefix = directory + "/"
+            paths = [p for p in paths if p.startswith(prefix)]
+
+        return sorted(paths, key=path_parts)
+
+
+# -------------------------------------------------------------------
+# Index Cache
+# -------------------------------------------------------------------
+
+class SearchIndexCache(WatchedIndexCache[ProjectSearchIndex]):
+    """
+    LRU of project search indexes.
+    """
+
+    def __init__(
+        self,
+        max_projects: int,
+        idle_seconds: int,
+        max_file_bytes: int,
+        workers: int,
+        timeout_seconds: float,
+    ):
+        super().__init__(max_projects, idle_seconds)
+        self.max_file_bytes = max_file_bytes
+        self.timeout_seconds = timeout_seconds
+
+        # Regex scans: a slow pattern only delays other searches
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers),
+            thread_name_prefix="search",
+        )
+
+    def _create(self, root: pathlib.Path) -> ProjectSearchIndex:
+        return ProjectSearchIndex(root, self.max_file_bytes)
+
+    async def search(
+        self,
+        fs: ProjectFS,
+        query: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        directory: str = ".",
+        limit: int = 200,
+        context: int = 2,
+    ) -> Dict:
+        """
+        Matching lines, in tree order. Raises ValueError for an invalid
+        pattern or directory.
+        """
+        if len(query) > MAX_PATTERN_LENGTH:
+            raise ValueError(f"Query longer than {MAX_PATTERN_LENGTH} characters")
+
+        if regex and nested_quantifier(query):
+            raise ValueError("Nested repetition such as (a+)+ is not supported")
+
+        try:
+            rx = re.compile(
+                query if regex else re.escape(query),
+                0 if case_sensitive else re.IGNORECASE,
+            )
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}")
+
+        rel = normalize_rel_path(directory)
+        index = self._get(fs.root)
+
+        try:
+            await index.settled()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.forget(fs.root)
+            raise
+
+        paths = index.candidates(query_trigrams(query, regex), rel)
+
+        loop = asyncio.get_running_loop()
+        matches, searched, truncated = await loop.run_in_executor(
+            self._executor,
+            functools.partial(
+                search_files,
+                fs.root,
+                paths,
+                rx,
+                limit,
+                context,
+                self.max_file_bytes,
+                deadline=time.monotonic() + self.timeout_seconds,
+            ),
+        )
+
+        return {
+            "matches": matches,
+            "files_indexed": len(index),
+            "files_searched": searched,
+            "truncated": truncated,
+        }
+
+
+# Singleton instance used across the application
+search_index = SearchIndexCache(
+    max_projects=Config.SEARCH_INDEX_MAX_PROJECTS,
+    idle_seconds=Config.TREE_INDEX_IDLE_SECONDS,
+    max_file_bytes=Config.SEARCH_MAX_FILE_KB * 1024,
+    workers=Config.SEARCH_WORKERS,
+    timeout_seconds=Config.SEARCH_TIMEOUT_SECONDS,
+)
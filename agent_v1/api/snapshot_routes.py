@@ -0,0 +1,226 @@
+"""
+Purpose:
+--------
+HTTP API for project snapshots (point-in-time copies) and rollback.
+
+Design:
+-------
+- Snapshots are hardlink trees (see `agent_v1.storage.snapshots`),
+  taken in milliseconds and sharing unchanged files with the project
+- While the project's container is running or paused, snapshots and
+  restores use real copies, because processes in the container may
+  write in place (a paused container resumes without materializing)
+- Every restore first snapshots the current state, so it can be undone
+- All disk work runs on the file I/O pool
+
+Security:
+---------
+- JWT protected
+- Project ownership enforced
+- Snapshot operations rate-limited like file operations
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+
+from agent_v1.api.auth.dependencies import AuthDependency
+from agent_v1.api.auth.rate_limits import file_ops_limit
+from agent_v1.api.db.models import Project
+from agent_v1.api.file_service import file_service
+from agent_v1.api.guards import ensure_project_access
+from agent_v1.api.schemas.graph import (
+    CreateSnapshotRequest,
+    RestoreSnapshotResponse,
+    SnapshotDiffResponse,
+    SnapshotResponse,
+)
+from agent_v1.api.search_index import search_index
+from agent_v1.api.tree_index import tree_index
+from agent_v1.runtime.admission import ALLOCATED_STATUSES
+from agent_v1.runtime.repository import RuntimeRepository, RuntimeNotFound
+from agent_v1.storage.reaper import trash_reaper
+from agent_v1.storage.snapshots import SnapshotInfo, SnapshotNotFound, snapshot_store
+from agent_v1.tools.utils import ProjectFS
+
+router = APIRouter(prefix="/projects", tags=["snapshots"])
+runtime_repo = RuntimeRepository()
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def _to_response(info: SnapshotInfo, unique_bytes: Optional[int] = None) -> SnapshotResponse:
+    return SnapshotResponse(
+        id=info.id,
+        label=info.label,
+        auto=info.auto,
+        created_at=info.created_at,
+        files=info.files,
+        bytes=info.bytes,
+        unique_bytes=unique_bytes,
+    )
+
+
+def _not_found(snapshot_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Snapshot not found: {snapshot_id}",
+    )
+
+
+async def _can_link(project: Project) -> bool:
+    """Hardlinks are only safe while no container can write in place."""
+    try:
+        runtime = await runtime_repo.get(project.name)
+    except RuntimeNotFound:
+        return True
+
+    return runtime.status not in ALLOCATED_STATUSES
+
+# -------------------------------------------------------------------
+# Snapshots
+# -------------------------------------------------------------------
+
+@router.post(
+    "/{project_name}/snapshots",
+    response_model=SnapshotResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def create_snapshot(
+    project_name: str,
+    payload: CreateSnapshotRequest = Body(default_factory=CreateSnapshotRequest),
+    user=Depends(AuthDependency.get_current_user),
+):
+    project = await ensure_project_access(project_name, user)
+
+    info = await file_service.run(
+        snapshot_store.create,
+        project.project_root,
+        label=payload.label,
+        link=await _can_link(project),
+    )
+
+    return _to_response(info)
+
+
+@router.get(
+    "/{project_name}/snapshots",
+    response_model=List[SnapshotResponse],
+    dependencies=[Depends(file_ops_limit)],
+)
+async def list_snapshots(
+    project_name: str,
+    usage: bool = Query(False, description="Also compute bytes held only by each snapshot"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    project = await ensure_project_access(project_name, user)
+    name = ProjectFS(project.project_root).root.name
+
+    infos = await file_service.run(snapshot_store.list, name)
+
+    if not usage:
+        return [_to_response(info) for info in infos]
+
+    return [
+        _to_response(info, await file_service.run(snapshot_store.unique_bytes, name, info.id))
+        for info in infos
+    ]
+
+
+@router.get(
+    "/{project_name}/snapshots/diff",
+    response_model=SnapshotDiffResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def diff_snapshots(
+    project_name: str,
+    from_snapshot: str = Query(..., alias="from"),
+    to_snapshot: Optional[str] = Query(None, alias="to", description="Omit to compare with the live tree"),
+    user=Depends(AuthDependency.get_current_user),
+):
+    project = await ensure_project_access(project_name, user)
+
+    try:
+        changes = await file_service.run(
+            snapshot_store.diff,
+            project.project_root,
+            from_snapshot,
+            to_snapshot,
+        )
+    except SnapshotNotFound as e:
+        raise _not_found(str(e))
+
+    return SnapshotDiffResponse(
+        project_name=project_name,
+        from_snapshot=from_snapshot,
+        to_snapshot=to_snapshot,
+        **changes,
+    )
+
+
+@router.post(
+    "/{project_name}/snapshots/{snapshot_id}/restore",
+    response_model=RestoreSnapshotResponse,
+    dependencies=[Depends(file_ops_limit)],
+)
+async def restore_snapshot(
+    project_name: str,
+    snapshot_id: str,
+    user=Depends(AuthDependency.get_current_user),
+):
+    project = await ensure_project_access(project_name, user)
+    fs = ProjectFS(project.project_root)
+    link = await _can_link(project)
+
+    try:
+        await file_service.run(snapshot_store.get, fs.root.name, snapshot_id)
+    except SnapshotNotFound:
+        raise _not_found(snapshot_id)
+
+    backup = await file_service.run(
+        snapshot_store.create,
+        fs.root,
+        label=f"before restore of {snapshot_id}",
+        auto=True,
+        link=link,
+    )
+
+    result = await file_service.run(snapshot_store.restore, fs.root, snapshot_id, link)
+
+    # Many paths changed at once: rebuild the indexes lazily
+    tree_index.forget(fs.root)
+    search_index.forget(fs.root)
+
+    return RestoreSnapshotResponse(
+        project_name=project_name,
+        restored=snapshot_id,
+        backup=_to_response(backup),
+        **result,
+    )
+
+
+@router.delete(
+    "/{project_name}/snapshots/{snapshot_id}",
+    dependencies=[Depends(file_ops_limit)],
+)
+async def delete_snapshot(
+    project_name: str,
+    snapshot_id: str,
+    user=Depends(AuthDependency.get_current_user),
+):
+    project = await ensure_project_access(project_name, user)
+
+    try:
+        await file_service.run(
+            snapshot_store.delete,
+            ProjectFS(project.project_root).root.name,
+            snapshot_id,
+        )
+    except SnapshotNotFound:
+        raise _not_found(snapshot_id)
+
+    trash_reaper.notify()
+
+    return {"status": "deleted", "snapshot": snapshot_id}
@@ -0,0 +1,267 @@
+"""
+Purpose:
+--------
+In-memory file tree index per project, serving directory listings
+without touching the disk.
+
+Why this exists:
+----------------
+- The editor polls `/projects/{name}/files`; rewalking the tree on every
+  call competes for I/O with the project's running container
+- After the first walk, a listing is a bisect into a sorted key list
+  and costs O(result)
+
+Design:
+-------
+- Populated lazily on first access (one scandir walk, with metadata)
+- Kept current like every watched index (see `watched_index`): changed
+  paths are re-scanned on the disk I/O pool and spliced in, and
+  listings wait for pending refreshes (read-your-writes)
+- LRU bounded (TREE_INDEX_MAX_PROJECTS); indexes idle for
+  TREE_INDEX_IDLE_SECONDS are dropped with their watcher
+- Listings that bypass ignore rules go straight to disk
+"""
+
+import asyncio
+import logging
+import pathlib
+import stat
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.file_service import file_service
+from agent_v1.api.watched_index import WatchedIndex, WatchedIndexCache
+from agent_v1.tools.listing import (
+    IgnoreRules,
+    WalkEntry,
+    iter_tree,
+    normalize_rel_path,
+    path_parts,
+)
+from agent_v1.tools.utils import ProjectFS
+
+logger = logging.getLogger("files")
+
+Key = Tuple[str, ...]
+
+# Sorts after every real path component: (*prefix, _MAX) bounds a subtree
+_MAX = "\U0010ffff"
+
+
+def _subtree_bounds(keys: List[Key], prefix: Key) -> Tuple[int, int]:
+    return bisect_left(keys, prefix), bisect_left(keys, prefix + (_MAX,))
+
+
+# -------------------------------------------------------------------
+# Disk scans (run on the file I/O pool)
+# -------------------------------------------------------------------
+
+def _scan_tree(root: pathlib.Path) -> Tuple[IgnoreRules, List[WalkEntry]]:
+    ignore = IgnoreRules.for_project(root)
+    entries = list(
+        iter_tree(root, root, ignore=ignore, include_dirs=True, with_metadata=True)
+    )
+    return ignore, entries
+
+
+def _scan_paths(
+    root: pathlib.Path,
+    ignore: IgnoreRules,
+    paths: Iterable[str],
+) -> List[Tuple[str, List[WalkEntry]]]:
+    """
+    Current state of each path: [] when gone or ignored, the entry
+    itself for a file, the entry plus its subtree for a directory.
+    """
+    result = []
+
+    for rel in sorted(paths):
+        full = root / rel
+        entries: List[WalkEntry] = []
+
+        try:
+            st = full.lstat()
+        except OSError:
+            result.append((rel, entries))
+            continue
+
+        # Same rule as iter_tree: symlinks are never followed nor listed
+        is_dir = stat.S_ISDIR(st.st_mode)
+        is_file = stat.S_ISREG(st.st_mode)
+
+        if (is_dir or is_file) and not ignore.is_ignored_path(rel, is_dir):
+            entries.append(
+                WalkEntry(
+                    path=rel,
+                    type="dir" if is_dir else "file",
+                    size=st.st_size if is_file else None,
+                    mtime=st.st_mtime,
+                )
+            )
+            if is_dir:
+                entries.extend(
+                    iter_tree(
+                        root,
+                        full,
+                        ignore=ignore,
+                        include_dirs=True,
+                        with_metadata=True,
+                    )
+                )
+
+        result.append((rel, entries))
+
+    return result
+
+
+# -------------------------------------------------------------------
+# Project Index
+# -------------------------------------------------------------------
+
+class ProjectTreeIndex(WatchedIndex):
+    """
+    Sorted in-memory snapshot of one project tree.
+    """
+
+    def __init__(self, root: pathlib.Path):
+        self._entries: Dict[Key, WalkEntry] = {}
+        self._keys: List[Key] = []
+        super().__init__(root)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    async def _build(self):
+        self._ignore, entries = await file_service.run(_scan_tree, self.root)
+        self._entries = {path_parts(e.path): e for e in entries}
+        self._keys = sorted(self._entries)
+
+    async def _refresh_paths(self, paths: Set[str]):
+        scanned = await file_service.run(_scan_paths, self.root, self._ignore, paths)
+
+        for rel, entries in scanned:
+            self._splice(path_parts(rel), entries)
+
+    def _splice(self, prefix: Key, entries: List[WalkEntry]):
+        lo, hi = _subtree_bounds(self._keys, prefix)
+
+        for key in self._keys[lo:hi]:
+            del self._entries[key]
+
+        new_keys = [path_parts(e.path) for e in entries]
+        self._keys[lo:hi] = new_keys
+        self._entries.update(zip(new_keys, entries))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def has_dir(self, rel: str) -> bool:
+        if not rel:
+            return True
+        entry = self._entries.get(path_parts(rel))
+        return entry is not None and entry.type == "dir"
+
+    def list(
+        self,
+        directory: str,
+        max_depth: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_dirs: bool = False,
+        with_metadata: bool = False,
+    ) -> Tuple[List[WalkEntry], Optional[str]]:
+        """
+        Same page `list_tree` would return for this directory.
+        """
+        base = path_parts(directory)
+        keys = self._keys
+
+        lo, hi = _subtree_bounds(keys, base)
+        if base:
+            lo += 1  # the directory itself
+        if cursor:
+            lo = max(lo, bisect_right(keys, path_parts(cursor)))
+
+        items: List[WalkEntry] = []
+        i = lo
+
+        while i < hi:
+            key = keys[i]
+
+            if max_depth is not None and len(key) - len(base) > max_depth:
+                # Skip the whole subtree below the depth limit
+                i = bisect_left(keys, key[:len(base) + max_depth] + (_MAX,), i, hi)
+                continue
+
+            i += 1
+            entry = self._entries[key]
+
+            if entry.type == "dir" and not include_dirs:
+                continue
+
+            if limit is not None and len(items) >= limit:
+                return items, items[-1].path
+
+            items.append(
+                entry if with_metadata
+                else WalkEntry(path=entry.path, type=entry.type)
+            )
+
+        return items, None
+
+
+# -------------------------------------------------------------------
+# Index Cache
+# -------------------------------------------------------------------
+
+class TreeIndexCache(WatchedIndexCache[ProjectTreeIndex]):
+    """
+    LRU of project tree indexes.
+    """
+
+    def _create(self, root: pathlib.Path) -> ProjectTreeIndex:
+        return ProjectTreeIndex(root)
+
+    async def list_entries(
+        self,
+        fs: ProjectFS,
+        directory: str = ".",
+        include_ignored: bool = False,
+        **options,
+    ) -> Tuple[List[WalkEntry], Optional[str]]:
+        """
+        Drop-in for `file_service.list_entries`, served from memory.
+        Raises ValueError like the disk variant.
+        """
+        rel = normalize_rel_path(directory)
+
+        if include_ignored:
+            return await file_service.list_entries(
+                fs, directory, include_ignored=True, **options
+            )
+
+        index = self._get(fs.root)
+        try:
+            await index.settled()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Tree index build failed for %s", fs.root)
+            self.forget(fs.root)
+            return await file_service.list_entries(fs, directory, **options)
+
+        if not index.has_dir(rel):
+            # Missing, a file, or ignored: let the disk path decide
+            return await file_service.list_entries(fs, directory, **options)
+
+        return index.list(rel, **options)
+
+
+# Singleton instance used across the application
+tree_index = TreeIndexCache(
+    max_projects=Config.TREE_INDEX_MAX_PROJECTS,
+    idle_seconds=Config.TREE_INDEX_IDLE_SECONDS,
+)
@@ -18,7 +18,6 @@ Security:
 - NO per-project ownership checks needed
 """
 
-import shutil
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -29,9 +28,18 @@ from agent_v1.api.auth.rate_limits import runtime_operation_limit
 from agent_v1.api.db.models import Project
 
 from agent_v1.runtime.repository import RuntimeRepository, RuntimeNotFound
+from agent_v1.runtime.admission import AdmissionRefused
 from agent_v1.runtime.docker_manager import docker_manager, DockerError
 from agent_v1.runtime.terminal_manager import terminal_manager
 from agent_v1.api.project_utils import GENERATED_PROJECTS_ROOT
+from agent_v1.api.file_service import file_service
+from agent_v1.api.search_index import search_index
+from agent_v1.api.tree_index import tree_index
+from agent_v1.storage.blob_store import blob_store
+from agent_v1.storage.reaper import trash_reaper
+from agent_v1.storage.snapshots import snapshot_store
+from agent_v1.tools.trash import move_to_trash
+from agent_v1.tools.utils import ProjectFS
 
 router = APIRouter(
     prefix="/manage",
@@ -105,14 +113,11 @@ async def start_runtime(
         raise HTTPException(status_code=404, detail="Project not found")
 
     try:
-        try:
-            await repo.get(project.name)
-        except RuntimeNotFound:
-            await docker_manager.create_container(project.name)
-
-        await docker_manager.start_container(project.name)
+        await docker_manager.ensure_running(project.name)
         return {"status": "running"}
 
+    except AdmissionRefused as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
     except DockerError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -191,8 +196,19 @@ async def delete_project(
         raise HTTPException(status_code=500, detail=str(e))
 
     project_path = GENERATED_PROJECTS_ROOT / project.name
+    tree_index.forget(ProjectFS(project.project_root).root)
+    search_index.forget(ProjectFS(project.project_root).root)
+    # Renamed into the trash; the reaper reclaims the disk space
     if project_path.exists():
-        shutil.rmtree(project_path)
+        await file_service.run(move_to_trash, project_path)
+
+    await file_service.run(snapshot_store.delete_all, project_path.name)
+
+    # Objects still linked from the trash are collected after reclaim
+    if blob_store.enabled:
+        await file_service.run(blob_store.release, project.name)
+
+    trash_reaper.notify()
 
     await project.delete()
 
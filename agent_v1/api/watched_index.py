@@ -0,0 +1,201 @@
+"""
+Purpose:
+--------
+Shared machinery of the in-memory per-project indexes (tree listing,
+search): watcher-driven refresh and an LRU cache with idle expiry.
+
+Why this exists:
+----------------
+- Both indexes keep a derived copy of a project tree current the same
+  way; only what they scan and how they store it differs
+
+Design:
+-------
+- `WatchedIndex` builds itself once (`_build`) and then re-scans only
+  changed paths (`_refresh_paths`), fed by the shared project watcher
+  (`file_watch_hub`) and by API writes (`invalidate`); a .gitignore
+  change triggers a rebuild
+- Refreshes are serialized in one task per index and never race the
+  initial build; `settled()` waits for both (read-your-writes)
+- `WatchedIndexCache` keeps at most `max_projects` indexes in LRU order
+  and drops indexes idle for `idle_seconds`, closing their watcher
+- Mutations only happen on the event loop; subclasses do disk work on
+  the file I/O pool and apply plain data
+"""
+
+import asyncio
+import pathlib
+import time
+from collections import OrderedDict
+from typing import Generic, Iterable, List, Optional, Set, TypeVar
+
+from agent_v1.api.file_watcher import FileChange, file_watch_hub
+from agent_v1.tools.listing import IgnoreRules, normalize_rel_path
+
+SWEEP_INTERVAL_SECONDS = 60
+
+
+# -------------------------------------------------------------------
+# Project Index
+# -------------------------------------------------------------------
+
+class WatchedIndex:
+    """
+    In-memory index of one project tree, kept current by its watcher.
+    Subclasses set up their own state before calling this constructor.
+    """
+
+    def __init__(self, root: pathlib.Path):
+        self.root = root
+        self.last_access = time.monotonic()
+
+        self._ignore: Optional[IgnoreRules] = None
+
+        self._pending: Set[str] = set()
+        self._rebuild = False
+        self._refresh: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self._unsubscribe = file_watch_hub.subscribe(root, self._on_changes)
+        self._ready = asyncio.create_task(self._build())
+
+    async def _build(self):
+        """Index the whole tree (sets `_ignore`)."""
+        raise NotImplementedError
+
+    async def _refresh_paths(self, paths: Set[str]):
+        """Replace what is indexed at and below each of `paths`."""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _on_changes(self, changes: List[FileChange]):
+        self.invalidate(change.path for change in changes)
+
+    def invalidate(self, paths: Iterable[str]):
+        if self._closed:
+            return
+
+        for path in paths:
+            if path == ".gitignore":
+                self._rebuild = True
+            self._pending.add(path)
+
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._apply_pending())
+
+    async def _apply_pending(self):
+        # Never race the initial build
+        await asyncio.shield(self._ready)
+
+        while self._pending or self._rebuild:
+            if self._rebuild:
+                self._rebuild = False
+                self._pending.clear()
+                await self._build()
+                continue
+
+            paths, self._pending = self._pending, set()
+            await self._refresh_paths(paths)
+
+    async def settled(self):
+        await asyncio.shield(self._ready)
+        if self._refresh is not None and not self._refresh.done():
+            await asyncio.shield(self._refresh)
+
+    def close(self):
+        # In-flight scans are left to finish: readers may be awaiting them
+        self._closed = True
+        self._unsubscribe()
+
+
+# -------------------------------------------------------------------
+# Index Cache
+# -------------------------------------------------------------------
+
+IndexT = TypeVar("IndexT", bound=WatchedIndex)
+
+
+class WatchedIndexCache(Generic[IndexT]):
+    """
+    LRU of project indexes, dropped when idle.
+    """
+
+    def __init__(self, max_projects: int, idle_seconds: int):
+        self.max_projects = max(1, max_projects)
+        self.idle_seconds = idle_seconds
+
+        self._indexes: "OrderedDict[pathlib.Path, IndexT]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def _create(self, root: pathlib.Path) -> IndexT:
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+        while self._indexes:
+            _, index = self._indexes.popitem()
+            index.close()
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+            cutoff = time.monotonic() - self.idle_seconds
+            for root, index in list(self._indexes.items()):
+                if index.last_access < cutoff:
+                    self.forget(root)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def _get(self, root: pathlib.Path) -> IndexT:
+        index = self._indexes.get(root)
+
+        if index is None:
+            index = self._create(root)
+            self._indexes[root] = index
+
+            while len(self._indexes) > self.max_projects:
+                _, evicted = self._indexes.popitem(last=False)
+                evicted.close()
+        else:
+            self._indexes.move_to_end(root)
+
+        index.last_access = time.monotonic()
+        return index
+
+    def forget(self, root: pathlib.Path):
+        index = self._indexes.pop(root, None)
+        if index:
+            index.close()
+
+    def invalidate(self, root: pathlib.Path, paths: Iterable[str]):
+        """Re-scan `paths` (relative) after the API changed them."""
+        index = self._indexes.get(root)
+        if index is None:
+            return
+
+        normalized = []
+        for path in paths:
+            try:
+                rel = normalize_rel_path(path)
+            except ValueError:
+                continue
+            if rel:
+                normalized.append(rel)
+
+        index.invalidate(normalized)
@@ -1,16 +1,25 @@
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph
 from langgraph.constants import END
+from langgraph.config import get_stream_writer
 from langchain.agents import create_agent
 
-from agent_v1.graph.states import File, Plan, TaskPlan, CoderState
+from agent_v1.graph.states import File, Plan, TaskPlan, CoderState, ImplementationTask
+from agent_v1.graph.scheduler import run_steps
 from agent_v1.prompts.prompts import planner_prompt, architect_prompt, coder_system_prompt
-from agent_v1.tools.filesystem import read_file, write_file, list_files, get_current_directory, set_project_root
+from agent_v1.tools.filesystem import read_file, write_file, list_files, get_current_directory, project_root_context
 from agent_v1.tools.project_root import create_project_root
+from agent_v1.storage.snapshots import snapshot_store
+
+# Maximum coder steps executed concurrently per generation
+DEFAULT_CODER_WORKERS = 4
+
+# Snapshot the project tree before each coder step (hardlinks, cheap)
+DEFAULT_SNAPSHOT_STEPS = True
 
 # Environment & LLM Setup
 def get_llm() -> ChatOpenAI:
@@ -66,40 +75,18 @@ def architect_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     return { "plan": plan, "task_plan": task_plan}
 
 
-def coder_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+def coder_step(task: ImplementationTask) -> None:
     """
-    Iterative tool-using coding agent.
+    Runs one tool-using coding agent for a single implementation task.
     """
     llm = get_llm()
 
-    coder_state: CoderState | None = state.get("coder_state")
-
-    if coder_state is None:
-        project_dir = create_project_root(state["plan"].name)
-        coder_state = CoderState(
-            task_plan=state["task_plan"],
-            project_root=str(project_dir),
-            current_step_idx=0
-        )
-
-    set_project_root(coder_state.project_root)
-
-    steps = coder_state.task_plan.implementation_steps
-
-    if coder_state.current_step_idx >= len(steps):
-        return {
-            "coder_state": coder_state,
-            "status": "DONE"
-        }
-
-    current_task = steps[coder_state.current_step_idx]
-
-    existing_content = read_file.run(current_task.filepath)
+    existing_content = read_file.run(task.filepath)
 
     system_prompt = coder_system_prompt()
     user_prompt = (
-        f"Task: {current_task.task_description}\n"
-        f"File: {current_task.filepath}\n\n"
+        f"Task: {task.task_description}\n"
+        f"File: {task.filepath}\n\n"
         f"Existing Content:\n{existing_content}\n\n"
         "Use write_file(path, content) to save your changes."
     )
@@ -121,9 +108,65 @@ def coder_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         {"messages": [{"role": "user", "content": user_prompt}]}
     )
 
-    coder_state.current_step_idx += 1
 
-    return {"coder_state": coder_state}
+def coder_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Executes all implementation steps along their dependency DAG.
+    Independent steps run concurrently (bounded by max_coder_workers).
+    """
+    coder_state: CoderState | None = state.get("coder_state")
+
+    if coder_state is None:
+        project_dir = create_project_root(state["plan"].name)
+        coder_state = CoderState(
+            task_plan=state["task_plan"],
+            project_root=str(project_dir),
+        )
+
+    steps = coder_state.task_plan.implementation_steps
+    writer = get_stream_writer()
+    writer({
+        "event": "coder_started",
+        "project_root": coder_state.project_root,
+        "total": len(steps),
+    })
+
+    def on_complete(idx: int, task: ImplementationTask) -> None:
+        coder_state.completed_steps.append(idx)
+        writer({
+            "event": "step_completed",
+            "step": idx,
+            "filepath": task.filepath,
+            "completed": len(coder_state.completed_steps),
+            "total": len(steps),
+        })
+
+    snapshot_steps = state.get("snapshot_steps", DEFAULT_SNAPSHOT_STEPS)
+
+    def run_step(idx: int, task: ImplementationTask) -> None:
+        if snapshot_steps:
+            snapshot_store.create(
+                coder_state.project_root,
+                label=f"before step {idx}: {task.filepath}",
+                auto=True,
+            )
+        coder_step(task)
+
+    # The root is bound to this run's context; the scheduler copies the
+    # context into each step so the tools resolve paths against it.
+    with project_root_context(coder_state.project_root):
+        run_steps(
+            steps,
+            run_step=run_step,
+            max_workers=state.get("max_coder_workers", DEFAULT_CODER_WORKERS),
+            completed=set(coder_state.completed_steps),
+            on_complete=on_complete,
+        )
+
+    return {
+        "coder_state": coder_state,
+        "status": "DONE"
+    }
 
 # Graph Factory
 def build_graph():
@@ -139,22 +182,18 @@ def build_graph():
 
     graph.add_edge("planner", "architect")
     graph.add_edge("architect", "coder")
-
-    graph.add_conditional_edges(
-        "coder",
-        lambda state: "END" if state.get("status") == "DONE" else "coder",
-        {
-            "END": END,
-            "coder": "coder"
-        }
-    )
+    graph.add_edge("coder", END)
 
     graph.set_entry_point("planner")
 
     return graph.compile()
 
 # Public API (FastAPI-friendly)
-def run_agent(user_prompt: str) -> Dict[str, Any]:
+def run_agent(
+    user_prompt: str,
+    max_coder_workers: int = DEFAULT_CODER_WORKERS,
+    snapshot_steps: bool = DEFAULT_SNAPSHOT_STEPS,
+) -> Dict[str, Any]:
     """
     Public callable entry point.
     This is what FastAPI should call.
@@ -163,10 +202,63 @@ def run_agent(user_prompt: str) -> Dict[str, Any]:
     agent = build_graph()
 
     return agent.invoke(
-        {"user_prompt": user_prompt}
+        {
+            "user_prompt": user_prompt,
+            "max_coder_workers": max_coder_workers,
+            "snapshot_steps": snapshot_steps,
+        }
     )
 
 
+def _progress_events(mode: str, chunk: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Maps LangGraph stream chunks ("updates" / "custom") to progress events.
+    """
+    if mode == "custom":
+        yield chunk
+        return
+
+    for node, update in chunk.items():
+        if node == "planner":
+            yield {"event": "plan_ready", "plan": update["plan"]}
+        elif node == "architect":
+            yield {"event": "task_plan_ready", "task_plan": update["task_plan"]}
+        elif node == "coder":
+            yield {
+                "event": "generation_completed",
+                "coder_state": update["coder_state"],
+            }
+
+
+def stream_agent(
+    user_prompt: str,
+    max_coder_workers: int = DEFAULT_CODER_WORKERS,
+    snapshot_steps: bool = DEFAULT_SNAPSHOT_STEPS,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Runs the graph and yields progress events as they happen.
+
+    Events (by "event" key):
+    - plan_ready            → {"plan": Plan}
+    - task_plan_ready       → {"task_plan": TaskPlan}
+    - coder_started         → {"project_root", "total"}
+    - step_completed        → {"step", "filepath", "completed", "total"}
+    - generation_completed  → {"coder_state": CoderState}
+    """
+    init_environment()
+    agent = build_graph()
+
+    for mode, chunk in agent.stream(
+        {
+            "user_prompt": user_prompt,
+            "max_coder_workers": max_coder_workers,
+            "snapshot_steps": snapshot_steps,
+        },
+        stream_mode=["updates", "custom"],
+    ):
+        yield from _progress_events(mode, chunk)
+
+
 # Local CLI Test
 if __name__ == "__main__":
     result = run_agent(
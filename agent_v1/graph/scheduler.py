@@ -0,0 +1,107 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Set
+
+from agent_v1.graph.states import ImplementationTask
+
+# Step Dependency Graph
+def build_step_dependencies(steps: List[ImplementationTask]) -> Dict[int, Set[int]]:
+    """
+    Maps each step index to the indexes of steps that must finish first.
+
+    A step waits for:
+    - the latest earlier step writing the same file (ordered revisits)
+    - the latest earlier step writing each file in `depends_on`
+    - earlier steps that depend on its file, so a revisit never
+      rewrites a file another step is still reading
+
+    Only earlier steps are considered, so the result is always acyclic.
+    Unknown paths in `depends_on` are ignored.
+    """
+    last_writer: Dict[str, int] = {}
+    readers: Dict[str, Set[int]] = {}
+    dependencies: Dict[int, Set[int]] = {}
+
+    for idx, step in enumerate(steps):
+        target = _normalize(step.filepath)
+        sources = {_normalize(path) for path in step.depends_on} - {target}
+        deps: Set[int] = set(readers.pop(target, ()))
+
+        for path in [target, *sources]:
+            writer = last_writer.get(path)
+            if writer is not None:
+                deps.add(writer)
+
+        for path in sources:
+            readers.setdefault(path, set()).add(idx)
+
+        dependencies[idx] = deps
+        last_writer[target] = idx
+
+    return dependencies
+
+
+def _normalize(path: str) -> str:
+    path = path.strip().replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+# DAG Execution
+def run_steps(
+    steps: List[ImplementationTask],
+    run_step: Callable[[int, ImplementationTask], None],
+    max_workers: int,
+    completed: Set[int] | None = None,
+    on_complete: Callable[[int, ImplementationTask], None] | None = None,
+) -> List[int]:
+    """
+    Runs steps concurrently along their dependency DAG.
+
+    - At most `max_workers` steps run at once
+    - A step starts only after all of its dependencies finished
+    - Steps listed in `completed` are treated as already done
+    - The first failing step cancels pending work and re-raises
+
+    `on_complete` is called from the calling thread, in completion order.
+    Returns step indexes in completion order.
+    """
+    dependencies = build_step_dependencies(steps)
+    done: Set[int] = set(completed or ())
+    pending = [idx for idx in range(len(steps)) if idx not in done]
+    running: Dict[Future, int] = {}
+    order: List[int] = []
+    max_workers = max(1, max_workers)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="coder",
+    ) as executor:
+        while pending or running:
+            for idx in [i for i in pending if dependencies[i] <= done]:
+                if len(running) >= max_workers:
+                    break
+                pending.remove(idx)
+                # Each step gets its own context copy so LangGraph config
+                # (callbacks, stream writer) follows it into the worker.
+                ctx = contextvars.copy_context()
+                running[executor.submit(ctx.run, run_step, idx, steps[idx])] = idx
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                idx = running.pop(future)
+                try:
+                    future.result()
+                except BaseException:
+                    for other in running:
+                        other.cancel()
+                    raise
+
+                done.add(idx)
+                order.append(idx)
+                if on_complete:
+                    on_complete(idx, steps[idx])
+
+    return order
@@ -77,6 +77,14 @@ class ImplementationTask(BaseModel):
         )
     )
 
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description=(
+            "Relative file paths (written by EARLIER steps) that this step "
+            "needs to read or import. Leave empty if the file is independent."
+        )
+    )
+
 
 class TaskPlan(BaseModel):
     """
@@ -84,14 +92,16 @@ class TaskPlan(BaseModel):
     """
     implementation_steps: List[ImplementationTask] = Field(
         ...,
-        description="Sequential steps required to implement the application"
+        description=(
+            "Steps required to implement the application, in dependency order"
+        )
     )
 
 
 # Coder Runtime State
 class CoderState(BaseModel):
     """
-    Mutable runtime state for the coder agent while iterating through tasks.
+    Mutable runtime state for the coder agent while executing tasks.
     """
     task_plan: TaskPlan = Field(
         ...,
@@ -103,9 +113,9 @@ class CoderState(BaseModel):
         description="Absolute path to this project's root directory"
     )
 
-    current_step_idx: int = Field(
-        0,
-        description="Index of the current implementation step"
+    completed_steps: List[int] = Field(
+        default_factory=list,
+        description="Indexes of implementation steps that have finished"
     )
 
     current_file_content: Optional[str] = Field(
@@ -0,0 +1,206 @@
+"""
+Purpose:
+--------
+Database access layer for asynchronous project generation jobs.
+
+Design Principles:
+------------------
+- The `generation_jobs` table is the persistent job queue
+- Jobs are claimed atomically (FOR UPDATE SKIP LOCKED), so any number
+  of workers, on any number of nodes, can drain the same queue
+- Only the worker that claimed a job writes its progress: every
+  update matches the claim (`status="running"` and the `started_at`
+  set when claiming), so a worker whose job was requeued and claimed
+  again cannot overwrite the new run
+- Running jobs heartbeat (bump `updated_at`) while the pipeline works,
+  so only jobs of dead workers turn stale
+
+Job lifecycle:
+--------------
+queued → running → succeeded | failed
+"""
+# agent_v1/jobs/repository.py
+
+from datetime import timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from agent_v1.api.db.models import GenerationJob, Project, User
+from agent_v1.tools.utils import get_current_utc
+
+
+class JobNotFound(Exception):
+    pass
+
+
+class JobRepository:
+    """
+    Repository for GenerationJob persistence.
+    """
+
+    # ------------------------------------------------------------------
+    # Create / Read
+    # ------------------------------------------------------------------
+
+    async def create(self, owner: User, prompt: str) -> GenerationJob:
+        return await GenerationJob.create(
+            owner=owner,
+            prompt=prompt,
+            status="queued",
+        )
+
+    async def get(self, job_id: UUID) -> GenerationJob:
+        job = await GenerationJob.get_or_none(id=job_id)
+        if not job:
+            raise JobNotFound(job_id)
+        return job
+
+    async def get_for_user(self, job_id: UUID, user: User) -> GenerationJob:
+        job = (
+            await GenerationJob.get_or_none(id=job_id)
+            .select_related("project")
+        )
+
+        if not job or not (user.is_admin or job.owner_id == user.id):
+            raise JobNotFound(job_id)
+
+        return job
+
+    async def list_for_user(
+        self,
+        user: User,
+        limit: int = 50,
+    ) -> List[GenerationJob]:
+        return (
+            await GenerationJob
+            .filter(owner=user)
+            .select_related("project")
+            .order_by("-created_at")
+            .limit(limit)
+        )
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    async def claim_next(self) -> Optional[GenerationJob]:
+        """
+        Atomically move the oldest queued job to `running`.
+        Returns None when the queue is empty.
+        """
+        async with in_transaction() as conn:
+            job = (
+                await GenerationJob
+                .filter(status="queued")
+                .order_by("created_at")
+                .select_for_update(skip_locked=True)
+                .using_db(conn)
+                .first()
+            )
+
+            if not job:
+                return None
+
+            job.status = "running"
+            job.stage = "planner"
+            job.started_at = get_current_utc()
+            await job.save(using_db=conn)
+
+        return job
+
+    async def requeue_stale(self, stale_after: timedelta) -> int:
+        """
+        Return `running` jobs abandoned by a crashed worker to the queue.
+
+        A job is stale when it was not updated within `stale_after`
+        (workers bump `updated_at` on every event and heartbeat).
+        """
+        cutoff = get_current_utc() - stale_after
+
+        return await GenerationJob.filter(
+            status="running",
+            updated_at__lt=cutoff,
+        ).update(
+            status="queued",
+            stage=None,
+            total_steps=0,
+            completed_steps=0,
+            progress=[],
+            started_at=None,
+            updated_at=get_current_utc(),
+        )
+
+    # ------------------------------------------------------------------
+    # Progress updates
+    # ------------------------------------------------------------------
+    # Each returns False when `job` is no longer claimed by the caller.
+
+    @staticmethod
+    def _claimed(job: GenerationJob) -> QuerySet[GenerationJob]:
+        return GenerationJob.filter(
+            id=job.id,
+            status="running",
+            started_at=job.started_at,
+        )
+
+    async def heartbeat(self, job: GenerationJob) -> bool:
+        return bool(
+            await self._claimed(job).update(updated_at=get_current_utc())
+        )
+
+    async def update_stage(
+        self,
+        job: GenerationJob,
+        stage: str,
+        **fields,
+    ) -> bool:
+        return bool(
+            await self._claimed(job).update(
+                stage=stage,
+                updated_at=get_current_utc(),
+                **fields,
+            )
+        )
+
+    async def mark_step_completed(self, job: GenerationJob, step: int) -> bool:
+        current = await self._claimed(job).first()
+        if current is None:
+            return False
+
+        for entry in current.progress:
+            if entry["step"] == step:
+                entry["status"] = "done"
+
+        return bool(
+            await self._claimed(job).update(
+                progress=current.progress,
+                completed_steps=sum(
+                    1 for entry in current.progress if entry["status"] == "done"
+                ),
+                updated_at=get_current_utc(),
+            )
+        )
+
+    async def complete(self, job: GenerationJob, project: Project) -> bool:
+        return bool(
+            await self._claimed(job).update(
+                status="succeeded",
+                stage="done",
+                project_id=project.id,
+                finished_at=get_current_utc(),
+                updated_at=get_current_utc(),
+            )
+        )
+
+    async def fail(self, job: GenerationJob, error: str) -> bool:
+        return bool(
+            await self._claimed(job).update(
+                status="failed",
+                error=error,
+                finished_at=get_current_utc(),
+                updated_at=get_current_utc(),
+            )
+        )
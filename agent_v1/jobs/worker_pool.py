@@ -0,0 +1,325 @@
+"""
+Purpose:
+--------
+Bounded pool of generation workers draining the persistent job queue.
+
+Why this exists:
+----------------
+- A generation runs the full planner → architect → coder pipeline and
+  can take minutes; holding an HTTP request open for it times out
+  behind proxies and ties up default-executor threads
+- The pool caps concurrent LLM pipelines per node (GENERATION_WORKERS)
+
+Design:
+-------
+- N asyncio worker loops claim jobs from the `generation_jobs` table
+- Each pipeline runs on a dedicated thread pool of the same size,
+  never on the event loop's default executor
+- Pipeline progress events are bridged back to the event loop and
+  persisted as they happen; a heartbeat keeps the job fresh while the
+  pipeline is silent (long LLM calls), so only jobs of dead workers
+  are requeued as stale
+- Every node looks for stale jobs at startup and then once per
+  heartbeat interval, so a job of a dead worker (this process or any
+  other node) is requeued without waiting for a restart
+- Updates only apply while the worker still holds the claim; a run
+  whose job was requeued and claimed again is dropped before it
+  registers a project
+- In-process subscribers (the SSE route) receive the same events for
+  one job, followed by `generation_completed` or `generation_failed`
+- Workers wake up immediately on enqueue and poll as a fallback
+  (jobs enqueued by other nodes, requeued stale jobs)
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional, Set
+from uuid import UUID
+
+from tortoise.exceptions import IntegrityError
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.db.models import GenerationJob, Project
+from agent_v1.api.project_utils import create_generated_project
+from agent_v1.graph.graph import stream_agent
+from agent_v1.graph.states import CoderState
+from agent_v1.jobs.repository import JobRepository
+
+logger = logging.getLogger("generation")
+
+_DONE = object()
+
+Listener = Callable[[Dict[str, Any]], None]
+
+
+class GenerationFailed(Exception):
+    """Raised when a generation finishes without a usable project."""
+    pass
+
+
+class ClaimLost(Exception):
+    """The job was requeued (and possibly claimed again) while running."""
+    pass
+
+
+class GenerationWorkerPool:
+    """
+    Fixed-size pool of generation workers.
+
+    One instance per process, started/stopped from the app lifespan.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        poll_interval: float,
+        stale_after: timedelta,
+        heartbeat_interval: Optional[float] = None,
+    ):
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.heartbeat_interval = (
+            heartbeat_interval
+            if heartbeat_interval is not None
+            else max(1.0, stale_after.total_seconds() / 4)
+        )
+        self.repo = JobRepository()
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._listeners: Dict[UUID, Set[Listener]] = defaultdict(set)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        await self._requeue_stale()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="generation",
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(i))
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._requeue_loop()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._executor:
+            # Running pipelines cannot be interrupted; their jobs are
+            # requeued by any running node once they turn stale.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def notify(self):
+        """Wake idle workers (called after a job was enqueued)."""
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, job_id: UUID, listener: Listener) -> Callable[[], None]:
+        """
+        Deliver progress events of one job run by this process to
+        `listener` (on the event loop). Returns the unsubscribe callable.
+        """
+        self._listeners[job_id].add(listener)
+
+        def unsubscribe():
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._listeners[job_id]
+
+        return unsubscribe
+
+    def _publish(self, job_id: UUID, event: Dict[str, Any]):
+        for listener in list(self._listeners.get(job_id, ())):
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Generation listener failed")
+
+    # ------------------------------------------------------------------
+    # Worker loop
+    # ------------------------------------------------------------------
+
+    async def _worker_loop(self, worker_id: int):
+        while True:
+            try:
+                job = await self.repo.claim_next()
+            except Exception:
+                logger.exception("Worker %s failed to claim a job", worker_id)
+                job = None
+
+            if job is None:
+                await self._wait_for_work()
+                continue
+
+            await self._process(job)
+
+    async def _requeue_stale(self):
+        requeued = await self.repo.requeue_stale(self.stale_after)
+        if requeued:
+            logger.info("Requeued %s stale generation job(s)", requeued)
+            self.notify()
+
+    async def _requeue_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._requeue_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Requeueing stale generation jobs failed")
+
+    async def _wait_for_work(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _process(self, job: GenerationJob):
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+
+        try:
+            coder_state = await self._run_pipeline(job)
+            if not await self.repo.heartbeat(job):
+                raise ClaimLost()
+
+            project = await self._create_project(job, coder_state)
+            if not await self.repo.complete(job, project):
+                raise ClaimLost()
+
+            self._publish(job.id, {
+                "event": "generation_completed",
+                "project_name": project.name,
+                "project_root": project.project_root,
+            })
+
+        except asyncio.CancelledError:
+            raise
+
+        except ClaimLost:
+            # The run that holds the claim now reports the result
+            logger.warning("Generation job %s was requeued while running", job.id)
+
+        except Exception as e:
+            logger.exception("Generation job %s failed", job.id)
+            error = str(e) or e.__class__.__name__
+            if await self.repo.fail(job, error):
+                self._publish(job.id, {"event": "generation_failed", "error": error})
+
+        finally:
+            heartbeat.cancel()
+            # Subscribers that never started streaming
+            self._listeners.pop(job.id, None)
+
+    async def _heartbeat(self, job: GenerationJob):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await self.repo.heartbeat(job):
+                    return  # requeued; _process notices before completing
+            except Exception:
+                logger.exception("Heartbeat of generation job %s failed", job.id)
+
+    # ------------------------------------------------------------------
+    # Pipeline execution
+    # ------------------------------------------------------------------
+
+    async def _run_pipeline(self, job: GenerationJob) -> CoderState:
+        """
+        Run the LangGraph pipeline on the pool executor and persist
+        its progress events in order.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def produce():
+            try:
+                for event in stream_agent(
+                    job.prompt,
+                    Config.CODER_MAX_WORKERS,
+                    Config.SNAPSHOT_CODER_STEPS,
+                ):
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, _DONE)
+
+        future = loop.run_in_executor(self._executor, produce)
+        coder_state: Optional[CoderState] = None
+
+        while (event := await events.get()) is not _DONE:
+            if event["event"] == "generation_completed":
+                coder_state = event["coder_state"]
+                continue  # published once the project exists
+
+            await self._record(job, event)
+            self._publish(job.id, event)
+
+        # Surface pipeline exceptions
+        await future
+
+        if coder_state is None:
+            raise GenerationFailed("Project generation failed")
+
+        return coder_state
+
+    async def _record(self, job: GenerationJob, event: Dict[str, Any]):
+        kind = event["event"]
+
+        if kind == "plan_ready":
+            await self.repo.update_stage(job, "architect")
+
+        elif kind == "task_plan_ready":
+            steps = event["task_plan"].implementation_steps
+            await self.repo.update_stage(
+                job,
+                "coder",
+                total_steps=len(steps),
+                progress=[
+                    {"step": i, "filepath": step.filepath, "status": "pending"}
+                    for i, step in enumerate(steps)
+                ],
+            )
+
+        elif kind == "step_completed":
+            await self.repo.mark_step_completed(job, event["step"])
+
+    async def _create_project(
+        self,
+        job: GenerationJob,
+        coder_state: CoderState,
+    ) -> Project:
+        try:
+            return await create_generated_project(
+                coder_state.project_root,
+                job.owner_id,
+            )
+        except IntegrityError:
+            raise GenerationFailed("Project with the same name already exists")
+
+
+# Singleton instance used across the application
+generation_workers = GenerationWorkerPool(
+    workers=Config.GENERATION_WORKERS,
+    poll_interval=Config.GENERATION_POLL_INTERVAL_SECONDS,
+    stale_after=timedelta(minutes=Config.GENERATION_STALE_AFTER_MINUTES),
+)
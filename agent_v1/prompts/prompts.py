@@ -102,6 +102,15 @@ TASK DESIGN RULES:
   - API layers
   - configuration
 
+DEPENDENCY RULES (PARALLEL EXECUTION):
+- Tasks are executed IN PARALLEL unless dependencies are declared
+- For each task, set depends_on to the file paths of EARLIER tasks
+  whose content this file imports, reads, or must stay consistent with
+- Leave depends_on EMPTY for independent files (e.g. static assets,
+  requirements.txt, standalone modules)
+- NEVER reference a file that is only produced by a LATER task
+- Do NOT list the task's own file in depends_on
+
 INPUT PROJECT PLAN:
 {plan}
 
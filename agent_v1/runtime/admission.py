@@ -0,0 +1,174 @@
+"""
+Purpose:
+--------
+Host-level admission control for runtime starts: a container is only
+started when the limits of everything running still fit the host.
+
+Why this exists:
+----------------
+- Every start was accepted; a burst of starts could overcommit the
+  host and degrade every user's terminal
+
+Design:
+-------
+- Capacity: RUNTIME_HOST_MEMORY_MB / RUNTIME_HOST_CPUS, or what the
+  Docker daemon reports (`/info`), times RUNTIME_MEMORY_OVERCOMMIT /
+  RUNTIME_CPU_OVERCOMMIT
+- Allocation: the limits (`memory_mb`, `cpus`) of runtimes that are
+  running or paused (paused containers keep their memory), read from
+  the DB, plus reservations of starts in progress
+- A start that does not fit waits in FIFO order for up to
+  RUNTIME_ADMISSION_WAIT_SECONDS (capacity is re-checked when a runtime
+  stops and every ADMISSION_RECHECK_SECONDS, since containers also exit
+  on their own) and is refused with AdmissionRefused after that
+- Idle pool containers are not counted: they are not assigned to a
+  project and carry the default profile
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.db.models import ProjectRuntime
+from agent_v1.runtime.container_spec import Resources
+from agent_v1.runtime.docker_client import docker_client
+
+logger = logging.getLogger("runtime")
+
+ADMISSION_RECHECK_SECONDS = 2.0
+
+# Statuses whose containers hold their resources
+ALLOCATED_STATUSES = ("running", "paused")
+
+
+class AdmissionRefused(Exception):
+    """The host has no room for the runtime (now or within the wait)."""
+    pass
+
+
+class AdmissionController:
+    """
+    Tracks allocated CPU / memory limits against host capacity.
+    """
+
+    def __init__(
+        self,
+        host_memory_mb: Optional[int],
+        host_cpus: Optional[float],
+        memory_overcommit: float,
+        cpu_overcommit: float,
+        wait_seconds: float,
+    ):
+        self.host_memory_mb = host_memory_mb
+        self.host_cpus = host_cpus
+        self.memory_overcommit = memory_overcommit
+        self.cpu_overcommit = cpu_overcommit
+        self.wait_seconds = max(0.0, wait_seconds)
+
+        self._reserved: Dict[str, Resources] = {}
+        self._changed = asyncio.Condition()
+
+    # ------------------------------------------------------------------
+    # Capacity / Allocation
+    # ------------------------------------------------------------------
+
+    async def capacity(self) -> Resources:
+        """Admissible totals, overcommit included."""
+        if self.host_memory_mb is None or self.host_cpus is None:
+            info = await docker_client.get("/info")
+            if self.host_memory_mb is None:
+                self.host_memory_mb = info["MemTotal"] // 1024 ** 2
+            if self.host_cpus is None:
+                self.host_cpus = float(info["NCPU"])
+
+        return Resources(
+            memory_mb=int(self.host_memory_mb * self.memory_overcommit),
+            cpus=self.host_cpus * self.cpu_overcommit,
+        )
+
+    async def allocated(self, exclude: Optional[str] = None) -> Resources:
+        """Limits of running / paused runtimes and in-progress starts."""
+        rows = await ProjectRuntime.filter(
+            status__in=ALLOCATED_STATUSES
+        ).values_list("project__name", "memory_mb", "cpus")
+
+        held: Dict[str, Tuple[int, float]] = {
+            name: (memory_mb, cpus) for name, memory_mb, cpus in rows
+        }
+        for name, resources in self._reserved.items():
+            held[name] = (resources.memory_mb, resources.cpus)
+        held.pop(exclude, None)
+
+        return Resources(
+            memory_mb=sum(m for m, _ in held.values()),
+            cpus=sum(c for _, c in held.values()),
+        )
+
+    async def _fits(self, project_name: str, resources: Resources) -> bool:
+        capacity = await self.capacity()
+        allocated = await self.allocated(exclude=project_name)
+
+        return (
+            allocated.memory_mb + resources.memory_mb <= capacity.memory_mb
+            and allocated.cpus + resources.cpus <= capacity.cpus + 1e-9
+        )
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        project_name: str,
+        resources: Resources,
+        wait: bool = True,
+    ) -> AsyncIterator[None]:
+        """
+        Hold capacity for `resources` while starting a runtime; the
+        caller records the runtime as running before leaving the block.
+        Raises AdmissionRefused when it does not fit in time.
+        """
+        deadline = time.monotonic() + (self.wait_seconds if wait else 0)
+
+        async with self._changed:
+            while not await self._fits(project_name, resources):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise AdmissionRefused(
+                        f"Not enough capacity on this host for {resources.memory_mb} MB "
+                        f"/ {resources.cpus:g} CPUs, try again later"
+                    )
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait(),
+                        min(remaining, ADMISSION_RECHECK_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            self._reserved[project_name] = resources
+
+        try:
+            yield
+        finally:
+            self._reserved.pop(project_name, None)
+            await self.notify()
+
+    async def notify(self):
+        """Capacity may have been freed (runtime stopped, removed, shrunk)."""
+        async with self._changed:
+            self._changed.notify_all()
+
+
+# Singleton instance used across the application
+admission_controller = AdmissionController(
+    host_memory_mb=Config.RUNTIME_HOST_MEMORY_MB,
+    host_cpus=Config.RUNTIME_HOST_CPUS,
+    memory_overcommit=Config.RUNTIME_MEMORY_OVERCOMMIT,
+    cpu_overcommit=Config.RUNTIME_CPU_OVERCOMMIT,
+    wait_seconds=Config.RUNTIME_ADMISSION_WAIT_SECONDS,
+)
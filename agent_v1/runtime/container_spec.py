@@ -0,0 +1,106 @@
+"""
+Purpose:
+--------
+Engine API configuration of project containers, shared by
+`DockerManager` (cold creates) and `RuntimePool` (warm containers), so
+both produce identical containers. Pool containers get the default
+resource profile; other profiles are applied when one is assigned.
+"""
+
+import pathlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+DEFAULT_IMAGE = "python:3.11-slim"
+WORKDIR = "/workspace"
+
+# Label identifying the project a container was created for
+PROJECT_LABEL = "ai_builder.project"
+
+# Label of warm pool containers (value: image)
+POOL_LABEL = "ai_builder.pool"
+
+CONTAINER_PREFIX = "ai_builder_"
+
+# Name of pool containers until assigned to a project
+POOL_CONTAINER_PREFIX = "ai_builder_pool_"
+
+
+@dataclass(slots=True, frozen=True)
+class Resources:
+    """Container limits."""
+    memory_mb: int
+    cpus: float
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.memory_mb * 1024 ** 2
+
+    @property
+    def nano_cpus(self) -> int:
+        return int(self.cpus * 1e9)
+
+    def host_config(self) -> dict:
+        """Limit fields of HostConfig (also the body of `/containers/{id}/update`)."""
+        return {
+            "Memory": self.memory_bytes,
+            # Docker's default when only Memory is given: as much swap as memory
+            "MemorySwap": 2 * self.memory_bytes,
+            "NanoCpus": self.nano_cpus,
+        }
+
+
+# Named resource profiles; "custom" stores its own limits
+RESOURCE_PROFILES: Dict[str, Resources] = {
+    "small": Resources(memory_mb=512, cpus=0.5),
+    "medium": Resources(memory_mb=2048, cpus=2.0),
+    "large": Resources(memory_mb=4096, cpus=4.0),
+}
+
+DEFAULT_PROFILE = "medium"
+
+
+def resolve_resources(
+    profile: str,
+    memory_mb: Optional[int] = None,
+    cpus: Optional[float] = None,
+) -> Resources:
+    """Limits of a profile; "custom" requires both limits. Raises ValueError."""
+    if profile == "custom":
+        if memory_mb is None or cpus is None:
+            raise ValueError("Custom profile requires memory_mb and cpus")
+        return Resources(memory_mb=memory_mb, cpus=cpus)
+
+    if profile not in RESOURCE_PROFILES:
+        raise ValueError(f"Unknown resource profile: {profile}")
+    return RESOURCE_PROFILES[profile]
+
+
+def container_name(project_name: str) -> str:
+    return f"{CONTAINER_PREFIX}{project_name}"
+
+
+def project_for_container(name: str) -> Optional[str]:
+    """Project owning a container, None for foreign and idle pool containers."""
+    if not name.startswith(CONTAINER_PREFIX) or name.startswith(POOL_CONTAINER_PREFIX):
+        return None
+    return name[len(CONTAINER_PREFIX):]
+
+
+def container_config(
+    image: str,
+    bind_source: pathlib.Path,
+    labels: Dict[str, str],
+    resources: Resources = RESOURCE_PROFILES[DEFAULT_PROFILE],
+) -> dict:
+    """Body of `POST /containers/create`: idle shell on a bind mounted workspace."""
+    return {
+        "Image": image,
+        "Cmd": ["sleep", "infinity"],
+        "WorkingDir": WORKDIR,
+        "Labels": labels,
+        "HostConfig": {
+            **resources.host_config(),
+            "Binds": [f"{bind_source}:{WORKDIR}"],
+        },
+    }
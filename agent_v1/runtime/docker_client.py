@@ -0,0 +1,382 @@
+"""
+Purpose:
+--------
+Minimal async client for the Docker Engine HTTP API over its unix socket.
+
+Why this exists:
+----------------
+- Spawning the `docker` CLI costs a fork/exec plus CLI startup
+  (~50-100ms) per operation, and blocking calls stalled the event loop
+- The Engine API is plain HTTP/1.1 on `/var/run/docker.sock`; kept-alive
+  connections make an inspect or start a single round trip
+
+Design:
+-------
+- Pool of persistent connections (asyncio unix streams), bounded by
+  DOCKER_MAX_CONNECTIONS; a connection closed by the daemon while idle
+  is replaced transparently
+- A request failing on a reused connection is only retried when the
+  daemon cannot have acted on it: it was never sent, or it is a GET /
+  HEAD. A POST that fails after being sent raises instead of running
+  twice (two containers, two starts)
+- Responses with Content-Length or chunked bodies; JSON in and out
+- Long-lived streams (events, stats, image pulls) get a dedicated
+  connection and are read as newline-delimited JSON
+- Non-2xx/304 answers raise DockerError carrying the daemon's message
+  (DockerNotFound for 404)
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from agent_v1.api.db.config import Config
+
+logger = logging.getLogger("runtime")
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+# Safe to send again when a reused connection fails mid-request
+RETRYABLE_METHODS = ("GET", "HEAD")
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class DockerError(Exception):
+    """Raised when a Docker operation fails."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class DockerNotFound(DockerError):
+    """The container / image does not exist (HTTP 404)."""
+    pass
+
+
+class _Response:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+def path_quote(value: str) -> str:
+    """Quote a container / image name for use in a URL path."""
+    return quote(value, safe="")
+
+
+def _split_image(image: str) -> tuple[str, Optional[str]]:
+    """`python:3.11-slim` -> ("python", "3.11-slim"); registry ports are kept."""
+    if "@" in image:
+        return image, None
+
+    name, sep, tag = image.rpartition(":")
+    if not sep or "/" in tag:
+        return image, "latest"
+    return name, tag
+
+
+class DockerClient:
+    """
+    Async Docker Engine API client with a keep-alive connection pool.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        api_version: str,
+        max_connections: int,
+    ):
+        self.socket_path = socket_path
+        self.api_version = api_version
+        self.max_connections = max(1, max_connections)
+
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(self.max_connections)
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    async def _connect(self) -> _Connection:
+        try:
+            return await asyncio.open_unix_connection(self.socket_path)
+        except OSError as e:
+            raise DockerError(f"Cannot connect to Docker at {self.socket_path}: {e}")
+
+    def _take_idle(self) -> Optional[_Connection]:
+        """Most recent idle connection the daemon has not closed yet."""
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn[0].at_eof() and not conn[1].is_closing():
+                return conn
+            self._close(conn)
+        return None
+
+    @staticmethod
+    def _close(conn: _Connection):
+        conn[1].close()
+
+    async def close(self):
+        """Close idle pooled connections (application shutdown)."""
+        while self._idle:
+            self._close(self._idle.pop())
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1
+    # ------------------------------------------------------------------
+
+    def _target(self, path: str, params: Optional[Dict[str, Any]]) -> str:
+        target = f"/v{self.api_version}{path}"
+        if params:
+            query = {
+                k: ("true" if v is True else "false" if v is False else v)
+                for k, v in params.items()
+                if v is not None
+            }
+            target += "?" + urlencode(query)
+        return target
+
+    async def _send(
+        self,
+        conn: _Connection,
+        method: str,
+        target: str,
+        body: Optional[Any],
+    ):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+
+        head = [
+            f"{method} {target} HTTP/1.1",
+            "Host: docker",
+            "User-Agent: ai-builder",
+        ]
+        if body is not None:
+            head.append("Content-Type: application/json")
+        if payload or method in ("POST", "PUT"):
+            head.append(f"Content-Length: {len(payload)}")
+
+        conn[1].write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        await conn[1].drain()
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+        status_line = await reader.readuntil(b"\r\n")
+        try:
+            status = int(status_line.split(b" ", 2)[1])
+        except (IndexError, ValueError):
+            raise DockerError(f"Malformed response from Docker: {status_line!r}")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return status, headers
+
+    @staticmethod
+    async def _read_chunks(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0], 16)
+
+            if size == 0:
+                # Trailers, then the final blank line
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return
+
+            chunk = await reader.readexactly(size)
+            await reader.readexactly(2)
+            yield chunk
+
+    async def _read_body(
+        self,
+        reader: asyncio.StreamReader,
+        method: str,
+        status: int,
+        headers: Dict[str, str],
+    ) -> Tuple[bytes, bool]:
+        """Returns (body, connection reusable)."""
+        reusable = headers.get("connection", "").lower() != "close"
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return b"", reusable
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = [chunk async for chunk in self._read_chunks(reader)]
+            return b"".join(parts), reusable
+
+        if "content-length" in headers:
+            return await reader.readexactly(int(headers["content-length"])), reusable
+
+        return await reader.read(), False
+
+    @staticmethod
+    def _check(status: int, body: bytes):
+        if status < 300 or status == 304:
+            return
+
+        try:
+            message = json.loads(body).get("message") or body.decode()
+        except (ValueError, AttributeError):
+            message = body.decode("utf-8", errors="replace")
+
+        error = DockerNotFound if status == 404 else DockerError
+        raise error(message.strip() or f"Docker API error {status}", status)
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+    ) -> _Response:
+        """
+        Send one request on a pooled connection. Raises DockerError on
+        non-success status codes and transport failures.
+        """
+        target = self._target(path, params)
+
+        async with self._slots:
+            try:
+                return await asyncio.wait_for(
+                    self._exchange(method, target, body),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                raise DockerError(f"Docker API timed out: {method} {path}")
+
+    async def _exchange(self, method: str, target: str, body: Optional[Any]) -> _Response:
+        while True:
+            conn = self._take_idle()
+            reused = conn is not None
+            if conn is None:
+                conn = await self._connect()
+            sent = False
+
+            try:
+                await self._send(conn, method, target, body)
+                sent = True
+                status, headers = await self._read_head(conn[0])
+                data, reusable = await self._read_body(conn[0], method, status, headers)
+
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                self._close(conn)
+                # Closed by the daemon while idle: retry on a fresh
+                # connection unless the request may have been applied
+                if reused and (not sent or method in RETRYABLE_METHODS):
+                    continue
+                raise DockerError(f"Docker connection failed: {e}")
+
+            except BaseException:
+                self._close(conn)
+                raise
+
+            if reusable:
+                self._idle.append(conn)
+            else:
+                self._close(conn)
+
+            self._check(status, data)
+            return _Response(status, headers, data)
+
+    async def get(self, path: str, **params) -> Any:
+        return (await self.request("GET", path, params)).json()
+
+    async def post(
+        self,
+        path: str,
+        body: Optional[Any] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+        **params,
+    ) -> Any:
+        return (await self.request("POST", path, params, body, timeout)).json()
+
+    async def delete(self, path: str, **params) -> Any:
+        return (await self.request("DELETE", path, params)).json()
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Newline-delimited JSON stream (events, stats, pull progress) on
+        a dedicated connection, closed when the iterator is.
+        """
+        conn = await self._connect()
+
+        try:
+            await self._send(conn, method, self._target(path, params), body)
+            status, headers = await self._read_head(conn[0])
+
+            if status >= 300:
+                data, _ = await self._read_body(conn[0], method, status, headers)
+                self._check(status, data)
+
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                chunks = self._read_chunks(conn[0])
+            else:
+                chunks = _read_until_eof(conn[0])
+
+            buffer = b""
+            async for chunk in chunks:
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+
+            if buffer.strip():
+                yield json.loads(buffer)
+
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            raise DockerError(f"Docker stream interrupted: {e}")
+
+        finally:
+            self._close(conn)
+
+    async def pull_image(self, image: str):
+        """Pull an image (what `docker create` does implicitly)."""
+        from_image, tag = _split_image(image)
+
+        async for progress in self.stream(
+            "POST",
+            "/images/create",
+            {"fromImage": from_image, "tag": tag},
+        ):
+            if "error" in progress:
+                raise DockerError(progress["error"])
+
+
+async def _read_until_eof(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    while chunk := await reader.read(65536):
+        yield chunk
+
+
+# Singleton instance used across the application
+docker_client = DockerClient(
+    socket_path=Config.DOCKER_SOCKET,
+    api_version=Config.DOCKER_API_VERSION,
+    max_connections=Config.DOCKER_MAX_CONNECTIONS,
+)
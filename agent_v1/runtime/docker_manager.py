@@ -8,10 +8,16 @@ Design Philosophy:
 - This module is the SINGLE authority for Docker container lifecycle.
 - Backend manages containers, NOT application processes.
 - Application execution happens exclusively via WebSocket terminal.
+- Docker is driven through the Engine API (`docker_client`), never by
+  spawning the CLI; every call is async.
+- Lifecycle operations are serialized per project and duplicate
+  in-flight calls are coalesced (`runtime_locks`); the public methods
+  take the lock, the underscored implementations assume it is held.
 
 Responsibilities:
 -----------------
-- Create Docker containers with resource limits
+- Create Docker containers with resource limits (profiles)
+- Admit starts against host capacity (`admission_controller`)
 - Start, stop, and remove containers
 - Persist container lifecycle state in the database
 
@@ -23,18 +29,44 @@ Explicitly DOES NOT:
 - Track application runtime state
 """
 
-import subprocess
-import asyncio
+import logging
+import pathlib
 from typing import Optional
 
+from agent_v1.api.file_service import file_service
+from agent_v1.api.file_watcher import file_watch_hub
+from agent_v1.api.search_index import search_index
+from agent_v1.api.tree_index import tree_index
 from agent_v1.api.project_utils import resolve_project_dir
+from agent_v1.runtime.admission import (
+    ALLOCATED_STATUSES,
+    AdmissionRefused,
+    admission_controller,
+)
+from agent_v1.runtime.container_spec import (
+    DEFAULT_IMAGE,
+    DEFAULT_PROFILE,
+    PROJECT_LABEL,
+    RESOURCE_PROFILES,
+    WORKDIR,
+    Resources,
+    container_config,
+    container_name as project_container_name,
+    resolve_resources,
+)
+from agent_v1.runtime.docker_client import (
+    DockerError,
+    DockerNotFound,
+    docker_client,
+    path_quote,
+)
+from agent_v1.runtime.locks import runtime_locks
+from agent_v1.runtime.pool import adopt_slot, runtime_pool
 from agent_v1.runtime.repository import RuntimeRepository, RuntimeNotFound
 from agent_v1.api.db.models import Project
+from agent_v1.storage.blob_store import blob_store
 
-
-class DockerError(Exception):
-    """Raised when a Docker CLI operation fails."""
-    pass
+logger = logging.getLogger("runtime")
 
 
 class DockerManager:
@@ -45,50 +77,31 @@ class DockerManager:
     Containers stay alive using `sleep infinity`.
     """
 
-    DEFAULT_IMAGE = "python:3.11-slim"
-    WORKDIR = "/workspace"
+    DEFAULT_IMAGE = DEFAULT_IMAGE
+    WORKDIR = WORKDIR
+
+    STOP_TIMEOUT_SECONDS = 10
 
     def __init__(self):
         self.repo = RuntimeRepository()
+        self.docker = docker_client
 
     # ------------------------------------------------------------------
-    # Docker execution helpers
+    # Docker state inspection
     # ------------------------------------------------------------------
 
-    def _run(self, args: list[str]) -> str:
+    async def inspect(self, name: str) -> Optional[dict]:
         try:
-            result = subprocess.run(
-                ["docker", *args],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            raise DockerError(e.stderr.strip() or str(e))
+            return await self.docker.get(f"/containers/{path_quote(name)}/json")
+        except DockerNotFound:
+            return None
 
-    async def _run_async(self, args: list[str]) -> str:
-        return await asyncio.to_thread(self._run, args)
+    async def container_exists(self, name: str) -> bool:
+        return await self.inspect(name) is not None
 
-    # ------------------------------------------------------------------
-    # Docker state inspection
-    # ------------------------------------------------------------------
-
-    def container_exists(self, name: str) -> bool:
-        return (
-            self._run(
-                ["ps", "-a", "--filter", f"name=^{name}$", "--format", "{{.Names}}"]
-            )
-            == name
-        )
-
-    def is_running(self, name: str) -> bool:
-        return (
-            self._run(
-                ["ps", "--filter", f"name=^{name}$", "--format", "{{.Names}}"]
-            )
-            == name
-        )
+    async def is_running(self, name: str) -> bool:
+        info = await self.inspect(name)
+        return bool(info and info["State"]["Running"])
 
     # ------------------------------------------------------------------
     # Container lifecycle
@@ -101,11 +114,80 @@ class DockerManager:
     ):
         """
         Create a Docker container for a project.
+        """
+        await runtime_locks.run("create", project_name, self._create, image)
+
+    async def start_container(self, project_name: str):
+        """
+        Start the Docker container (idempotent). Also resumes a
+        hibernated (stopped) or paused container.
+        """
+        await runtime_locks.run("start", project_name, self._start)
+
+    async def ensure_running(self, project_name: str):
+        """
+        Create the runtime if the project has none, then start it;
+        one atomic operation for `/runtime/start`.
+        """
+        await runtime_locks.run("ensure_running", project_name, self._ensure_running)
+
+    async def stop_container(self, project_name: str):
+        """
+        Stop the Docker container.
+        """
+        await runtime_locks.run("stop", project_name, self._stop_runtime)
+
+    async def hibernate_container(self, project_name: str, action: str = "stop"):
+        """
+        Release an idle container's resources: `stop` frees memory and
+        CPU (status "hibernated"), `pause` freezes its processes and keeps
+        memory (status "paused"). Resumed by `start_container`.
+        """
+        await runtime_locks.run("hibernate", project_name, self._hibernate, action)
+
+    async def remove_container(self, project_name: str):
+        """
+        Remove the Docker container and delete runtime metadata.
+        """
+        await runtime_locks.run("remove", project_name, self._remove)
+
+    async def set_resources(
+        self,
+        project_name: str,
+        profile: str,
+        memory_mb: Optional[int] = None,
+        cpus: Optional[float] = None,
+    ) -> Resources:
+        """
+        Change the resource profile of a runtime. Applied to an existing
+        container in place (even while running); growing a running one
+        must pass admission without waiting.
+        """
+        return await runtime_locks.run(
+            "resources", project_name, self._set_resources, profile, memory_mb, cpus
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle implementations (project lock held)
+    # ------------------------------------------------------------------
+
+    async def _ensure_running(self, project_name: str):
+        try:
+            await self.repo.get(project_name)
+        except RuntimeNotFound:
+            await self._create(project_name)
+
+        await self._start(project_name)
+
+    async def _create(self, project_name: str, image: Optional[str] = None):
+        """
+        Create a Docker container for a project.
 
         - Validates project exists in DB
         - Validates project directory exists
         - Persists runtime metadata
-        - Creates container in stopped state
+        - Takes a warm container from the pool (already running) or
+          creates one in stopped state
         """
         # 1️⃣ Validate project exists (DB is authority)
         project = await Project.get_or_none(name=project_name)
@@ -116,7 +198,7 @@ class DockerManager:
         project_dir = resolve_project_dir(project_name)
 
         image = image or self.DEFAULT_IMAGE
-        container_name = f"ai_builder_{project_name}"
+        container_name = project_container_name(project_name)
 
         # 3️⃣ Prevent duplicate runtime creation
         try:
@@ -126,63 +208,195 @@ class DockerManager:
             pass
 
         # 4️⃣ Persist runtime metadata FIRST
-        await self.repo.create(
+        runtime = await self.repo.create(
             project_name=project_name,
             project_root=str(project_dir),
             image=image,
             container_name=container_name,
         )
 
-        # 5️⃣ Create container (stopped)
-        await self._run_async(
-            [
-                "create",
-                "--name", container_name,
-                "--memory", "2g",
-                "--cpus", "2.0",
-                "-w", self.WORKDIR,
-                "-v", f"{project_dir}:{self.WORKDIR}",
-                image,
-                "sleep", "infinity",
-            ]
+        # 5️⃣ Warm container, if the pool has one
+        resources = Resources(runtime.memory_mb, runtime.cpus)
+
+        if await self._assign_pooled(project_name, project_dir, image, container_name, resources):
+            return
+
+        # 6️⃣ Create container (stopped)
+        config = container_config(
+            image,
+            project_dir,
+            {PROJECT_LABEL: project_name},
+            resources,
         )
 
-    async def start_container(self, project_name: str):
-        """
-        Start the Docker container (idempotent).
-        """
+        try:
+            await self.docker.post("/containers/create", config, name=container_name)
+        except DockerNotFound:
+            await self.docker.pull_image(image)
+            await self.docker.post("/containers/create", config, name=container_name)
+
+    async def _assign_pooled(
+        self,
+        project_name: str,
+        project_dir: pathlib.Path,
+        image: str,
+        container_name: str,
+        resources: Resources,
+    ) -> bool:
+        try:
+            # Pooled containers are already running: admit now or create
+            # a stopped container instead (its start waits for capacity)
+            async with admission_controller.reserve(project_name, resources, wait=False):
+                return await self._adopt_pooled(
+                    project_name, project_dir, image, container_name, resources
+                )
+        except AdmissionRefused:
+            return False
+
+    async def _adopt_pooled(
+        self,
+        project_name: str,
+        project_dir: pathlib.Path,
+        image: str,
+        container_name: str,
+        resources: Resources,
+    ) -> bool:
+        pooled = runtime_pool.take(image)
+        if pooled is None:
+            return False
+
+        try:
+            if await self.container_exists(container_name):
+                raise DockerError(f"Container {container_name} already exists")
+
+            # Pool containers carry the default profile
+            if resources != RESOURCE_PROFILES[DEFAULT_PROFILE]:
+                await self.docker.post(f"/containers/{pooled.id}/update", resources.host_config())
+
+            await file_service.run(blob_store.materialize, project_dir)
+            await self.docker.post(
+                f"/containers/{pooled.id}/rename",
+                name=container_name,
+            )
+            await file_service.run(adopt_slot, pooled.slot, project_dir)
+
+        except (DockerError, OSError) as e:
+            logger.warning("Pooled container not assigned to %s: %s", project_name, e)
+            await runtime_pool.discard(pooled)
+            return False
+
+        # The project directory is a new inode now
+        file_watch_hub.reset(project_dir)
+        tree_index.forget(project_dir)
+        search_index.forget(project_dir)
+
+        await self.repo.update_status(project_name, "running")
+        return True
+
+    async def _stop(self, container_name: str):
+        await self.docker.post(
+            f"/containers/{path_quote(container_name)}/stop",
+            timeout=self.STOP_TIMEOUT_SECONDS + 30,
+            t=self.STOP_TIMEOUT_SECONDS,
+        )
+
+    async def _start(self, project_name: str):
         runtime = await self.repo.get(project_name)
+        info = await self.inspect(runtime.container_name)
+        state = info["State"] if info else {}
+
+        if state.get("Paused"):
+            # Files may have been linked (snapshot, ingest) while frozen:
+            # detach shared inodes before the container can write again
+            await file_service.run(blob_store.materialize, runtime.project_root)
 
-        if self.is_running(runtime.container_name):
+            await self.docker.post(f"/containers/{path_quote(runtime.container_name)}/unpause")
+            await self.repo.update_status(project_name, "running")
             return
 
-        await self._run_async(["start", runtime.container_name])
-        await self.repo.update_status(project_name, "running")
+        if state.get("Running"):
+            return
 
-    async def stop_container(self, project_name: str):
-        """
-        Stop the Docker container.
-        """
+        resources = Resources(runtime.memory_mb, runtime.cpus)
+
+        # Waits for capacity, or raises AdmissionRefused
+        async with admission_controller.reserve(project_name, resources):
+            # The container may write files in place: detach inodes shared
+            # with blob store objects or snapshots first
+            await file_service.run(blob_store.materialize, runtime.project_root)
+
+            await self.docker.post(f"/containers/{path_quote(runtime.container_name)}/start")
+            await self.repo.update_status(project_name, "running")
+
+    async def _stop_runtime(self, project_name: str):
         runtime = await self.repo.get(project_name)
 
-        if self.is_running(runtime.container_name):
-            await self._run_async(["stop", runtime.container_name])
+        if await self.is_running(runtime.container_name):
+            await self._stop(runtime.container_name)
+            await self.repo.update_status(project_name, "stopped")
+            blob_store.schedule_ingest(runtime.project_root)
+        elif runtime.status != "stopped":
+            # Hibernated: stopped by the idle reaper, now by the user
             await self.repo.update_status(project_name, "stopped")
 
-    async def remove_container(self, project_name: str):
-        """
-        Remove the Docker container and delete runtime metadata.
-        """
+        await admission_controller.notify()
+
+    async def _hibernate(self, project_name: str, action: str):
         runtime = await self.repo.get(project_name)
+        if runtime.status != "running":
+            return  # stopped or resumed meanwhile
+
+        container = path_quote(runtime.container_name)
 
-        if self.container_exists(runtime.container_name):
-            if self.is_running(runtime.container_name):
-                await self._run_async(["stop", runtime.container_name])
+        if action == "pause":
+            await self.docker.post(f"/containers/{container}/pause")
+            await self.repo.update_status(project_name, "paused")
+        else:
+            await self._stop(runtime.container_name)
+            await self.repo.update_status(project_name, "hibernated")
+            blob_store.schedule_ingest(runtime.project_root)
+            await admission_controller.notify()
 
-            await self._run_async(["rm", runtime.container_name])
+    async def _remove(self, project_name: str):
+        runtime = await self.repo.get(project_name)
+
+        try:
+            # Kills a running container, like `stop` + `rm` without the grace period
+            await self.docker.delete(
+                f"/containers/{path_quote(runtime.container_name)}",
+                force=True,
+            )
+        except DockerNotFound:
+            pass
 
         # Remove DB record last
         await self.repo.delete(project_name)
+        await admission_controller.notify()
+
+    async def _set_resources(
+        self,
+        project_name: str,
+        profile: str,
+        memory_mb: Optional[int],
+        cpus: Optional[float],
+    ) -> Resources:
+        runtime = await self.repo.get(project_name)
+        resources = resolve_resources(profile, memory_mb, cpus)
+        path = f"/containers/{path_quote(runtime.container_name)}/update"
+
+        if runtime.status in ALLOCATED_STATUSES:
+            async with admission_controller.reserve(project_name, resources, wait=False):
+                await self.docker.post(path, resources.host_config())
+                await self.repo.update_resources(project_name, profile, resources)
+        else:
+            try:
+                await self.docker.post(path, resources.host_config())
+            except DockerNotFound:
+                pass  # created with the new limits on the next start
+            await self.repo.update_resources(project_name, profile, resources)
+
+        await admission_controller.notify()
+        return resources
 
 
 # Singleton instance used across the application
@@ -0,0 +1,217 @@
+"""
+Purpose:
+--------
+Keeps runtime status in sync with Docker as it happens, and pushes
+container state changes to clients.
+
+Why this exists:
+----------------
+- `ProjectRuntime.status` used to change only through our own API calls
+  (and once at startup); containers that exited or were OOM-killed kept
+  showing as "running"
+- Clients had to poll `/runtime/status`
+
+Design:
+-------
+- One long-lived `/events` stream from the Docker daemon, filtered to
+  container lifecycle events
+- Status changes are coalesced per container and written in batches:
+  one bulk UPDATE per status every EVENTS_FLUSH_SECONDS
+- After a lost connection, the stream resumes with `since` so events
+  from the gap are replayed by the daemon
+- Listeners subscribe per project (see `/runtime/ws/events`); they are
+  plain callbacks run on the event loop and must not block
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+from agent_v1.api.db.models import ProjectRuntime
+from agent_v1.runtime.container_spec import project_for_container
+from agent_v1.runtime.docker_client import DockerError, docker_client
+
+logger = logging.getLogger("runtime")
+
+EVENTS_FLUSH_SECONDS = 0.5
+
+RECONNECT_MAX_SECONDS = 30
+
+# Docker action -> resulting runtime status (None: informational only)
+_ACTIONS = {
+    "start": "running",
+    "die": "stopped",
+    "stop": "stopped",
+    "pause": "paused",
+    "unpause": "running",
+    "oom": None,
+    "destroy": None,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class RuntimeEvent:
+    project: str
+    container: str
+    action: str
+    status: Optional[str]
+    exit_code: Optional[int]
+    time: float
+
+
+Listener = Callable[[RuntimeEvent], None]
+
+
+def parse_event(raw: dict) -> Optional[RuntimeEvent]:
+    """RuntimeEvent for a project container event, None for anything else."""
+    action = raw.get("Action") or raw.get("status")
+    if raw.get("Type") != "container" or action not in _ACTIONS:
+        return None
+
+    attributes = raw.get("Actor", {}).get("Attributes", {})
+    container = attributes.get("name", "")
+    project = project_for_container(container)
+    if project is None:
+        return None
+
+    exit_code = attributes.get("exitCode")
+
+    return RuntimeEvent(
+        project=project,
+        container=container,
+        action=action,
+        status=_ACTIONS[action],
+        exit_code=int(exit_code) if exit_code is not None else None,
+        time=raw.get("timeNano", 0) / 1e9 or float(raw.get("time", 0)),
+    )
+
+
+class RuntimeEventStream:
+    """
+    Docker events subscriber with batched status writes.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[str, Set[Listener]] = defaultdict(set)
+        self._pending: Dict[str, str] = {}
+        self._since: Optional[float] = None
+
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._tasks = [
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._flush_loop()),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        await self._flush()
+
+    # ------------------------------------------------------------------
+    # Docker stream
+    # ------------------------------------------------------------------
+
+    async def _read_loop(self):
+        delay = 1.0
+        filters = json.dumps({"type": ["container"], "event": list(_ACTIONS)})
+
+        while True:
+            try:
+                params = {"filters": filters}
+                if self._since is not None:
+                    params["since"] = f"{self._since:.9f}"
+
+                async for raw in docker_client.stream("GET", "/events", params):
+                    delay = 1.0
+                    event = parse_event(raw)
+                    if event is not None:
+                        # Resume strictly after the last event seen
+                        self._since = event.time
+                        self._handle(event)
+
+                logger.warning("Docker event stream ended, reconnecting")
+
+            except asyncio.CancelledError:
+                raise
+            except (DockerError, ValueError) as e:
+                logger.warning("Docker event stream failed: %s", e)
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    def _handle(self, event: RuntimeEvent):
+        if event.status is not None:
+            self._pending[event.container] = event.status
+            self._wakeup.set()
+
+        for listener in list(self._listeners.get(event.project, ())):
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Runtime event listener failed")
+
+    # ------------------------------------------------------------------
+    # Batched status writes
+    # ------------------------------------------------------------------
+
+    async def _flush_loop(self):
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(EVENTS_FLUSH_SECONDS)
+            self._wakeup.clear()
+
+            try:
+                await self._flush()
+            except Exception:
+                logger.exception("Runtime status flush failed")
+
+    async def _flush(self):
+        pending, self._pending = self._pending, {}
+
+        by_status: Dict[str, List[str]] = defaultdict(list)
+        for container, status in pending.items():
+            by_status[status].append(container)
+
+        for status, containers in by_status.items():
+            query = ProjectRuntime.filter(container_name__in=containers)
+            if status == "stopped":
+                # Hibernation stops containers on purpose: keep the status
+                query = query.exclude(status="hibernated")
+            await query.update(status=status)
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, project_name: str, listener: Listener) -> Callable[[], None]:
+        """
+        Deliver events of one project to `listener`.
+        Returns the matching unsubscribe callable.
+        """
+        self._listeners[project_name].add(listener)
+
+        def unsubscribe():
+            listeners = self._listeners.get(project_name)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._listeners[project_name]
+
+        return unsubscribe
+
+
+# Singleton instance used across the application
+runtime_events = RuntimeEventStream()
@@ -0,0 +1,166 @@
+"""
+Purpose:
+--------
+Suspends runtimes nobody is using and lets them resume on demand.
+
+Why this exists:
+----------------
+- Containers idle in `sleep infinity` with their memory / CPU limits
+  reserved until a user clicks stop; most runtimes are idle most of the
+  time, and host density is the main scaling limit
+
+Design:
+-------
+- Every IDLE_CHECK_INTERVAL_SECONDS, each running runtime is checked:
+    * an open terminal session counts as activity
+    * otherwise the samples the metrics collector took since the
+      previous check are read (no stats request of its own); average
+      CPU usage or network bytes (the container's HTTP traffic) above
+      small thresholds count as activity
+    * a runtime without samples yet is left alone
+- A runtime without activity for RUNTIME_IDLE_MINUTES is hibernated
+  (RUNTIME_IDLE_ACTION): `stop` frees everything (status "hibernated"),
+  `pause` freezes it and keeps memory (status "paused")
+- `start_container` resumes both, and the terminal WebSocket calls it,
+  so hibernation is transparent to users
+- The idle clock restarts whenever a runtime is seen running again
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.db.models import ProjectRuntime
+from agent_v1.runtime.docker_manager import docker_manager
+from agent_v1.runtime.metrics import MetricSample, metrics_collector
+from agent_v1.runtime.terminal_manager import terminal_manager
+
+logger = logging.getLogger("runtime")
+
+IDLE_CHECK_INTERVAL_SECONDS = 60
+
+# Activity thresholds per check interval
+CPU_ACTIVE_FRACTION = 0.02         # 2% of one CPU
+NETWORK_ACTIVE_BYTES = 16 * 1024   # rx + tx
+
+
+def _network_bytes(sample: MetricSample) -> int:
+    return sample.network_rx_bytes + sample.network_tx_bytes
+
+
+class IdleReaper:
+    """
+    Periodic idle detection and hibernation of running runtimes.
+    """
+
+    def __init__(self, idle_minutes: int, action: str):
+        self.idle_seconds = idle_minutes * 60
+        self.action = action
+
+        self._last_active: Dict[str, float] = {}
+        # Time and network bytes of the last sample seen per project
+        self._seen: Dict[str, MetricSample] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_seconds > 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        if self.enabled:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def touch(self, project_name: str):
+        """Record user activity (e.g. terminal input)."""
+        self._last_active[project_name] = time.monotonic()
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(IDLE_CHECK_INTERVAL_SECONDS)
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Idle sweep failed")
+
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+
+    def _active(self, project_name: str, samples: List[MetricSample]) -> bool:
+        previous = self._seen.get(project_name, samples[0])
+        self._seen[project_name] = samples[-1]
+
+        cpu = sum(s.cpu_percent for s in samples) / len(samples) / 100
+        net_delta = _network_bytes(samples[-1]) - _network_bytes(previous)
+
+        return cpu > CPU_ACTIVE_FRACTION or net_delta > NETWORK_ACTIVE_BYTES
+
+    async def sweep(self):
+        running = await ProjectRuntime.filter(status="running").values_list(
+            "project__name", flat=True
+        )
+        now = time.monotonic()
+        seen: Set[str] = set()
+        idle: List[str] = []
+
+        for project_name in running:
+            seen.add(project_name)
+
+            # Newly (re)started: the idle clock starts now
+            self._last_active.setdefault(project_name, now)
+
+            if project_name in terminal_manager.sessions:
+                self.touch(project_name)
+                continue
+
+            previous = self._seen.get(project_name)
+            samples = metrics_collector.samples(
+                project_name, previous.time if previous else None
+            )
+            if not samples:
+                continue
+
+            if self._active(project_name, samples):
+                self.touch(project_name)
+            elif now - self._last_active[project_name] >= self.idle_seconds:
+                idle.append(project_name)
+
+        await asyncio.gather(*(self._hibernate(p) for p in idle))
+
+        # Forget runtimes that are no longer running
+        for state in (self._last_active, self._seen):
+            for project_name in list(state):
+                if project_name not in seen:
+                    del state[project_name]
+
+    async def _hibernate(self, project_name: str):
+        try:
+            await docker_manager.hibernate_container(project_name, self.action)
+            logger.info("Hibernated idle runtime %s (%s)", project_name, self.action)
+        except Exception as e:
+            logger.warning("Could not hibernate %s: %s", project_name, e)
+            return
+
+        self._last_active.pop(project_name, None)
+        self._seen.pop(project_name, None)
+
+
+# Singleton instance used across the application
+idle_reaper = IdleReaper(
+    idle_minutes=Config.RUNTIME_IDLE_MINUTES,
+    action=Config.RUNTIME_IDLE_ACTION,
+)
@@ -0,0 +1,152 @@
+"""
+Purpose:
+--------
+Serializes runtime lifecycle operations per project and coalesces
+duplicate in-flight requests.
+
+Why this exists:
+----------------
+- Two concurrent `/runtime/start` calls both saw no runtime and both
+  created one (integrity error or Docker name conflict); start / stop
+  races flapped `ProjectRuntime.status`
+- Double clicks and client retries re-ran the same Docker calls
+
+Design:
+-------
+- One asyncio lock per project, dropped when no operation holds or
+  waits for it
+- RUNTIME_LOCK_BACKEND=postgres additionally takes a session-level
+  `pg_advisory_lock` per project on a dedicated pooled connection, for
+  deployments running several API workers
+- `coalesce(key, ...)`: while an operation with the same key is in
+  flight (in this process), further callers await its result instead
+  of running it again
+- Coalesced operations run as their own task: a caller that goes away
+  (client disconnect) does not cancel the work others are awaiting
+"""
+
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable
+
+from tortoise import connections
+
+from agent_v1.api.db.config import Config
+
+logger = logging.getLogger("runtime")
+
+
+def advisory_key(project_name: str) -> int:
+    """Stable signed 64-bit key for pg_advisory_lock."""
+    digest = hashlib.blake2b(
+        f"runtime:{project_name}".encode("utf-8"),
+        digest_size=8,
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@dataclass(slots=True)
+class _LockEntry:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class RuntimeLocks:
+    """
+    Per-project locks and in-flight operation coalescing.
+    """
+
+    def __init__(self, backend: str):
+        self.backend = backend
+
+        self._locks: Dict[str, _LockEntry] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    # ------------------------------------------------------------------
+    # Locking
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def hold(self, project_name: str) -> AsyncIterator[None]:
+        """Exclusive lifecycle access to one project's runtime."""
+        entry = self._locks.get(project_name)
+        if entry is None:
+            entry = self._locks[project_name] = _LockEntry()
+
+        entry.users += 1
+        try:
+            async with entry.lock:
+                if self.backend == "postgres":
+                    async with self._advisory_lock(project_name):
+                        yield
+                else:
+                    yield
+        finally:
+            entry.users -= 1
+            if not entry.users:
+                del self._locks[project_name]
+
+    @asynccontextmanager
+    async def _advisory_lock(self, project_name: str) -> AsyncIterator[None]:
+        key = advisory_key(project_name)
+
+        # Session-level lock: held on one connection for the whole
+        # operation, independent of the queries the operation runs
+        async with connections.get("default").acquire_connection() as conn:
+            await conn.execute("SELECT pg_advisory_lock($1)", key)
+            try:
+                yield
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", key)
+
+    # ------------------------------------------------------------------
+    # Coalescing
+    # ------------------------------------------------------------------
+
+    async def coalesce(
+        self,
+        key: Hashable,
+        operation: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Run `operation()` unless one with the same key is already in
+        flight; either way, return (or raise) its result.
+        """
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.create_task(operation())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Mark the exception retrieved when every caller went away
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Runtime operation %s failed: %s", key, task.exception())
+
+    async def run(
+        self,
+        op: str,
+        project_name: str,
+        operation: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        """`operation(project_name, *args)` under the project lock, coalesced."""
+
+        async def locked():
+            async with self.hold(project_name):
+                return await operation(project_name, *args)
+
+        return await self.coalesce((op, project_name, *args), locked)
+
+
+# Singleton instance used across the application
+runtime_locks = RuntimeLocks(backend=Config.RUNTIME_LOCK_BACKEND)
@@ -0,0 +1,316 @@
+"""
+Purpose:
+--------
+Live CPU / memory / network / block I/O metrics of running runtimes,
+kept as a short history per project.
+
+Why this exists:
+----------------
+- Container limits (memory, CPUs) were chosen blind: nobody could see
+  what project containers actually use
+- Right-sizing limits and packing more containers per host needs
+  recent usage per project, for users and operators alike
+
+Design:
+-------
+- Every METRICS_SAMPLE_SECONDS, one one-shot `/containers/{id}/stats`
+  request is made per running runtime (ProjectRuntime.status ==
+  "running"), STATS_CONCURRENCY at a time; CPU usage is computed
+  against the project's previous sample, since one-shot stats carry no
+  previous reading
+- Only projects somebody watches (see `/runtime/ws/metrics`) get a
+  streaming stats request (about one sample per second); it starts on
+  subscribe and is cancelled with the last subscriber, so idle hosts do
+  not hold one Docker connection per container
+- Samples are appended to a bounded deque per project
+  (RUNTIME_METRICS_HISTORY samples; with 0 only the latest one is kept,
+  for idle detection) and pushed to subscribers
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.db.models import ProjectRuntime
+from agent_v1.runtime.docker_client import DockerError, docker_client, path_quote
+
+logger = logging.getLogger("runtime")
+
+METRICS_SAMPLE_SECONDS = 10
+
+# Concurrent one-shot stats requests per sweep
+STATS_CONCURRENCY = 8
+
+
+@dataclass(slots=True, frozen=True)
+class MetricSample:
+    time: float
+    cpu_percent: float
+    memory_bytes: int
+    memory_limit_bytes: int
+    network_rx_bytes: int
+    network_tx_bytes: int
+    block_read_bytes: int
+    block_write_bytes: int
+    pids: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+Listener = Callable[[MetricSample], None]
+
+
+def _cpu_percent(stats: dict) -> float:
+    cpu = stats.get("cpu_stats") or {}
+    precpu = stats.get("precpu_stats") or {}
+
+    cpu_delta = (
+        cpu.get("cpu_usage", {}).get("total_usage", 0)
+        - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    )
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    if cpu_delta <= 0 or system_delta <= 0:
+        return 0.0
+
+    online = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or [1])
+    return cpu_delta / system_delta * online * 100.0
+
+
+def _memory_bytes(stats: dict) -> int:
+    memory = stats.get("memory_stats") or {}
+    detail = memory.get("stats") or {}
+
+    # Same as `docker stats`: page cache does not count as usage
+    # (inactive_file on cgroup v2, cache on v1)
+    cache = detail.get("inactive_file", detail.get("cache", 0))
+    return max(0, memory.get("usage", 0) - cache)
+
+
+def _block_bytes(stats: dict) -> tuple[int, int]:
+    read = write = 0
+    entries = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+
+    for entry in entries:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            read += entry.get("value", 0)
+        elif op == "write":
+            write += entry.get("value", 0)
+
+    return read, write
+
+
+def metric_from_stats(stats: dict, now: Optional[float] = None) -> MetricSample:
+    """Summarize one Docker stats document."""
+    networks = (stats.get("networks") or {}).values()
+    block_read, block_write = _block_bytes(stats)
+
+    return MetricSample(
+        time=time.time() if now is None else now,
+        cpu_percent=round(_cpu_percent(stats), 2),
+        memory_bytes=_memory_bytes(stats),
+        memory_limit_bytes=(stats.get("memory_stats") or {}).get("limit", 0),
+        network_rx_bytes=sum(n.get("rx_bytes", 0) for n in networks),
+        network_tx_bytes=sum(n.get("tx_bytes", 0) for n in networks),
+        block_read_bytes=block_read,
+        block_write_bytes=block_write,
+        pids=(stats.get("pids_stats") or {}).get("current", 0),
+    )
+
+
+class MetricsCollector:
+    """
+    Periodic stats of running runtimes, live streams for watched
+    projects, and their recent history.
+    """
+
+    def __init__(self, history: int):
+        self.history = max(0, history)
+
+        self._samples: Dict[str, Deque[MetricSample]] = {}
+        self._cpu: Dict[str, dict] = {}
+        self._streams: Dict[str, asyncio.Task] = {}
+        self._listeners: Dict[str, Set[Listener]] = defaultdict(set)
+
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        tasks = list(self._streams.values())
+        if self._task:
+            tasks.append(self._task)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._streams.clear()
+        self._task = None
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    async def _sweep_loop(self):
+        next_sweep = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + METRICS_SAMPLE_SECONDS
+                    await self.sweep()
+                else:
+                    # Woken by a new subscriber
+                    self._sync_streams(await self._running())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Metrics sweep failed")
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), max(0.0, next_sweep - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _running(self) -> Dict[str, str]:
+        return dict(
+            await ProjectRuntime.filter(status="running").values_list(
+                "project__name", "container_name"
+            )
+        )
+
+    def _sync_streams(self, running: Dict[str, str]):
+        """Stream the stats of watched running projects, and only those."""
+        for project_name in self._listeners:
+            container_name = running.get(project_name)
+            task = self._streams.get(project_name)
+            if container_name and (task is None or task.done()):
+                self._streams[project_name] = asyncio.create_task(
+                    self._read(project_name, container_name)
+                )
+
+        for project_name in list(self._streams):
+            if project_name not in running:
+                self._streams.pop(project_name).cancel()
+
+    async def sweep(self):
+        """Sample every running runtime that is not streamed once."""
+        running = await self._running()
+        self._sync_streams(running)
+        slots = asyncio.Semaphore(STATS_CONCURRENCY)
+
+        async def sample(project_name: str, container_name: str):
+            async with slots:
+                try:
+                    stats = await docker_client.get(
+                        f"/containers/{path_quote(container_name)}/stats",
+                        stream=False,
+                        **{"one-shot": True},
+                    )
+                except DockerError as e:
+                    logger.debug("Stats of %s unavailable: %s", container_name, e)
+                    return
+            self._consume(project_name, stats)
+
+        await asyncio.gather(*(
+            sample(project_name, container_name)
+            for project_name, container_name in running.items()
+            if project_name not in self._streams
+        ))
+
+        # History of runtimes that stopped is not kept
+        for state in (self._samples, self._cpu):
+            for project_name in list(state):
+                if project_name not in running:
+                    del state[project_name]
+
+    async def _read(self, project_name: str, container_name: str):
+        try:
+            async for stats in docker_client.stream(
+                "GET",
+                f"/containers/{path_quote(container_name)}/stats",
+                {"stream": True},
+            ):
+                self._consume(project_name, stats)
+
+        except asyncio.CancelledError:
+            raise
+        except (DockerError, ValueError) as e:
+            logger.debug("Stats stream of %s ended: %s", container_name, e)
+
+    def _consume(self, project_name: str, stats: dict):
+        if not stats.get("read") or not stats.get("memory_stats"):
+            return  # the container is not running (anymore)
+
+        # One-shot stats have no previous reading: use the last one seen
+        if not (stats.get("precpu_stats") or {}).get("system_cpu_usage"):
+            stats = {**stats, "precpu_stats": self._cpu.get(project_name) or {}}
+        self._cpu[project_name] = stats.get("cpu_stats") or {}
+
+        self._record(project_name, metric_from_stats(stats))
+
+    def _record(self, project_name: str, sample: MetricSample):
+        samples = self._samples.get(project_name)
+        if samples is None:
+            samples = self._samples[project_name] = deque(maxlen=max(self.history, 1))
+        samples.append(sample)
+
+        for listener in list(self._listeners.get(project_name, ())):
+            try:
+                listener(sample)
+            except Exception:
+                logger.exception("Metrics listener failed")
+
+    # ------------------------------------------------------------------
+    # Queries / Subscriptions
+    # ------------------------------------------------------------------
+
+    def samples(self, project_name: str, since: Optional[float] = None) -> List[MetricSample]:
+        """Recent samples of a project, oldest first."""
+        samples = list(self._samples.get(project_name, ()))
+        if since is not None:
+            samples = [s for s in samples if s.time > since]
+        return samples
+
+    def subscribe(self, project_name: str, listener: Listener) -> Callable[[], None]:
+        """
+        Deliver new samples of one project to `listener`, streaming its
+        stats while anybody listens. Returns the matching unsubscribe
+        callable.
+        """
+        self._listeners[project_name].add(listener)
+
+        # Start the stream now instead of at the next sweep
+        if project_name not in self._streams:
+            self._wakeup.set()
+
+        def unsubscribe():
+            listeners = self._listeners.get(project_name)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._listeners[project_name]
+                    # Back to periodic one-shot samples
+                    task = self._streams.pop(project_name, None)
+                    if task is not None:
+                        task.cancel()
+
+        return unsubscribe
+
+
+# Singleton instance used across the application
+metrics_collector = MetricsCollector(history=Config.RUNTIME_METRICS_HISTORY)
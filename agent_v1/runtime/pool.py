@@ -0,0 +1,265 @@
+"""
+Purpose:
+--------
+Pool of pre-created, already running containers handed to projects on
+their first `/runtime/start` (RUNTIME_POOL_SIZE, disabled when 0).
+
+Why this exists:
+----------------
+- A cold start (create + start, image layers, bind mount setup) is the
+  latency users notice most right after generation
+- Taking a warm container is a rename of the container and of a
+  directory: well under a second
+
+Design:
+-------
+- Each pooled container bind mounts its own empty slot directory under
+  `<GENERATED_PROJECTS_ROOT>/.runtime-pool/` (same filesystem as the
+  projects) at /workspace
+- Bind mounts are fixed at creation, so a project is brought to the
+  mount instead: its entries are renamed into the slot, the slot is
+  renamed over the (now empty) project directory, and a symlink is left
+  at the slot path so later restarts of the container resolve the mount
+  source to the project directory
+- The container is renamed to the project's container name; the pool
+  is refilled in the background
+- Idle pool containers survive backend restarts and are picked up again
+  at startup; broken ones are removed
+"""
+
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import secrets
+from dataclasses import dataclass
+from typing import List, Optional
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.file_service import file_service
+from agent_v1.runtime.container_spec import (
+    POOL_CONTAINER_PREFIX,
+    POOL_LABEL,
+    container_config,
+)
+from agent_v1.runtime.docker_client import (
+    DockerError,
+    DockerNotFound,
+    docker_client,
+    path_quote,
+)
+from agent_v1.storage.reaper import trash_reaper
+from agent_v1.tools.project_root import GENERATED_PROJECTS_ROOT
+from agent_v1.tools.trash import move_to_trash
+
+logger = logging.getLogger("runtime")
+
+# Delay before retrying after a failed refill (e.g. image pull failure)
+REFILL_RETRY_SECONDS = 30
+
+
+@dataclass(slots=True)
+class PooledContainer:
+    id: str
+    name: str
+    slot: pathlib.Path
+
+
+def adopt_slot(slot: pathlib.Path, project_dir: pathlib.Path):
+    """
+    Make `slot` (mounted in a pooled container) become `project_dir`.
+    Blocking; all renames stay on one filesystem. On failure the
+    project is left as it was.
+    """
+    moved: List[str] = []
+
+    try:
+        for entry in os.scandir(project_dir):
+            os.rename(entry.path, slot / entry.name)
+            moved.append(entry.name)
+
+        os.chmod(slot, os.stat(project_dir).st_mode & 0o7777)
+
+        # Replaces the empty project directory atomically
+        os.rename(slot, project_dir)
+
+    except OSError:
+        for name in moved:
+            os.rename(slot / name, project_dir / name)
+        raise
+
+    # Container restarts resolve the recorded mount source through this
+    os.symlink(project_dir, slot)
+
+
+class RuntimePool:
+    """
+    Warm containers for one image.
+    """
+
+    def __init__(self, root: pathlib.Path, size: int, image: str):
+        self.root = root
+        self.size = max(0, size)
+        self.image = image
+
+        self._idle: List[PooledContainer] = []
+        self._creating = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        if not self.enabled:
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Idle containers are kept running and reused after a restart
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        try:
+            await self._recover()
+        except DockerError as e:
+            logger.warning("Runtime pool recovery failed: %s", e)
+
+        while True:
+            try:
+                await self._fill()
+                await self._wakeup.wait()
+                self._wakeup.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Runtime pool refill failed: %s", e)
+                await asyncio.sleep(REFILL_RETRY_SECONDS)
+
+    # ------------------------------------------------------------------
+    # Pool maintenance
+    # ------------------------------------------------------------------
+
+    async def _recover(self):
+        """Re-adopt idle pool containers left by a previous run."""
+        containers = await docker_client.get(
+            "/containers/json",
+            all=True,
+            filters=json.dumps({"label": [POOL_LABEL]}),
+        )
+        mounted = set()
+
+        for info in containers:
+            name = info["Names"][0].lstrip("/")
+            sources = [
+                m["Source"] for m in info.get("Mounts", [])
+                if m.get("Type") == "bind"
+            ]
+            mounted.update(sources)
+
+            if not name.startswith(POOL_CONTAINER_PREFIX):
+                continue  # assigned to a project
+
+            slot = pathlib.Path(sources[0]) if sources else None
+            if (
+                slot is not None
+                and info["State"] == "running"
+                and info["Labels"].get(POOL_LABEL) == self.image
+                and len(self._idle) < self.size
+                and slot.is_dir()
+                and not slot.is_symlink()
+                and not any(slot.iterdir())
+            ):
+                self._idle.append(PooledContainer(info["Id"], name, slot))
+            else:
+                await self._remove(info["Id"], slot)
+
+        # Symlinks and slots no container mounts anymore
+        for path in self.root.iterdir():
+            if str(path) not in mounted:
+                await self._remove_slot(path)
+
+    async def _fill(self):
+        while len(self._idle) + self._creating < self.size:
+            self._creating += 1
+            try:
+                self._idle.append(await self._create())
+            finally:
+                self._creating -= 1
+
+    async def _create(self) -> PooledContainer:
+        token = secrets.token_hex(6)
+        name = f"{POOL_CONTAINER_PREFIX}{token}"
+        slot = self.root / f"slot-{token}"
+        slot.mkdir()
+
+        config = container_config(self.image, slot, {POOL_LABEL: self.image})
+
+        try:
+            try:
+                created = await docker_client.post("/containers/create", config, name=name)
+            except DockerNotFound:
+                await docker_client.pull_image(self.image)
+                created = await docker_client.post("/containers/create", config, name=name)
+
+            await docker_client.post(f"/containers/{created['Id']}/start")
+
+        except BaseException:
+            await self._remove(name, slot)
+            raise
+
+        return PooledContainer(created["Id"], name, slot)
+
+    async def _remove_slot(self, slot: pathlib.Path):
+        if slot.is_symlink():
+            slot.unlink()
+        elif slot.exists():
+            await file_service.run(move_to_trash, slot)
+            trash_reaper.notify()
+
+    async def _remove(self, container: str, slot: Optional[pathlib.Path]):
+        try:
+            await docker_client.delete(f"/containers/{path_quote(container)}", force=True)
+        except DockerNotFound:
+            pass
+        except DockerError as e:
+            logger.warning("Could not remove pool container %s: %s", container, e)
+
+        if slot is not None:
+            await self._remove_slot(slot)
+
+    # ------------------------------------------------------------------
+    # Assignment
+    # ------------------------------------------------------------------
+
+    def take(self, image: str) -> Optional[PooledContainer]:
+        """An idle container for `image`, if one is ready."""
+        if image != self.image or not self._idle:
+            return None
+
+        pooled = self._idle.pop()
+        self._wakeup.set()
+        return pooled
+
+    async def discard(self, pooled: PooledContainer):
+        """Drop a taken container that could not be assigned."""
+        await self._remove(pooled.id, pooled.slot)
+
+
+# Singleton instance used across the application
+runtime_pool = RuntimePool(
+    root=GENERATED_PROJECTS_ROOT / ".runtime-pool",
+    size=Config.RUNTIME_POOL_SIZE,
+    image=Config.RUNTIME_POOL_IMAGE,
+)
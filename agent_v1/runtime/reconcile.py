@@ -17,58 +17,103 @@ This reconciliation ensures:
 
 Execution:
 ----------
-- Runs ONCE during application startup
+- Runs ONCE during application startup, in the background (the app
+  serves requests meanwhile; live changes come from `runtime_events`)
+- One Docker call lists every project container, one query loads every
+  runtime row, the diff is computed in memory and applied with one bulk
+  UPDATE per (old, new) status pair, so startup does not grow with the
+  runtime count
+- Each UPDATE only matches rows still holding the status that was read:
+  a start / stop / hibernation landing meanwhile is not overwritten
 - Must NEVER crash application startup
 """
 
-from agent_v1.runtime.docker_manager import docker_manager, DockerError
-from agent_v1.runtime.repository import RuntimeRepository
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
 
+from agent_v1.api.db.models import ProjectRuntime
+from agent_v1.runtime.container_spec import CONTAINER_PREFIX
+from agent_v1.runtime.docker_client import DockerError, docker_client
 
-async def reconcile_runtimes_on_startup():
+logger = logging.getLogger("runtime")
+
+# Bounds the size of each `IN (...)` list
+UPDATE_CHUNK_SIZE = 500
+
+
+def runtime_status(docker_state: str) -> str:
+    """DB status for a Docker container state (created, running, exited, ...)."""
+    if docker_state == "paused":
+        return "paused"
+    return "running" if docker_state in ("running", "restarting") else "stopped"
+
+
+async def container_states() -> Dict[str, str]:
+    """Container name -> Docker state, for every project container."""
+    containers = await docker_client.get(
+        "/containers/json",
+        all=True,
+        filters=json.dumps({"name": [f"^/?{CONTAINER_PREFIX}"]}),
+    )
+    return {
+        name.lstrip("/"): info["State"]
+        for info in containers
+        for name in info["Names"]
+    }
+
+
+async def reconcile_runtimes() -> Dict[str, int]:
     """
     Sync database runtime status with Docker container state.
 
     Rules:
     ------
     - If container exists AND is running → status = "running"
+    - If container is paused → status = "paused"
+    - Hibernated runtimes whose container is stopped stay "hibernated"
     - Otherwise → status = "stopped"
     - Missing containers are treated as stopped
-    - Errors MUST NOT block app startup
+
+    Returns the number of rows moved to each status.
     """
-    repo = RuntimeRepository()
-
-    # Fetch all known runtimes from DB
-    runtimes = await repo.list_all()
-
-    for runtime in runtimes:
-        try:
-            # Check Docker state
-            exists = docker_manager.container_exists(
-                runtime.container_name
-            )
-
-            running = (
-                docker_manager.is_running(runtime.container_name)
-                if exists
-                else False
-            )
-
-            new_status = "running" if running else "stopped"
-
-            # Update DB only if state differs
-            if runtime.status != new_status:
-                await repo.update_status(
-                    runtime.project_name,
-                    new_status,
-                )
-
-        except DockerError as e:
-            # IMPORTANT:
-            # Docker errors must never prevent app startup.
-            # Log and continue safely.
-            print(
-                f"[RECONCILE_WARNING] "
-                f"project={runtime.project_name} "
-                f"error={e}"
-            )
+    states = await container_states()
+    rows = await ProjectRuntime.all().values_list("container_name", "status")
+
+    # (status read, actual status) -> container names
+    changes: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for container_name, status in rows:
+        actual = runtime_status(states.get(container_name, "missing"))
+        if status == "hibernated" and actual == "stopped":
+            continue
+        if status != actual:
+            changes[(status, actual)].append(container_name)
+
+    changed: Dict[str, int] = defaultdict(int)
+    for (old, new), names in changes.items():
+        for i in range(0, len(names), UPDATE_CHUNK_SIZE):
+            changed[new] += await ProjectRuntime.filter(
+                container_name__in=names[i:i + UPDATE_CHUNK_SIZE],
+                status=old,
+            ).update(status=new)
+
+    return {status: count for status, count in changed.items() if count}
+
+
+async def reconcile_runtimes_on_startup():
+    """
+    Background startup task: errors are logged, never raised.
+    """
+    try:
+        changed = await reconcile_runtimes()
+        if changed:
+            logger.info("Reconciled runtime status: %s", changed)
+
+    except DockerError as e:
+        # IMPORTANT:
+        # Docker errors must never prevent app startup.
+        logger.warning("Runtime reconciliation skipped: %s", e)
+
+    except Exception:
+        logger.exception("Runtime reconciliation failed")
@@ -14,6 +14,7 @@ What this repository manages:
 - Container existence
 - Container running / stopped status
 - Container metadata (image, name, project root)
+- Resource profile and limits
 - Last executed command (optional, informational)
 
 What this repository deliberately DOES NOT manage:
@@ -33,6 +34,7 @@ from typing import List
 from tortoise.exceptions import DoesNotExist
 
 from agent_v1.api.db.models import Project, ProjectRuntime
+from agent_v1.runtime.container_spec import Resources
 
 
 class RuntimeNotFound(Exception):
@@ -108,6 +110,23 @@ class RuntimeRepository:
         if not updated:
             raise RuntimeNotFound(project_name)
 
+    async def update_resources(
+        self,
+        project_name: str,
+        profile: str,
+        resources: Resources,
+    ) -> None:
+        project = await self._get_project(project_name)
+
+        updated = await ProjectRuntime.filter(project=project).update(
+            profile=profile,
+            memory_mb=resources.memory_mb,
+            cpus=resources.cpus,
+        )
+
+        if not updated:
+            raise RuntimeNotFound(project_name)
+
     async def update_last_command(
         self,
         project_name: str,
@@ -0,0 +1,413 @@
+"""
+Purpose:
+--------
+Optional content-addressed store deduplicating generated project files
+across projects (BLOB_STORE_ENABLED).
+
+Why this exists:
+----------------
+- Generated projects are highly repetitive (requirements.txt,
+  boilerplate entry points, CSS) and thousands of them are kept
+- Storing each distinct content once cuts disk usage, and a tree of
+  hardlinks makes cloning / snapshotting a project nearly free
+
+Design:
+-------
+- Objects live under `<GENERATED_PROJECTS_ROOT>/.blobs/objects`, named
+  by SHA-256 and permission bits (hardlinks share their mode)
+- A project file is a hardlink to its object; the project's manifest
+  (`.blobs/manifests/<name>.json`) maps paths to objects
+- Reference counting is the inode link count: an object whose only
+  remaining link is the store itself is garbage
+- Only files outside the ignore rules are stored (sources, not
+  `node_modules` / `.venv`)
+
+Safety:
+-------
+Hardlinked files must never be written in place, or every project
+sharing the object changes. API and agent writes replace files by
+rename (atomic writes), which detaches the link. Containers can write
+anything, so a project is materialized (private copies) before its
+container starts and re-ingested after it stops.
+
+Files can still change while being ingested: a file is only linked
+into the store when its inode, size and mtime are the same before and
+after hashing, objects are published only after that check, and a file
+is never replaced by its object if it changed meanwhile. `ingest` and
+`materialize` of one project never run concurrently.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import secrets
+import shutil
+import stat
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+from agent_v1.api.db.config import Config
+from agent_v1.api.file_service import file_service
+from agent_v1.tools.atomic_io import atomic_write_text
+from agent_v1.tools.listing import IgnoreRules, iter_tree
+from agent_v1.tools.project_root import GENERATED_PROJECTS_ROOT
+
+logger = logging.getLogger("storage")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# path -> {"object": "<sha256>.<mode>", "size": int, "mtime_ns": int, "ino": int}
+Manifest = Dict[str, Dict[str, int | str]]
+
+
+def _tmp_sibling(path: pathlib.Path) -> pathlib.Path:
+    return path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+
+
+class _Changed(Exception):
+    """The file changed while being ingested."""
+    pass
+
+
+def _same_file(a: os.stat_result, b: os.stat_result) -> bool:
+    return (
+        (a.st_dev, a.st_ino, a.st_size, a.st_mtime_ns)
+        == (b.st_dev, b.st_ino, b.st_size, b.st_mtime_ns)
+    )
+
+
+def _hash_file(path: pathlib.Path, st: os.stat_result) -> str:
+    """
+    SHA-256 of the file `st` describes; raises _Changed when the path
+    now is another file or the content changed while reading.
+    """
+    h = hashlib.sha256()
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+
+    with os.fdopen(fd, "rb") as f:
+        if not _same_file(os.fstat(fd), st):
+            raise _Changed()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+        if not _same_file(os.fstat(fd), st):
+            raise _Changed()
+
+    return h.hexdigest()
+
+
+class BlobStore:
+    """
+    Hardlink based content-addressed store. All methods are blocking;
+    run them on the file I/O pool.
+    """
+
+    def __init__(self, root: pathlib.Path, enabled: bool):
+        self.root = root
+        self.enabled = enabled
+        self.objects_dir = root / "objects"
+        self.manifests_dir = root / "manifests"
+
+        self._background: Set[asyncio.Task] = set()
+
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _object_path(self, name: str) -> pathlib.Path:
+        return self.objects_dir / name[:2] / name
+
+    def _manifest_path(self, project_name: str) -> pathlib.Path:
+        return self.manifests_dir / f"{project_name}.json"
+
+    def load_manifest(self, project_name: str) -> Manifest:
+        try:
+            with open(self._manifest_path(project_name), encoding="utf-8") as f:
+                return json.load(f)["files"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return {}
+
+    def _save_manifest(self, project_name: str, manifest: Manifest):
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+            self._manifest_path(project_name),
+            json.dumps({"version": 1, "files": manifest}, sort_keys=True),
+        )
+
+    @contextmanager
+    def _project_lock(self, project_dir: pathlib.Path) -> Iterator[None]:
+        with self._locks_guard:
+            lock = self._locks.setdefault(project_dir.name, threading.Lock())
+        with lock:
+            yield
+
+    # ------------------------------------------------------------------
+    # Ingest / Materialize
+    # ------------------------------------------------------------------
+
+    def ingest(self, project_dir: pathlib.Path) -> Manifest:
+        """
+        Move a project's files into the store, replacing each one with a
+        hardlink to its object, and record the manifest.
+
+        Files unchanged since the previous manifest (same inode, size
+        and mtime) are not re-hashed; files changing while ingested are
+        left alone (and out of the manifest) until the next ingest.
+        """
+        project_dir = pathlib.Path(project_dir).resolve()
+        with self._project_lock(project_dir):
+            return self._ingest(project_dir)
+
+    def _ingest(self, project_dir: pathlib.Path) -> Manifest:
+        previous = self.load_manifest(project_dir.name)
+        ignore = IgnoreRules.for_project(project_dir)
+        manifest: Manifest = {}
+
+        for entry in iter_tree(project_dir, project_dir, ignore=ignore):
+            path = project_dir / entry.path
+
+            try:
+                st = os.lstat(path)
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+
+                known = previous.get(entry.path)
+                if (
+                    known
+                    and known["ino"] == st.st_ino
+                    and known["size"] == st.st_size
+                    and known["mtime_ns"] == st.st_mtime_ns
+                ):
+                    manifest[entry.path] = known
+                    continue
+
+                name = f"{_hash_file(path, st)}.{stat.S_IMODE(st.st_mode):o}"
+                st = self._link_into_store(path, st, name)
+
+            except (FileNotFoundError, _Changed):
+                continue  # removed or changed while ingesting
+
+            manifest[entry.path] = {
+                "object": name,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "ino": st.st_ino,
+            }
+
+        self._save_manifest(project_dir.name, manifest)
+
+        # Objects of files rewritten or deleted since the last ingest
+        current = {entry["object"] for entry in manifest.values()}
+        self._collect(
+            known["object"] for known in previous.values()
+            if known["object"] not in current
+        )
+        return manifest
+
+    def _link_into_store(
+        self,
+        path: pathlib.Path,
+        st: os.stat_result,
+        name: str,
+    ) -> os.stat_result:
+        """
+        Share `path` (hashed as `name` while it matched `st`) with the
+        store. Raises _Changed when the file changed in the meantime.
+        """
+        obj = self._object_path(name)
+
+        try:
+            obj_st = os.stat(obj)
+        except FileNotFoundError:
+            obj.parent.mkdir(parents=True, exist_ok=True)
+
+            # First copy of this content: the file becomes the object,
+            # published only if the linked inode is still what was hashed
+            staged = _tmp_sibling(obj)
+            os.link(path, staged, follow_symlinks=False)
+            try:
+                if not _same_file(os.lstat(staged), st):
+                    raise _Changed()
+                os.link(staged, obj)
+                return os.lstat(path)
+            except FileExistsError:
+                obj_st = os.stat(obj)
+            finally:
+                staged.unlink()
+
+        if obj_st.st_ino == st.st_ino:
+            return st
+
+        tmp = _tmp_sibling(path)
+        os.link(obj, tmp)
+        try:
+            # Never undo an edit made since hashing
+            if not _same_file(os.lstat(path), st):
+                raise _Changed()
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return os.stat(path)
+
+    def materialize(self, project_dir: pathlib.Path) -> int:
+        """
+        Give every shared file of a project a private copy, so that
+        in-place writes (from a container) cannot leak into other
+        projects. Returns the number of files copied.
+        """
+        project_dir = pathlib.Path(project_dir).resolve()
+        with self._project_lock(project_dir):
+            return self._materialize(project_dir)
+
+    def _materialize(self, project_dir: pathlib.Path) -> int:
+        copied = 0
+
+        for entry in iter_tree(project_dir, project_dir):
+            path = project_dir / entry.path
+
+            try:
+                st = os.lstat(path)
+                if not stat.S_ISREG(st.st_mode) or st.st_nlink < 2:
+                    continue
+
+                tmp = _tmp_sibling(path)
+                shutil.copy2(path, tmp)
+                os.replace(tmp, path)
+                copied += 1
+            except FileNotFoundError:
+                continue
+
+        return copied
+
+    def clone_tree(
+        self,
+        src_dir: pathlib.Path,
+        dst_dir: pathlib.Path,
+        manifest_name: Optional[str] = None,
+    ) -> int:
+        """
+        Copy a project tree into `dst_dir` (which must not exist) using
+        hardlinks to store objects for stored files and real copies for
+        everything else. Returns the number of linked files.
+
+        With `manifest_name`, the copy gets its own manifest (a linked
+        file shares its inode, so the source entries apply as-is).
+        """
+        src_dir = pathlib.Path(src_dir).resolve()
+        manifest = self.ingest(src_dir)
+        cloned: Manifest = {}
+        linked = 0
+
+        def copy(src: str, dst: str):
+            nonlocal linked
+            rel = os.path.relpath(src, src_dir).replace(os.sep, "/")
+            known = manifest.get(rel)
+
+            if known:
+                try:
+                    os.link(self._object_path(known["object"]), dst)
+                    cloned[rel] = known
+                    linked += 1
+                    return dst
+                except FileNotFoundError:
+                    pass
+
+            return shutil.copy2(src, dst)
+
+        shutil.copytree(src_dir, dst_dir, symlinks=True, copy_function=copy)
+
+        if manifest_name:
+            self._save_manifest(manifest_name, cloned)
+
+        return linked
+
+    # ------------------------------------------------------------------
+    # Reference counting
+    # ------------------------------------------------------------------
+
+    def _collect(self, names: Iterable[str]) -> int:
+        """Remove objects no project links to anymore (st_nlink == 1)."""
+        removed = 0
+
+        for name in set(names):
+            obj = self._object_path(name)
+            try:
+                if os.stat(obj).st_nlink == 1:
+                    obj.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+
+        return removed
+
+    def release(self, project_name: str) -> int:
+        """
+        Drop a deleted project's manifest and the objects only it used.
+        Call after the project files are gone.
+        """
+        manifest = self.load_manifest(project_name)
+        self._manifest_path(project_name).unlink(missing_ok=True)
+        return self._collect(entry["object"] for entry in manifest.values())
+
+    def gc(self) -> int:
+        """Full sweep for unreferenced objects (e.g. after a crash)."""
+        if not self.objects_dir.is_dir():
+            return 0
+
+        removed = 0
+        for bucket in self.objects_dir.iterdir():
+            with os.scandir(bucket) as it:
+                removed += self._collect(e.name for e in it if e.is_file())
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        objects = size = 0
+
+        if self.objects_dir.is_dir():
+            for bucket in self.objects_dir.iterdir():
+                with os.scandir(bucket) as it:
+                    for e in it:
+                        objects += 1
+                        size += e.stat().st_size
+
+        return {"objects": objects, "bytes": size}
+
+    # ------------------------------------------------------------------
+    # Async helpers
+    # ------------------------------------------------------------------
+
+    def schedule(self, fn, *args) -> Optional[asyncio.Task]:
+        """
+        Run a store operation on the file I/O pool in the background
+        (no-op when the store is disabled). Failures are logged.
+        """
+        if not self.enabled:
+            return None
+
+        async def run():
+            try:
+                await file_service.run(fn, *args)
+            except Exception:
+                logger.exception("Blob store %s failed", fn.__name__)
+
+        task = asyncio.create_task(run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def schedule_ingest(self, project_dir: str | pathlib.Path) -> Optional[asyncio.Task]:
+        return self.schedule(self.ingest, pathlib.Path(project_dir))
+
+
+# Singleton instance used across the application
+blob_store = BlobStore(
+    root=GENERATED_PROJECTS_ROOT / ".blobs",
+    enabled=Config.BLOB_STORE_ENABLED,
+)
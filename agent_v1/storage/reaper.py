@@ -0,0 +1,107 @@
+"""
+Purpose:
+--------
+Background reclamation of trashed trees (`agent_v1.tools.trash`).
+
+Why this exists:
+----------------
+- Recursive deletes of large trees (.venv, node_modules, snapshots)
+  take seconds; request handlers only rename them into the trash and
+  return immediately
+- The reaper deletes trash entries one at a time on its own thread, so
+  reclamation never competes with request I/O on the file pool
+
+Execution:
+----------
+- Woken up right after something was trashed, with a periodic sweep
+  as fallback (also picks up leftovers from a previous run)
+- Entries that cannot be fully removed (e.g. files owned by a
+  container user) are retried on the next sweep
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from agent_v1.api.db.config import Config
+from agent_v1.storage.blob_store import blob_store
+from agent_v1.tools.trash import reclaim, trash_entries
+
+logger = logging.getLogger("storage")
+
+
+class TrashReaper:
+    """
+    Single background task emptying the trash.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="trash-reaper",
+        )
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def notify(self):
+        """Wake the reaper (called after something was trashed)."""
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    async def _loop(self):
+        while True:
+            try:
+                await self._sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Trash sweep failed")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _sweep(self):
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(self._executor, trash_entries)
+        reclaimed = 0
+
+        for entry in entries:
+            if await loop.run_in_executor(self._executor, reclaim, entry):
+                reclaimed += 1
+            else:
+                logger.warning("Could not fully reclaim %s", entry)
+
+        # Trashed project files held links to store objects
+        if reclaimed and blob_store.enabled:
+            await loop.run_in_executor(self._executor, blob_store.gc)
+
+
+# Singleton instance used across the application
+trash_reaper = TrashReaper(interval=Config.TRASH_REAP_INTERVAL_SECONDS)
@@ -0,0 +1,383 @@
+"""
+Purpose:
+--------
+Point-in-time snapshots of project trees with instant rollback.
+
+Why this exists:
+----------------
+- Users regenerate or hand-edit and want to go back; the coder agent
+  overwrites files with no history
+- Snapshots must be cheap enough to take before every coder step
+
+Design:
+-------
+- A snapshot is a hardlink tree under
+  `<GENERATED_PROJECTS_ROOT>/.snapshots/<project>/<id>/tree`, so taking
+  one costs a directory walk and one link per file, no data copy
+- This is copy-on-write because project files are only ever replaced
+  by rename (atomic writes): the live file gets a new inode and the
+  snapshot keeps the old one
+- Processes in a running container can write in place, so snapshots
+  and restores of a running project use real copies (`link=False`),
+  and shared inodes are detached before a container starts
+- Ignored paths (`node_modules`, `.venv`, ...) are not captured and
+  are left untouched by restores
+- Automatic snapshots are pruned to the newest AUTO_SNAPSHOT_KEEP per
+  project; manual ones are kept until deleted. Deleted snapshots are
+  moved to the trash and reclaimed by the trash reaper
+
+All methods are blocking; run them on the file I/O pool.
+"""
+
+import errno
+import filecmp
+import json
+import os
+import pathlib
+import re
+import secrets
+import shutil
+import stat
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from agent_v1.tools.atomic_io import atomic_write_text
+from agent_v1.tools.listing import IgnoreRules, iter_tree
+from agent_v1.tools.project_root import GENERATED_PROJECTS_ROOT
+from agent_v1.tools.trash import move_to_trash
+
+AUTO_SNAPSHOT_KEEP = 20
+
+_SNAPSHOT_ID = re.compile(r"\d{8}T\d{12}-[0-9a-f]{4}")
+
+
+class SnapshotNotFound(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class SnapshotInfo:
+    id: str
+    label: Optional[str]
+    auto: bool
+    created_at: str
+    files: int
+    bytes: int
+
+
+def _link_or_copy(src: pathlib.Path, dst: pathlib.Path, link: bool) -> bool:
+    """
+    Capture `src` at `dst` without following symlinks: a link is
+    recreated as the same link, never resolved (links made in a container
+    may point anywhere on the host). Special files are skipped (False).
+    """
+    st = os.lstat(src)
+
+    if stat.S_ISLNK(st.st_mode):
+        os.symlink(os.readlink(src), dst)
+        return True
+
+    if not stat.S_ISREG(st.st_mode):
+        return False
+
+    if link:
+        try:
+            # Hardlinks the entry itself even if it became a link meanwhile
+            os.link(src, dst, follow_symlinks=False)
+            return True
+        except OSError as e:
+            # Other filesystem or no hardlink support: fall back to a copy
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+    shutil.copy2(src, dst, follow_symlinks=False)
+    return True
+
+
+def _clear_parents(project_dir: pathlib.Path, rel: str):
+    """
+    Make every parent of `rel` a real directory or absent: files and
+    symlinks in the way (the snapshot has a directory there) are removed,
+    so nothing is ever written through a link.
+    """
+    for parent in reversed(pathlib.PurePosixPath(rel).parents[:-1]):
+        path = project_dir / parent
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISDIR(st.st_mode):
+            path.unlink()
+            return
+
+
+def _lstat_mode(path: pathlib.Path) -> int:
+    try:
+        return os.lstat(path).st_mode
+    except FileNotFoundError:
+        return 0
+
+
+def _tmp_sibling(path: pathlib.Path) -> pathlib.Path:
+    return path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+
+
+class SnapshotStore:
+    """
+    Hardlink snapshot trees, one directory per project.
+    """
+
+    def __init__(self, root: pathlib.Path, auto_keep: int = AUTO_SNAPSHOT_KEEP):
+        self.root = root
+        self.auto_keep = auto_keep
+        self._prune_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _project_dir(self, project_name: str) -> pathlib.Path:
+        return self.root / project_name
+
+    def _snapshot_dir(self, project_name: str, snapshot_id: str) -> pathlib.Path:
+        path = self._project_dir(project_name) / snapshot_id
+
+        if not _SNAPSHOT_ID.fullmatch(snapshot_id) or not path.is_dir():
+            raise SnapshotNotFound(snapshot_id)
+
+        return path
+
+    @staticmethod
+    def _files(root: pathlib.Path, ignore: Optional[IgnoreRules]) -> Dict[str, pathlib.Path]:
+        return {
+            entry.path: root / entry.path
+            for entry in iter_tree(root, root, ignore=ignore)
+        }
+
+    # ------------------------------------------------------------------
+    # Create / Read / Delete
+    # ------------------------------------------------------------------
+
+    def create(
+        self,
+        project_dir: str | pathlib.Path,
+        label: Optional[str] = None,
+        auto: bool = False,
+        link: bool = True,
+    ) -> SnapshotInfo:
+        project_dir = pathlib.Path(project_dir).resolve()
+        base = self._project_dir(project_dir.name)
+        base.mkdir(parents=True, exist_ok=True)
+
+        now = datetime.now(timezone.utc)
+        snapshot_id = f"{now.strftime('%Y%m%dT%H%M%S%f')}-{secrets.token_hex(2)}"
+
+        tmp = base / f".tmp-{snapshot_id}"
+        tree = tmp / "tree"
+        tree.mkdir(parents=True)
+
+        files = size = 0
+        ignore = IgnoreRules.for_project(project_dir)
+
+        try:
+            for entry in iter_tree(project_dir, project_dir, ignore=ignore, include_dirs=True):
+                src = project_dir / entry.path
+                dst = tree / entry.path
+
+                if entry.type == "dir":
+                    dst.mkdir(exist_ok=True)
+                    continue
+
+                try:
+                    if _link_or_copy(src, dst, link):
+                        size += os.lstat(dst).st_size
+                        files += 1
+                except FileNotFoundError:
+                    continue  # removed while snapshotting
+
+            info = SnapshotInfo(
+                id=snapshot_id,
+                label=label,
+                auto=auto,
+                created_at=now.isoformat(),
+                files=files,
+                bytes=size,
+            )
+            atomic_write_text(tmp / "meta.json", json.dumps(asdict(info)))
+            os.rename(tmp, base / snapshot_id)
+
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        if auto:
+            self._prune(project_dir.name)
+
+        return info
+
+    def _read_info(self, path: pathlib.Path) -> SnapshotInfo:
+        with open(path / "meta.json", encoding="utf-8") as f:
+            return SnapshotInfo(**json.load(f))
+
+    def list(self, project_name: str) -> List[SnapshotInfo]:
+        """Snapshots of a project, newest first."""
+        base = self._project_dir(project_name)
+        if not base.is_dir():
+            return []
+
+        infos = []
+        for path in base.iterdir():
+            if _SNAPSHOT_ID.fullmatch(path.name):
+                try:
+                    infos.append(self._read_info(path))
+                except (OSError, ValueError, TypeError):
+                    continue
+
+        return sorted(infos, key=lambda info: info.id, reverse=True)
+
+    def get(self, project_name: str, snapshot_id: str) -> SnapshotInfo:
+        return self._read_info(self._snapshot_dir(project_name, snapshot_id))
+
+    def unique_bytes(self, project_name: str, snapshot_id: str) -> int:
+        """
+        Bytes held only by this snapshot (files no other snapshot or
+        the live tree links to), i.e. what deleting it frees.
+        """
+        tree = self._snapshot_dir(project_name, snapshot_id) / "tree"
+        total = 0
+
+        for path in self._files(tree, None).values():
+            st = os.lstat(path)
+            if stat.S_ISREG(st.st_mode) and st.st_nlink == 1:
+                total += st.st_size
+
+        return total
+
+    def delete(self, project_name: str, snapshot_id: str):
+        move_to_trash(self._snapshot_dir(project_name, snapshot_id))
+
+    def delete_all(self, project_name: str):
+        base = self._project_dir(project_name)
+        if base.is_dir():
+            move_to_trash(base)
+
+    def _prune(self, project_name: str):
+        with self._prune_lock:
+            autos = [info for info in self.list(project_name) if info.auto]
+            for info in autos[self.auto_keep:]:
+                try:
+                    move_to_trash(self._project_dir(project_name) / info.id)
+                except FileNotFoundError:
+                    continue
+
+    # ------------------------------------------------------------------
+    # Diff / Restore
+    # ------------------------------------------------------------------
+
+    def _tree_files(
+        self,
+        project_dir: pathlib.Path,
+        snapshot_id: Optional[str],
+    ) -> Dict[str, pathlib.Path]:
+        """Files of a snapshot, or of the live project when id is None."""
+        if snapshot_id is None:
+            return self._files(project_dir, IgnoreRules.for_project(project_dir))
+
+        tree = self._snapshot_dir(project_dir.name, snapshot_id) / "tree"
+        return self._files(tree, None)
+
+    def diff(
+        self,
+        project_dir: str | pathlib.Path,
+        from_id: str,
+        to_id: Optional[str] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Compare two snapshots (or a snapshot and the live tree when
+        `to_id` is None). Shared inodes are equal without reading them.
+        """
+        project_dir = pathlib.Path(project_dir).resolve()
+        old = self._tree_files(project_dir, from_id)
+        new = self._tree_files(project_dir, to_id)
+
+        modified = []
+        for rel in sorted(old.keys() & new.keys()):
+            a, b = os.stat(old[rel]), os.stat(new[rel])
+            if (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino):
+                continue
+            if a.st_size != b.st_size or not filecmp.cmp(old[rel], new[rel], shallow=False):
+                modified.append(rel)
+
+        return {
+            "added": sorted(new.keys() - old.keys()),
+            "removed": sorted(old.keys() - new.keys()),
+            "modified": modified,
+        }
+
+    def restore(
+        self,
+        project_dir: str | pathlib.Path,
+        snapshot_id: str,
+        link: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Make the live tree match a snapshot, in place (the directory
+        itself is kept, so container bind mounts and watchers stay valid).
+        Every file is replaced by rename; ignored paths are not touched.
+
+        Files absent from the snapshot are deleted first, so paths that
+        changed between file and directory are free before any snapshot
+        file is written.
+        """
+        project_dir = pathlib.Path(project_dir).resolve()
+        snapshot = self._tree_files(project_dir, snapshot_id)
+        live = self._tree_files(project_dir, None)
+
+        written = deleted = 0
+
+        for rel in live.keys() - snapshot.keys():
+            try:
+                (project_dir / rel).unlink()
+                deleted += 1
+            except FileNotFoundError:
+                pass
+
+        # Directories emptied by the restore and absent from the snapshot
+        snapshot_dirs = {
+            parent.as_posix()
+            for rel in snapshot
+            for parent in pathlib.PurePosixPath(rel).parents
+        }
+        for rel in sorted(live.keys() - snapshot.keys(), reverse=True):
+            for parent in pathlib.PurePosixPath(rel).parents:
+                if parent.as_posix() in snapshot_dirs:
+                    break
+                try:
+                    (project_dir / parent).rmdir()
+                except OSError:
+                    break
+
+        for rel, src in snapshot.items():
+            target = project_dir / rel
+
+            if rel in live:
+                a, b = os.lstat(src), os.lstat(live[rel])
+                if (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino):
+                    continue
+
+            _clear_parents(project_dir, rel)
+            if stat.S_ISDIR(_lstat_mode(target)):
+                shutil.rmtree(target)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _tmp_sibling(target)
+            if _link_or_copy(src, tmp, link):
+                os.replace(tmp, target)
+                written += 1
+
+        return {"written": written, "deleted": deleted}
+
+
+# Singleton instance used across the application
+snapshot_store = SnapshotStore(root=GENERATED_PROJECTS_ROOT / ".snapshots")
@@ -0,0 +1,310 @@
+import io
+import os
+import pathlib
+import posixpath
+import shutil
+import stat
+import tarfile
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from agent_v1.tools.listing import BATCH_STAGING_PREFIX, IgnoreRules, iter_tree
+from agent_v1.tools.utils import ProjectFS, api_safe_path_for_project
+
+# -------------------------------------------------------------------
+# Project Archives (API)
+# -------------------------------------------------------------------
+# zip and tar.gz only: both are in the standard library (zstd is not
+# available on the Python versions we support).
+
+ARCHIVE_FORMATS = {
+    "zip": "application/zip",
+    "tar.gz": "application/gzip",
+}
+
+CHUNK_SIZE = 256 * 1024
+
+# Sizes above this need zip64 headers, which must be chosen up front
+# when streaming
+_ZIP64_LIMIT = (1 << 31) - 1
+
+
+class _StreamWriter(io.RawIOBase):
+    """
+    Unseekable sink handing every write to `emit`. zipfile and tarfile
+    both switch to their streaming modes on an unseekable file.
+    """
+
+    def __init__(self, emit: Callable[[bytes], None]):
+        self._emit = emit
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if b:
+            self._emit(bytes(b))
+        return len(b)
+
+
+def _open_regular(path: pathlib.Path):
+    """
+    Open a regular file for reading without following symlinks; None
+    for links, special files and paths removed meanwhile.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    except OSError:
+        return None  # ELOOP for a symlink, or gone
+
+    src = os.fdopen(fd, "rb")
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        src.close()
+        return None
+    return src
+
+
+def api_export_archive(
+    fs: ProjectFS,
+    fmt: str,
+    emit: Callable[[bytes], None],
+    include_ignored: bool = False,
+) -> int:
+    """
+    Write an archive of the project tree to `emit` in CHUNK_SIZE pieces,
+    without temp files. Ignore rules apply unless `include_ignored`.
+    Only regular files and directories are exported; symlinks are
+    skipped and never read through. Returns the number of files written.
+    """
+    root = fs.root
+    ignore = None if include_ignored else IgnoreRules.for_project(root)
+    entries = iter_tree(root, root, ignore=ignore, include_dirs=True)
+
+    out = io.BufferedWriter(_StreamWriter(emit), buffer_size=CHUNK_SIZE)
+    count = 0
+
+    if fmt == "zip":
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for entry in entries:
+                path = root / entry.path
+
+                if entry.type == "dir":
+                    zf.writestr(zipfile.ZipInfo(entry.path + "/"), b"")
+                    continue
+
+                src = _open_regular(path)
+                if src is None:
+                    continue  # removed while exporting, or not a regular file
+
+                st = os.fstat(src.fileno())
+                info = zipfile.ZipInfo(entry.path, time.localtime(st.st_mtime)[:6])
+                info.external_attr = (st.st_mode & 0xFFFF) << 16
+                info.file_size = st.st_size
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with src, zf.open(info, "w", force_zip64=info.file_size > _ZIP64_LIMIT) as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                count += 1
+
+    elif fmt == "tar.gz":
+        with tarfile.open(fileobj=out, mode="w|gz") as tar:
+            for entry in entries:
+                path = root / entry.path
+
+                if entry.type == "dir":
+                    try:
+                        tar.addfile(tar.gettarinfo(path, entry.path))
+                    except FileNotFoundError:
+                        pass  # removed while exporting
+                    continue
+
+                src = _open_regular(path)
+                if src is None:
+                    continue  # removed while exporting, or not a regular file
+
+                with src:
+                    tar.addfile(tar.gettarinfo(arcname=entry.path, fileobj=src), src)
+                count += 1
+
+    else:
+        raise ValueError(f"Unsupported archive format: {fmt}")
+
+    out.flush()
+    return count
+
+
+# -------------------------------------------------------------------
+# Import
+# -------------------------------------------------------------------
+
+def make_staging_dir(fs: ProjectFS) -> pathlib.Path:
+    """Temporary directory under the project root (same filesystem)."""
+    return pathlib.Path(tempfile.mkdtemp(prefix=BATCH_STAGING_PREFIX, dir=fs.root))
+
+
+def _member_path(name: str) -> str:
+    """Normalize an archive member name, rejecting traversal attempts."""
+    rel = posixpath.normpath(name.replace("\\", "/"))
+
+    if (
+        posixpath.isabs(rel)
+        or rel == ".."
+        or rel.startswith("../")
+        or (len(rel) > 1 and rel[1] == ":")
+    ):
+        raise ValueError(f"Unsafe path in archive: {name}")
+
+    return rel
+
+
+class _Limits:
+    def __init__(self, max_files: int, max_bytes: int):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.files = 0
+        self.bytes = 0
+
+    def add_file(self):
+        self.files += 1
+        if self.files > self.max_files:
+            raise ValueError(f"Archive has more than {self.max_files} files")
+
+    def copy(self, src, dst):
+        """Copy counting real bytes (member headers can lie)."""
+        while chunk := src.read(CHUNK_SIZE):
+            self.bytes += len(chunk)
+            if self.bytes > self.max_bytes:
+                raise ValueError(
+                    f"Archive unpacks to more than {self.max_bytes} bytes"
+                )
+            dst.write(chunk)
+
+
+def _iter_members(archive: pathlib.Path, fmt: str):
+    """Yield (name, kind, open_fn) with kind in file | dir | other."""
+    if fmt == "zip":
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                kind = "dir" if info.is_dir() else "file"
+                yield info.filename, kind, lambda info=info: zf.open(info)
+
+    elif fmt == "tar.gz":
+        with tarfile.open(archive, mode="r|gz") as tar:
+            for info in tar:
+                kind = "file" if info.isreg() else "dir" if info.isdir() else "other"
+                yield info.name, kind, lambda info=info: tar.extractfile(info)
+
+    else:
+        raise ValueError(f"Unsupported archive format: {fmt}")
+
+
+def _check_conflicts(fs: ProjectFS, dirs: List[str], files: List[str]):
+    """
+    Raise ValueError when a member would replace a directory with a file
+    or need a directory where the project has a file (checked before
+    anything is moved, so a conflicting import changes nothing).
+    """
+    root = fs.root
+    checked: Dict[pathlib.Path, bool] = {}
+
+    def is_dir(path: pathlib.Path) -> Optional[bool]:
+        """True / False for an existing dir / non-dir, None when absent."""
+        if path not in checked:
+            try:
+                checked[path] = stat.S_ISDIR(os.lstat(path).st_mode)
+            except FileNotFoundError:
+                checked[path] = None
+        return checked[path]
+
+    def check_parents(rel: str, target: pathlib.Path):
+        for parent in target.relative_to(root).parents:
+            if is_dir(root / parent) is False:
+                raise ValueError(f"Cannot import {rel}: {parent} is a file in the project")
+
+    for rel in dirs:
+        target = api_safe_path_for_project(fs, rel)
+        check_parents(rel, target)
+        if is_dir(target) is False:
+            raise ValueError(f"Cannot import directory {rel}: a file exists at that path")
+
+    for rel in files:
+        target = api_safe_path_for_project(fs, rel)
+        check_parents(rel, target)
+        if is_dir(target):
+            raise ValueError(f"Cannot import file {rel}: a directory exists at that path")
+
+
+def api_import_archive(
+    fs: ProjectFS,
+    archive: pathlib.Path,
+    fmt: str,
+    staging: pathlib.Path,
+    max_files: int,
+    max_bytes: int,
+) -> Dict[str, Any]:
+    """
+    Unpack an uploaded archive into the project.
+
+    Members are validated (no absolute or `..` paths, project-root
+    checks via `api_safe_path_for_project`, file/size limits) and
+    extracted into `staging` first; only a fully valid archive without
+    file / directory conflicts with the project is then moved into
+    place, file by file with rename. Links and special files are
+    skipped. Raises ValueError on an invalid or conflicting archive
+    (nothing applied).
+    """
+    limits = _Limits(max_files, max_bytes)
+    files: List[str] = []
+    dirs: List[str] = []
+    skipped: List[str] = []
+
+    try:
+        for name, kind, open_member in _iter_members(archive, fmt):
+            rel = _member_path(name)
+            if rel == ".":
+                continue
+
+            # Must stay inside the project once placed
+            api_safe_path_for_project(fs, rel)
+
+            if kind == "other":
+                skipped.append(rel)
+                continue
+
+            staged = staging / "tree" / rel
+
+            try:
+                if kind == "dir":
+                    staged.mkdir(parents=True, exist_ok=True)
+                    dirs.append(rel)
+                    continue
+
+                limits.add_file()
+                staged.parent.mkdir(parents=True, exist_ok=True)
+                with open_member() as src, open(staged, "wb") as dst:
+                    limits.copy(src, dst)
+                files.append(rel)
+
+            except (FileExistsError, NotADirectoryError, IsADirectoryError):
+                raise ValueError(f"Conflicting paths in archive: {rel}")
+
+    except (zipfile.BadZipFile, tarfile.TarError, zlib.error, EOFError) as e:
+        raise ValueError(f"Invalid {fmt} archive: {e}")
+
+    _check_conflicts(fs, dirs, files)
+
+    for rel in dirs:
+        api_safe_path_for_project(fs, rel).mkdir(parents=True, exist_ok=True)
+
+    for rel in dict.fromkeys(files):
+        target = api_safe_path_for_project(fs, rel)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staging / "tree" / rel, target)
+
+    return {
+        "files": len(set(files)),
+        "dirs": len(set(dirs)),
+        "skipped": skipped,
+    }
@@ -0,0 +1,120 @@
+import os
+import pathlib
+import secrets
+import stat
+from typing import Literal, Optional
+
+# -------------------------------------------------------------------
+# Atomic Writes
+# -------------------------------------------------------------------
+# Project files are bind-mounted into running containers, often with a
+# reloader (uvicorn/flask --reload, nodemon) watching them. Writing in
+# place exposes truncated files and fires one reload per write; instead
+# content goes to a temp file in the same directory and is renamed over
+# the target, and writes that would not change anything are skipped.
+#
+# fsync policy:
+#   none - rely on the page cache (fastest, may lose recent writes on crash)
+#   file - fsync the temp file before the rename (never torn, default)
+#   full - also fsync the directory so the rename itself is durable
+
+FsyncPolicy = Literal["none", "file", "full"]
+
+DEFAULT_FSYNC_POLICY: FsyncPolicy = "file"
+
+
+def same_content(path: pathlib.Path, data: bytes) -> bool:
+    """True when `path` is a regular file holding exactly `data`."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+
+    if not stat.S_ISREG(st.st_mode) or st.st_size != len(data):
+        return False
+
+    with open(path, "rb") as f:
+        return f.read() == data
+
+
+def write_temp(
+    tmp: pathlib.Path,
+    data: bytes,
+    mode: Optional[int] = None,
+    fsync_policy: FsyncPolicy = DEFAULT_FSYNC_POLICY,
+) -> None:
+    """
+    Create `tmp` exclusively and write `data` to it. Without an explicit
+    `mode` the file gets the usual 0o666 & ~umask.
+    """
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+        if mode is not None:
+            os.fchmod(f.fileno(), mode)
+        if fsync_policy != "none":
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def fsync_dir(path: pathlib.Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def existing_mode(path: pathlib.Path) -> Optional[int]:
+    """
+    Mode for the file replacing an existing regular file: its permission
+    bits, made read/write for everyone.
+
+    The replacement is a new inode owned by this process, not by the
+    container user who may have created the original; in-place writes
+    used to chmod existing files to 0o666 for the same reason. Execute
+    bits are kept.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return stat.S_IMODE(st.st_mode) | 0o666
+
+
+def atomic_write_text(
+    path: pathlib.Path,
+    content: str,
+    fsync_policy: FsyncPolicy = DEFAULT_FSYNC_POLICY,
+) -> bool:
+    """
+    Replace `path` with `content` (UTF-8) atomically.
+
+    Returns False when the file already held this exact content and
+    nothing was written (no mtime bump, no reload in the container).
+    """
+    data = content.encode("utf-8")
+
+    if same_content(path, data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+
+    try:
+        write_temp(tmp, data, existing_mode(path), fsync_policy)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync_policy == "full":
+        fsync_dir(path.parent)
+
+    return True
@@ -1,20 +1,45 @@
 import pathlib
 import subprocess
-from typing import Tuple, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Tuple, Optional
 
 from langchain.tools import tool
 
-# Project Root Configuration
-_PROJECT_ROOT : Optional[pathlib.Path] = None
+from agent_v1.tools.atomic_io import atomic_write_text
+from agent_v1.tools.listing import IgnoreRules, iter_tree
 
-def set_project_root(path: str):
-    global _PROJECT_ROOT
-    _PROJECT_ROOT = pathlib.Path(path).resolve()
+# Project Root Configuration
+# Run-scoped: each agent run (and every thread it fans out to with a
+# copied context) sees its own root, so concurrent generations in one
+# process never write into each other's projects.
+_PROJECT_ROOT: ContextVar[Optional[pathlib.Path]] = ContextVar(
+    "agent_project_root",
+    default=None,
+)
+
+def set_project_root(path: str) -> Token:
+    return _PROJECT_ROOT.set(pathlib.Path(path).resolve())
+
+def reset_project_root(token: Token) -> None:
+    _PROJECT_ROOT.reset(token)
+
+@contextmanager
+def project_root_context(path: str) -> Iterator[pathlib.Path]:
+    """
+    Binds the tool project root for the duration of the block.
+    """
+    token = set_project_root(path)
+    try:
+        yield get_project_root()
+    finally:
+        reset_project_root(token)
 
 def get_project_root() -> pathlib.Path:
-    if _PROJECT_ROOT is None:
+    root = _PROJECT_ROOT.get()
+    if root is None:
         raise RuntimeError("Project root not initialized")
-    return _PROJECT_ROOT
+    return root
 
 # Path Safety Utilities
 def safe_path_for_project(path: str) -> pathlib.Path:
@@ -37,10 +62,9 @@ def write_file(path: str, content: str) -> str:
     Overwrites existing content.
     """
     p = safe_path_for_project(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(p, "w", encoding="utf-8") as f:
-        f.write(content)
+    if not atomic_write_text(p, content):
+        return f"UNCHANGED: {p.relative_to(get_project_root())}"
 
     return f"WROTE: {p.relative_to(get_project_root())}"
 
@@ -65,6 +89,7 @@ def read_file(path: str) -> str:
 def list_files(directory: str = ".") -> str:
     """
     Recursively lists all files within a directory in the project root.
+    Dependency, cache and VCS directories (and .gitignore matches) are skipped.
     """
     p = safe_path_for_project(directory)
 
@@ -74,11 +99,11 @@ def list_files(directory: str = ".") -> str:
     if not p.is_dir():
         return f"ERROR: {directory} is not a directory"
 
-    files = sorted(
-        str(f.relative_to(get_project_root()))
-        for f in p.glob("**/*")
-        if f.is_file()
-    )
+    root = get_project_root()
+    files = [
+        entry.path
+        for entry in iter_tree(root, p, ignore=IgnoreRules.for_project(root))
+    ]
 
     return "\n".join(files) if files else "No files found"
 
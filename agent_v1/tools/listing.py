@@ -0,0 +1,279 @@
+import os
+import pathlib
+import posixpath
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+# -------------------------------------------------------------------
+# Ignore Rules
+# -------------------------------------------------------------------
+
+# Temporary directory used by batch file operations while staging writes
+BATCH_STAGING_PREFIX = ".staging-"
+
+# Directories and files created inside /workspace by tooling
+# (pip, npm, pytest, editors, our own batch staging) that are never
+# useful in a file tree.
+DEFAULT_IGNORE_PATTERNS = [
+    f"/{BATCH_STAGING_PREFIX}*/",
+    ".git/",
+    ".venv/",
+    "venv/",
+    "node_modules/",
+    "__pycache__/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".tox/",
+    "*.egg-info/",
+    "*.py[cod]",
+    ".DS_Store",
+]
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate a gitignore glob into a regex matched against a relative path.
+    """
+    out = []
+    i = 0
+
+    while i < len(pattern):
+        c = pattern[i]
+
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+
+    return "".join(out)
+
+
+class IgnoreRules:
+    """
+    Gitignore-style path matcher.
+
+    Supported syntax: comments, `!` negation, trailing `/` (directories
+    only), leading or inner `/` (anchored to the root), `*`, `?`,
+    `[...]` and `**`. Later rules override earlier ones, as in git.
+    Only the project's top-level .gitignore is read.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self._rules: List[Tuple[re.Pattern, bool, bool]] = []
+
+        for raw in patterns:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            anchored = "/" in line
+            line = line.lstrip("/")
+
+            regex = _translate(line)
+            if not anchored:
+                regex = f"(?:.*/)?{regex}"
+
+            self._rules.append((re.compile(f"^{regex}$"), negate, dir_only))
+
+    @classmethod
+    def for_project(
+        cls,
+        root: pathlib.Path,
+        use_gitignore: bool = True,
+    ) -> "IgnoreRules":
+        patterns = list(DEFAULT_IGNORE_PATTERNS)
+
+        gitignore = root / ".gitignore"
+        if use_gitignore and gitignore.is_file():
+            try:
+                patterns += gitignore.read_text(
+                    encoding="utf-8",
+                    errors="ignore",
+                ).splitlines()
+            except OSError:
+                pass
+
+        return cls(patterns)
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                ignored = not negate
+
+        return ignored
+
+    def is_ignored_path(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Like `is_ignored`, but also true when any parent directory is
+        ignored (the walker prunes those, single-path lookups cannot).
+        """
+        parts = path_parts(rel_path)
+
+        for i in range(1, len(parts)):
+            if self.is_ignored("/".join(parts[:i]), True):
+                return True
+
+        return bool(parts) and self.is_ignored("/".join(parts), is_dir)
+
+
+# -------------------------------------------------------------------
+# Directory Walker
+# -------------------------------------------------------------------
+
+@dataclass(slots=True)
+class WalkEntry:
+    path: str
+    type: str
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+
+
+def normalize_rel_path(path: str) -> str:
+    """
+    Normalize a client supplied relative path without touching the disk
+    ("" for the root). Raises ValueError for paths leaving the root.
+    """
+    rel = posixpath.normpath(path.replace("\\", "/") or ".")
+
+    if posixpath.isabs(rel) or rel == ".." or rel.startswith("../"):
+        raise ValueError("Attempt to access outside project root")
+
+    return "" if rel == "." else rel
+
+
+def path_parts(path: str) -> Tuple[str, ...]:
+    """
+    Split a relative path into components. Tuples of components sort
+    in walk order (a directory right before its children).
+    """
+    return tuple(p for p in path.split("/") if p and p != ".")
+
+
+def iter_tree(
+    root: pathlib.Path,
+    directory: pathlib.Path,
+    ignore: Optional[IgnoreRules] = None,
+    max_depth: Optional[int] = None,
+    include_dirs: bool = False,
+    with_metadata: bool = False,
+    after: Optional[str] = None,
+) -> Iterator[WalkEntry]:
+    """
+    Walk `directory` with os.scandir, yielding entries in a stable order.
+
+    - Children are visited sorted by name, depth-first, so the output is
+      ordered by path components and can be resumed with `after`
+    - Ignored directories are pruned without being scanned
+    - Symlinks (to files or directories) are skipped, never followed:
+      links created inside a container may point anywhere on the host
+    - Paths are relative to `root`, using "/" separators
+    """
+    after_parts = path_parts(after) if after else None
+    prefix = "" if directory == root else str(directory.relative_to(root)) + "/"
+
+    def walk(path: str, rel: str, depth: int) -> Iterator[WalkEntry]:
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return
+
+        for entry in entries:
+            rel_path = rel + entry.name
+
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if not is_dir and not is_file:
+                continue
+
+            if ignore and ignore.is_ignored(rel_path, is_dir):
+                continue
+
+            if after_parts is not None:
+                parts = path_parts(rel_path)
+                emit = parts > after_parts
+                descend = emit or after_parts[:len(parts)] == parts
+            else:
+                emit = descend = True
+
+            if emit and (is_file or include_dirs):
+                item = WalkEntry(path=rel_path, type="file" if is_file else "dir")
+
+                if with_metadata:
+                    try:
+                        st = entry.stat()
+                        item.size = st.st_size if is_file else None
+                        item.mtime = st.st_mtime
+                    except OSError:
+                        pass
+
+                yield item
+
+            if is_dir and descend and (max_depth is None or depth < max_depth):
+                yield from walk(entry.path, rel_path + "/", depth + 1)
+
+    yield from walk(str(directory), prefix, 1)
+
+
+def list_tree(
+    root: pathlib.Path,
+    directory: pathlib.Path,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    **options,
+) -> Tuple[List[WalkEntry], Optional[str]]:
+    """
+    Return one page of `iter_tree` and the cursor for the next page
+    (None when the listing is complete).
+    """
+    items: List[WalkEntry] = []
+
+    for item in iter_tree(root, directory, after=cursor, **options):
+        if limit is not None and len(items) >= limit:
+            return items, items[-1].path
+        items.append(item)
+
+    return items, None
@@ -0,0 +1,349 @@
+import os
+import pathlib
+import re
+import stat
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from agent_v1.tools.listing import IgnoreRules, iter_tree
+
+# -------------------------------------------------------------------
+# Trigrams
+# -------------------------------------------------------------------
+# Text is casefolded before extracting trigrams, so one index serves
+# case-sensitive and case-insensitive searches alike: casefolding maps
+# characters independently, a substring of the text stays a substring
+# of the folded text.
+
+# Files above this size or containing NUL bytes are not indexed
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+
+# Bytes inspected to detect binary files
+_BINARY_SNIFF = 8192
+
+# Length of returned line excerpts
+MAX_LINE_CHARS = 500
+
+
+def trigrams(text: str) -> Set[str]:
+    text = text.casefold()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def regular_file(root: pathlib.Path, rel: str) -> Optional[os.stat_result]:
+    """
+    lstat of `root/rel` when it is a regular file reached without
+    symlinks (links made in the container may point anywhere on the
+    host), None otherwise. `root` must be resolved.
+    """
+    path = root / rel
+
+    try:
+        st = path.lstat()
+    except OSError:
+        return None
+
+    if not stat.S_ISREG(st.st_mode):
+        return None
+
+    parent = os.path.realpath(path.parent)
+    if parent != str(root) and not parent.startswith(str(root) + os.sep):
+        return None  # reached through a symlinked directory
+
+    return st
+
+
+def read_text(path: pathlib.Path, max_bytes: int) -> Optional[str]:
+    """
+    Content of a searchable text file, None for binary / large /
+    unreadable files and symlinks (never read through).
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    except OSError:
+        return None
+
+    with os.fdopen(fd, "rb") as f:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+        try:
+            data = f.read(max_bytes + 1)
+        except OSError:
+            return None
+
+    if len(data) > max_bytes or b"\0" in data[:_BINARY_SNIFF]:
+        return None
+
+    return data.decode("utf-8", errors="replace")
+
+
+# -------------------------------------------------------------------
+# Regex literals
+# -------------------------------------------------------------------
+
+# Escapes that stand for a single literal character
+_ESCAPE_LITERALS = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v"}
+
+# Inline flags, global `(?x)` or scoped `(?i:...)`: under `x` spaces and
+# `#` are not literals, so literal extraction cannot be trusted
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux-]+[:)]")
+
+# Quantifiers that repeat more than once
+_REPEAT = re.compile(r"[*+]|\{\d*,?\d*\}")
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Index right after the character class starting at `pattern[i]`."""
+    i += 2 if pattern.startswith("[^", i) else 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def nested_quantifier(pattern: str) -> bool:
+    """
+    True when a repeated group itself contains a repetition, like
+    `(a+)+` or `(x*y)*`: the shape behind catastrophic backtracking.
+    Python's `re` cannot be interrupted, so such patterns are refused.
+    """
+    # Per open group: does it contain a repetition
+    stack = [False]
+    i = 0
+
+    while i < len(pattern):
+        c = pattern[i]
+
+        if c == "\\":
+            i += 2
+        elif c == "[":
+            i = _skip_class(pattern, i)
+        elif c == "(":
+            stack.append(False)
+            i += 1
+        elif c == ")" and len(stack) > 1:
+            inner = stack.pop()
+            i += 1
+            repeat = _REPEAT.match(pattern, i)
+            if repeat:
+                if inner:
+                    return True
+                i = repeat.end()
+            stack[-1] = stack[-1] or inner or bool(repeat)
+        else:
+            repeat = _REPEAT.match(pattern, i)
+            if repeat:
+                stack[-1] = True
+                i = repeat.end()
+            else:
+                i += 1
+
+    return False
+
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Literal strings every match of `pattern` must contain, as far as a
+    conservative scan can tell ([] when nothing can be relied upon).
+
+    Only runs outside groups and classes count, a quantifier drops the
+    character it applies to, and a top-level `|` gives up entirely.
+    """
+    runs: List[str] = []
+    run: List[str] = []
+    depth = 0
+    i = 0
+
+    def flush():
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    while i < len(pattern):
+        c = pattern[i]
+
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            i += 2
+            if depth:
+                continue
+            if nxt.isalnum() and nxt not in _ESCAPE_LITERALS:
+                flush()  # class (\d, \w, ...), anchor (\b) or backreference
+            else:
+                run.append(_ESCAPE_LITERALS.get(nxt, nxt))
+            continue
+
+        if c == "[":
+            # Skip the class; "]" right after "[" or "[^" is literal
+            i = _skip_class(pattern, i)
+            if not depth:
+                flush()
+            continue
+
+        i += 1
+
+        if c == "(":
+            depth += 1
+            flush()
+        elif c == ")":
+            depth = max(0, depth - 1)
+        elif depth:
+            continue
+        elif c == "|":
+            return []
+        elif c in "*?{":
+            # The preceding character is optional or repeated
+            if run:
+                run.pop()
+            flush()
+            if c == "{":
+                end = pattern.find("}", i)
+                i = len(pattern) if end == -1 else end + 1
+        elif c == "+":
+            flush()
+        elif c in ".^$":
+            flush()
+        else:
+            run.append(c)
+
+    flush()
+    return runs
+
+
+def query_trigrams(query: str, regex: bool) -> Optional[Set[str]]:
+    """
+    Trigrams every matching file contains; None when the query is too
+    short or too loose to prune anything.
+    """
+    if regex and _INLINE_FLAGS.search(query):
+        return None
+
+    literals = required_literals(query) if regex else [query]
+    grams: Set[str] = set()
+
+    for literal in literals:
+        grams |= trigrams(literal)
+
+    return grams or None
+
+
+# -------------------------------------------------------------------
+# Indexing / Matching
+# -------------------------------------------------------------------
+
+@dataclass(slots=True)
+class IndexedFile:
+    path: str
+    mtime_ns: int
+    size: int
+    grams: Set[str] = field(default_factory=set)
+
+
+def index_file(
+    root: pathlib.Path,
+    rel: str,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> Optional[IndexedFile]:
+    st = regular_file(root, rel)
+    if st is None or st.st_size > max_bytes:
+        return None
+
+    text = read_text(root / rel, max_bytes)
+    if text is None:
+        return None
+
+    return IndexedFile(
+        path=rel,
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+        grams=trigrams(text),
+    )
+
+
+def index_tree(
+    root: pathlib.Path,
+    directory: pathlib.Path,
+    ignore: IgnoreRules,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> List[IndexedFile]:
+    indexed = []
+
+    for entry in iter_tree(root, directory, ignore=ignore):
+        doc = index_file(root, entry.path, max_bytes)
+        if doc is not None:
+            indexed.append(doc)
+
+    return indexed
+
+
+def _excerpt(line: str) -> str:
+    return line[:MAX_LINE_CHARS]
+
+
+def search_files(
+    root: pathlib.Path,
+    paths: Iterable[str],
+    rx: re.Pattern,
+    limit: int,
+    context: int = 0,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Dict], int, bool]:
+    """
+    Scan candidate files for `rx`, in the given order, stopping at
+    `deadline` (time.monotonic()) between files.
+
+    Returns (matches, files_searched, truncated); each match has path,
+    1-based line and column, the line text and `context` lines around it.
+    `truncated` is also set when the deadline cut the scan short.
+    """
+    matches: List[Dict] = []
+    searched = 0
+
+    for rel in paths:
+        if deadline is not None and time.monotonic() > deadline:
+            return matches, searched, True
+
+        if regular_file(root, rel) is None:
+            continue  # removed or replaced by a link since indexed
+
+        text = read_text(root / rel, max_bytes)
+        if text is None:
+            continue  # removed or changed into a binary since indexed
+
+        searched += 1
+        first = rx.search(text)
+        if first is None:
+            continue
+
+        lines = text.split("\n")
+        starts = [0]
+        for line in lines:
+            starts.append(starts[-1] + len(line) + 1)
+        lines = [line.rstrip("\r") for line in lines]
+        if text.endswith("\n"):
+            lines.pop()
+
+        last_line = -1
+        for m in rx.finditer(text, first.start()):
+            n = bisect_right(starts, m.start()) - 1
+            if n == last_line or n >= len(lines):
+                continue  # one result per line (or past the final newline)
+            last_line = n
+
+            if len(matches) >= limit:
+                return matches, searched, True
+
+            matches.append({
+                "path": rel,
+                "line": n + 1,
+                "column": m.start() - starts[n] + 1,
+                "text": _excerpt(lines[n]),
+                "before": [_excerpt(l) for l in lines[max(0, n - context):n]],
+                "after": [_excerpt(l) for l in lines[n + 1:n + 1 + context]],
+            })
+
+    return matches, searched, False
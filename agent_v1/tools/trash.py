@@ -0,0 +1,60 @@
+import errno
+import os
+import pathlib
+import shutil
+import uuid
+from typing import List
+
+from agent_v1.tools.project_root import GENERATED_PROJECTS_ROOT
+
+# -------------------------------------------------------------------
+# Trash
+# -------------------------------------------------------------------
+# Deleting a tree (a project with a populated .venv, a snapshot) can
+# take seconds. Instead, the tree is renamed into the trash, which is
+# instant and atomic, and reclaimed later by a background reaper.
+# The trash lives next to the projects so the rename never crosses
+# filesystems.
+
+TRASH_ROOT = GENERATED_PROJECTS_ROOT / ".trash"
+
+
+def move_to_trash(path: pathlib.Path) -> bool:
+    """
+    Atomically move a file or directory out of the way.
+
+    Returns True when it went to the trash (reclaim pending). If the
+    trash is on another filesystem, the tree is deleted right away
+    instead and False is returned.
+    """
+    TRASH_ROOT.mkdir(parents=True, exist_ok=True)
+    target = TRASH_ROOT / f"{uuid.uuid4().hex}-{path.name}"
+
+    try:
+        os.rename(path, target)
+        return True
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+    return False
+
+
+def trash_entries() -> List[pathlib.Path]:
+    if not TRASH_ROOT.is_dir():
+        return []
+    return list(TRASH_ROOT.iterdir())
+
+
+def reclaim(entry: pathlib.Path) -> bool:
+    """Delete one trash entry. Returns False if anything was left behind."""
+    if entry.is_dir() and not entry.is_symlink():
+        shutil.rmtree(entry, ignore_errors=True)
+    else:
+        entry.unlink(missing_ok=True)
+
+    return not os.path.lexists(entry)
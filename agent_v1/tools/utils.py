@@ -1,39 +1,70 @@
+import errno
 import pathlib
+import shutil
 import subprocess
-from typing import Tuple, Optional
+import tempfile
+from typing import Any, Dict, List, Tuple, Optional
 import os
 from datetime import datetime, timezone
 
+from agent_v1.tools.atomic_io import (
+    DEFAULT_FSYNC_POLICY,
+    FsyncPolicy,
+    atomic_write_text,
+    existing_mode,
+    fsync_dir,
+    same_content,
+    write_temp,
+)
+from agent_v1.tools.listing import (
+    BATCH_STAGING_PREFIX,
+    IgnoreRules,
+    WalkEntry,
+    list_tree,
+)
+from agent_v1.tools.trash import move_to_trash
+
 # -------------------------------------------------------------------
-# Project Root Configuration (API)
+# Project Filesystem (API)
 # -------------------------------------------------------------------
 
-_API_PROJECT_ROOT: Optional[pathlib.Path] = None
+class ProjectFS:
+    """
+    Filesystem view rooted at a single project directory.
+
+    Constructed per request: the root is resolved once and owned by
+    this object, so API file operations carry no global state and can
+    run concurrently across threads and workers.
+    """
 
+    __slots__ = ("root", "fsync_policy")
 
-def api_set_project_root(path: str):
-    """Set the project root directory for API filesystem operations."""
-    global _API_PROJECT_ROOT
-    _API_PROJECT_ROOT = pathlib.Path(path).resolve()
+    def __init__(
+        self,
+        root: str | pathlib.Path,
+        fsync_policy: FsyncPolicy = DEFAULT_FSYNC_POLICY,
+    ):
+        self.root = pathlib.Path(root).resolve()
+        self.fsync_policy = fsync_policy
 
+    def relative(self, p: pathlib.Path) -> str:
+        """Return `p` relative to the project root."""
+        return str(p.relative_to(self.root))
 
-def api_get_project_root() -> pathlib.Path:
-    """Return the current API project root."""
-    if _API_PROJECT_ROOT is None:
-        raise RuntimeError("Project root not initialized")
-    return _API_PROJECT_ROOT
+    def __repr__(self) -> str:
+        return f"<ProjectFS {self.root}>"
 
 
 # -------------------------------------------------------------------
 # Path Safety Utilities (API)
 # -------------------------------------------------------------------
 
-def api_safe_path_for_project(path: str) -> pathlib.Path:
-    """Ensure path stays within API project root."""
+def api_safe_path_for_project(fs: ProjectFS, path: str) -> pathlib.Path:
+    """Ensure path stays within the project root."""
     if not path:
         raise ValueError("Path cannot be empty")
 
-    root = api_get_project_root()
+    root = fs.root
     candidate = (root / path).resolve()
 
     if candidate != root and root not in candidate.parents:
@@ -47,6 +78,19 @@ def api_safe_path_for_project(path: str) -> pathlib.Path:
 # File Operations (API)
 # -------------------------------------------------------------------
 
+# Text is decoded in pieces of this many characters: decoding holds the
+# GIL, so one multi-megabyte decode on a pool thread stalls the event
+# loop about as long as reading inline would
+READ_CHUNK_CHARS = 256 * 1024
+
+
+def _read_text(f) -> str:
+    parts = []
+    while chunk := f.read(READ_CHUNK_CHARS):
+        parts.append(chunk)
+    return "".join(parts)
+
+
 # def api_write_file(path: str, content: str) -> str:
 #     """Create or overwrite a file within the project root."""
 #     p = api_safe_path_for_project(path)
@@ -57,28 +101,22 @@ def api_safe_path_for_project(path: str) -> pathlib.Path:
 #
 #     return f"WROTE: {p.relative_to(api_get_project_root())}"
 
-def api_write_file(path: str, content: str) -> str:
-    p = api_safe_path_for_project(path)
+def api_write_file(fs: ProjectFS, path: str, content: str) -> str:
+    """
+    Atomically replace a file within the project root
+    (temp file + rename); byte-identical content is not rewritten.
+    """
+    p = api_safe_path_for_project(fs, path)
 
-    # Ensure parent directories exist
-    p.parent.mkdir(parents=True, exist_ok=True)
+    if not atomic_write_text(p, content, fs.fsync_policy):
+        return f"UNCHANGED: {fs.relative(p)}"
 
-    # FIX PERMISSIONS IF FILE EXISTS
-    if p.exists():
-        try:
-            os.chmod(p, 0o666)
-        except PermissionError:
-            pass
+    return f"WROTE: {fs.relative(p)}"
 
-    with open(p, "w", encoding="utf-8") as f:
-        f.write(content)
 
-    return f"WROTE: {p.relative_to(api_get_project_root())}"
-
-
-def api_read_file(path: str) -> str:
+def api_read_file(fs: ProjectFS, path: str) -> str:
     """Read file content within the project root."""
-    p = api_safe_path_for_project(path)
+    p = api_safe_path_for_project(fs, path)
 
     if not p.exists():
         return ""
@@ -87,12 +125,51 @@ def api_read_file(path: str) -> str:
         return f"ERROR: {path} is not a file"
 
     with open(p, "r", encoding="utf-8") as f:
-        return f.read()
+        return _read_text(f)
+
+
+def file_etag(st: os.stat_result) -> str:
+    """Strong validator derived from mtime (ns) and size."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def api_stat_file(fs: ProjectFS, path: str) -> Tuple[pathlib.Path, os.stat_result]:
+    """Resolve and stat a regular file. Raises ValueError otherwise."""
+    p = api_safe_path_for_project(fs, path)
+
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        raise ValueError(f"File does not exist: {path}")
+
+    if not p.is_file():
+        raise ValueError(f"{path} is not a file")
+
+    return p, st
+
+
+def api_read_file_versioned(fs: ProjectFS, path: str) -> Tuple[str, Optional[str]]:
+    """
+    Read file content together with its ETag, taken from the open
+    descriptor so the two always match. Missing files read as ""
+    without an ETag (same as `api_read_file`).
+    """
+    p = api_safe_path_for_project(fs, path)
+
+    if not p.exists():
+        return "", None
+
+    if not p.is_file():
+        return f"ERROR: {path} is not a file", None
+
+    with open(p, "r", encoding="utf-8") as f:
+        etag = file_etag(os.fstat(f.fileno()))
+        return _read_text(f), etag
 
 
-def api_delete_file(path: str) -> str:
+def api_delete_file(fs: ProjectFS, path: str) -> str:
     """Delete a file within the project root."""
-    p = api_safe_path_for_project(path)
+    p = api_safe_path_for_project(fs, path)
 
     if not p.exists():
         return "ERROR: File does not exist"
@@ -108,16 +185,21 @@ def api_delete_file(path: str) -> str:
 # Folder Operations (API)
 # -------------------------------------------------------------------
 
-def api_create_folder(path: str) -> str:
+def api_create_folder(fs: ProjectFS, path: str) -> str:
     """Create a folder within the project root."""
-    p = api_safe_path_for_project(path)
+    p = api_safe_path_for_project(fs, path)
     p.mkdir(parents=True, exist_ok=True)
     return f"CREATED_FOLDER: {path}"
 
 
-def api_delete_folder(path: str) -> str:
-    """Recursively delete a folder within the project root."""
-    p = api_safe_path_for_project(path)
+def api_delete_folder(fs: ProjectFS, path: str) -> str:
+    """
+    Recursively delete a folder within the project root.
+
+    The folder is renamed into the trash (atomic, constant time) and
+    reclaimed later by the trash reaper.
+    """
+    p = api_safe_path_for_project(fs, path)
 
     if not p.exists():
         return "ERROR: Folder does not exist"
@@ -125,13 +207,7 @@ def api_delete_folder(path: str) -> str:
     if not p.is_dir():
         return f"ERROR: {path} is not a directory"
 
-    for item in sorted(p.glob("**/*"), reverse=True):
-        if item.is_file():
-            item.unlink()
-        elif item.is_dir():
-            item.rmdir()
-
-    p.rmdir()
+    move_to_trash(p)
     return f"DELETED_FOLDER: {path}"
 
 
@@ -139,28 +215,183 @@ def api_delete_folder(path: str) -> str:
 # Listing (API)
 # -------------------------------------------------------------------
 
-def api_list_files(directory: str = ".") -> str:
-    """Recursively list all files inside a directory."""
-    p = api_safe_path_for_project(directory)
+def api_list_entries(
+    fs: ProjectFS,
+    directory: str = ".",
+    max_depth: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_dirs: bool = False,
+    with_metadata: bool = False,
+    include_ignored: bool = False,
+) -> Tuple[List[WalkEntry], Optional[str]]:
+    """
+    List one page of a directory tree (scandir walker).
+
+    Default ignore patterns and the project's .gitignore are applied
+    unless `include_ignored` is set. Raises ValueError for a missing
+    directory or a path outside the project.
+    """
+    p = api_safe_path_for_project(fs, directory)
 
     if not p.exists():
-        return f"ERROR: Directory does not exist: {directory}"
+        raise ValueError(f"Directory does not exist: {directory}")
 
     if not p.is_dir():
-        return f"ERROR: {directory} is not a directory"
-
-    files = sorted(
-        str(f.relative_to(api_get_project_root()))
-        for f in p.glob("**/*")
-        if f.is_file()
+        raise ValueError(f"{directory} is not a directory")
+
+    ignore = None if include_ignored else IgnoreRules.for_project(fs.root)
+
+    return list_tree(
+        fs.root,
+        p,
+        limit=limit,
+        cursor=cursor,
+        ignore=ignore,
+        max_depth=max_depth,
+        include_dirs=include_dirs,
+        with_metadata=with_metadata,
     )
 
+
+def api_list_files(fs: ProjectFS, directory: str = ".") -> str:
+    """Recursively list all files inside a directory."""
+    try:
+        entries, _ = api_list_entries(fs, directory)
+    except ValueError as e:
+        return f"ERROR: {e}"
+
+    files = [entry.path for entry in entries]
     return "\n".join(files) if files else "No files found"
 
 
-def api_get_current_directory() -> str:
+# -------------------------------------------------------------------
+# Batch Operations (API)
+# -------------------------------------------------------------------
+
+def _batch_result(op: Dict[str, Any], status: str, detail: str = "") -> Dict[str, Any]:
+    return {
+        "op": op["op"],
+        "path": op["path"],
+        "status": status,
+        "detail": detail,
+    }
+
+
+def _missing(path: str) -> FileNotFoundError:
+    return FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+
+
+def _commit_batch_op(
+    fs: ProjectFS,
+    op: Dict[str, Any],
+    src: pathlib.Path,
+    dst: Optional[pathlib.Path],
+    staged: Optional[pathlib.Path],
+) -> str:
+    kind = op["op"]
+
+    if kind == "write":
+        if same_content(src, op["content"].encode("utf-8")):
+            return f"UNCHANGED: {fs.relative(src)}"
+
+        src.parent.mkdir(parents=True, exist_ok=True)
+        mode = existing_mode(src)
+        if mode is not None:
+            os.chmod(staged, mode)
+        os.replace(staged, src)
+        return f"WROTE: {fs.relative(src)}"
+
+    if kind == "delete":
+        if src.is_dir() and not src.is_symlink():
+            move_to_trash(src)
+        elif src.exists() or src.is_symlink():
+            src.unlink()
+        else:
+            raise _missing(op["path"])
+        return f"DELETED: {op['path']}"
+
+    if kind == "mkdir":
+        src.mkdir(parents=True, exist_ok=True)
+        return f"CREATED_FOLDER: {op['path']}"
+
+    if kind == "move":
+        if not src.exists():
+            raise _missing(op["path"])
+        if dst.exists():
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), op["to"])
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(src, dst)
+        return f"MOVED: {op['path']} -> {op['to']}"
+
+    raise ValueError(f"Unknown operation: {kind}")
+
+
+def api_apply_batch(fs: ProjectFS, ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply write / delete / mkdir / move operations in one pass.
+
+    1. Validate: every path must stay inside the project, otherwise
+       ValueError is raised and nothing is touched
+    2. Stage: write contents go to temp files in a staging directory
+       under the project root (same filesystem); an OSError here
+       propagates and nothing is applied
+    3. Commit: operations run in order, each write being one atomic
+       rename. The first failing operation stops the batch and the
+       remaining ones are reported as "skipped"
+
+    Returns one result per operation: {op, path, status, detail}.
+    """
+    resolved = []
+    for op in ops:
+        src = api_safe_path_for_project(fs, op["path"])
+        if src == fs.root:
+            raise ValueError("Operation on the project root is not allowed")
+
+        dst = api_safe_path_for_project(fs, op["to"]) if op["op"] == "move" else None
+        resolved.append((op, src, dst))
+
+    staging = pathlib.Path(
+        tempfile.mkdtemp(prefix=BATCH_STAGING_PREFIX, dir=fs.root)
+    )
+
+    try:
+        staged: Dict[int, pathlib.Path] = {}
+        for i, (op, _, _) in enumerate(resolved):
+            if op["op"] == "write":
+                tmp = staging / str(i)
+                write_temp(tmp, op["content"].encode("utf-8"), fsync_policy=fs.fsync_policy)
+                staged[i] = tmp
+
+        results = []
+        failed = False
+
+        for i, (op, src, dst) in enumerate(resolved):
+            if failed:
+                results.append(_batch_result(op, "skipped"))
+                continue
+
+            try:
+                detail = _commit_batch_op(fs, op, src, dst, staged.get(i))
+                results.append(_batch_result(op, "ok", detail))
+            except OSError as e:
+                failed = True
+                results.append(_batch_result(op, "error", f"ERROR: {e.strerror or e}"))
+
+        if fs.fsync_policy == "full":
+            for parent in {src.parent for op, src, _ in resolved if op["op"] == "write"}:
+                if parent.is_dir():
+                    fsync_dir(parent)
+
+        return results
+
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def api_get_current_directory(fs: ProjectFS) -> str:
     """Return project root path."""
-    return str(api_get_project_root())
+    return str(fs.root)
 
 
 def get_current_utc():
@@ -0,0 +1,77 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "generation_jobs" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "prompt" TEXT NOT NULL,
+    "status" VARCHAR(32) NOT NULL DEFAULT 'queued',
+    "stage" VARCHAR(32),
+    "total_steps" INT NOT NULL DEFAULT 0,
+    "completed_steps" INT NOT NULL DEFAULT 0,
+    "progress" JSONB NOT NULL,
+    "error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "started_at" TIMESTAMPTZ,
+    "finished_at" TIMESTAMPTZ,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "owner_id" UUID NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "project_id" UUID REFERENCES "projects" ("id") ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS "idx_generation__status_1d6654" ON "generation_jobs" ("status");
+COMMENT ON TABLE "generation_jobs" IS 'Persistent queue entry for an asynchronous project generation.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "generation_jobs";"""
+
+
+MODELS_STATE = (
+    "eJztXO9z2jgT/lc0fGpnEq4hP+6m8847QxJyxzWFTCDv3XuXG5+wBaixJZ8lhzJt//dbCR"
+    "tjYwNOgBqP+yGFlVaSn13Lu6sHf6k53CK2qP9MGPGwpJz9yge19+hLjWGHwIf0Dkeohl03"
+    "alYCiQe21hjNuxqf+EC34YGQHjYlNA+xLQiILCJMj7qqm1K6I56gQhIm0T8+8QmCT94UDb"
+    "mHMENYTJk59jjjvkCuxz8RU6Jonrqaw+ImTELZ6PXDPbJHdk0EHTF0ByOa1LWJeP/Ijpf+"
+    "gQz1xwTpi0ftHpLwRc/4Hk249wTLQKaNqYP+1lLrb+TxiUATKsePDKFe67Z11Uf1eh3ddO"
+    "/Rw911s99CvQ/tO3TbvfrQuj5CgiNBnmFpNmretREDwGFMzJS65WHKEJVI4CGxp3W1nDuP"
+    "jzwiBKIwjUclgIAGU72w2YrgI5aIT5jQQrAR4gyUFYg+o7BOQ/IRgTYPoPzzLxBTZpHPRI"
+    "Rf3SdjSIltxRyFWmoALTfk1NWyh4f29Y3uqQw0MExu+w6LertTOQY3Cbv7PrXqSke1BfYg"
+    "1oLTMN+2AzcLRbMVg0B6Ppkv1YoEFhli31auV/vP0GemsjDSM6k/Z/8NlrbQzTA63b7Ra/"
+    "UNo7bkqWoJCW8LRCZnysspkwqoL99m40aAaGlNTXD1S/P+zenFWw0BF1LZK4Sr9k0rYoln"
+    "qhr0CGXwVseVy0j3yWeZjnSkkUAbFvsSnENBBHR0S4cQhiDtF9Z+6/e+GtkR4h9bCTr/a9"
+    "5rrD82f9dgO9Og5bbb+TnszmFnmu1cnavb7qU2QAS4kFj6YhnwqzH20gGPNHYF+LJnzzaX"
+    "XblyzcGfDZuwkRzD19PGChuEiJ823iawDVoaumkJ4xHJCfFM4UUIB/AVxaN3ja7kEtsGPA"
+    "zdFDdus4xtI6GVABrWvqu9492uYB6pFRw3Ts5+PPvp9OLsJ+iiVzmX/LgC+Xann4DVhG3V"
+    "JnDtuaFN0azgTcLrBmHMMq6/9rqdzEfdXCeBqEUhxPuKbAgKd4XsQngx8KktKRN1Nd/3iD"
+    "AURqsfhcmnXiIUUQMkH4XE87iXJ/SYK5Rhm9534GF6RGFj4JRo7xpaJHVIxv4S00zeCIFq"
+    "PfxwgDFgDS7Q6kLOEnjJKtO0P7Z6/ebHu5h9VJalWhox24TSNxeJO2Q+CPqt3f8Fqa/oj2"
+    "6nlbxp5v36f9TUmrAvucH4xMDWQtgWSkPUkqGQ9zKrxzW3YPUDuv8KZOQQk5VWHlJGxfhF"
+    "Zk6oVnYusp1913rhHh7XrPbwAps9WH1kdT4BSxj56mGLOtusihX3Zl5bBIvlAqpEmxPSuN"
+    "YrQD2cDXINpqp2O3xKrStq/1tG94Z7hI7YBzLVGLdhIZiZaaWX4JzgQZADripG0sjsHp7M"
+    "q92x2xQuHi4Z8niNfLN31bxu1dL8dguw3kUjHaSzrgU2frPGoIUloM7D7W1N++8Am08T7F"
+    "lGzJFVC2/whGTed7nJaThJCWZ4pAFSV6LWncA+5VRswSzZ52HBpW12EJYNbMrRzJ/RbasX"
+    "9ld1VlOksxr9/xLO2VXtsP/ejg32VtRunJ9vUNWGXpllbd2WHhV4nKdssdkwJ/VKcSwWx/"
+    "vkXeNsA8BVt0zEZ41VTarc+cwmNakqn6li7wKEiOtj7+z4MAI7hZ0Uh/0yGODmwz2xdcds"
+    "xJdYUeUIzr/lCqcjbD2fhbt3OqZdRvoc/qxHNois76MRSwRt/uQjxCE7B1lAam0qYiwYKh"
+    "c1L9BDiuJCNJuOYHOM5qYJyXQrCXkbD5KPhqd8jDALzaAUqNu5/b8muF1zU7HewBQSDAGf"
+    "bDok5hSeo5ov13Rdm5raHdXMJhECtN/c2Fg8oR/QDRZS8e5+QD0Jj3jHphI+wwxg6LeKg4"
+    "c9gnzYeY/VBB63bbiCZ4rRb2TQUzNLJInnUIZtPV2Ho8Fspcc2eSZ2OCdSVngCtBRvzyUe"
+    "4OIQS2PQH4NIWxOBI8HEsFRs21OEnzm1RDhCMJ6G9ZFJDnIQAODarghwdqiwIUpRk4RGoE"
+    "xNFLEoKwJgAWKFoxVJ5eqsZyUNsHxZz97P5MM9xMib2y9rbscA653+sJN86uSkBs4V9ufg"
+    "wVTvT+snJ8fCps6udpQ94F1EumsK4kJy1z1cwivEFhIgdCBWSXloZm/iSb2KV1Xxqqoa1i"
+    "Y1rIqJUTarb8LE+M7EgWJFa1usXeY5iN3gODwsC239MLyQBnjNWXh6qfNVx9v3ZAjWHvf5"
+    "E2G1lPpSrP1oVXXJm/U0pOq6g+PuqhBRpELEGGsaqgz9YtN8IalXujz44t0G6cLFu8x0QT"
+    "XFQ9ZPkuZBOOheOmBPLzbJw5LhxkIedpEElnx2KXj8C6LCuGYJo8LDjQKXg38qDI88w4aT"
+    "8mC45NwmmGU8G2KKCSsPQHNXhp1L9mvZy273NmbUy3Yyo374eNm6f3OirQmd6CwuSfl5ZJ"
+    "Vmlyzh2ijNFrmZIgsqFVFkNVHEFxVPZH36tOBQeWkiu6QRa9RT8qvQGtl5lbqgKp0qeTql"
+    "jJz3UHFRp3TR/vkmadR5dhp1vpRGFY2P/V0JwpugC71W0IOX8CUOpnYegOcKpXPe3RDeAa"
+    "NcDjxXKB++m7hvI9t7G0vOa/qeR5g08h+AL2sWecOoqfe9fUVC+pbihn1FXMcDL7DB9o/F"
+    "XSzEhEOgpWqEuRw9qVhkCxRpS6ECkjuHphRw19VF5mpVVSRHVUQBB4HqcxpHeh3gc709Ih"
+    "7u8AcLeFWGyt5eSlyGqtgeJbN6FtsjBzWhIL8BKppDZP5SJYVI80qoXkHcOASQlvkPL4cq"
+    "ybooC167rLA2iUfNcS2lxhq0HK2qsuKoT2HKrJmvEE2tsqa8NTR4WBY3q9/KW0Ozq6rP6m"
+    "dnPBc/ZUGlyiI3yyLVTZUD4aB7CdHdSVlV/XSIsJRINvtFuAsq+38P7vc5Vd3aG29fRXZ9"
+    "7cPs27/teRru"
+)
@@ -0,0 +1,66 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "project_runtime" ADD "cpus" DOUBLE PRECISION NOT NULL DEFAULT 2;
+        ALTER TABLE "project_runtime" ADD "memory_mb" INT NOT NULL DEFAULT 2048;
+        ALTER TABLE "project_runtime" ADD "profile" VARCHAR(16) NOT NULL DEFAULT 'medium';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "project_runtime" DROP COLUMN "cpus";
+        ALTER TABLE "project_runtime" DROP COLUMN "memory_mb";
+        ALTER TABLE "project_runtime" DROP COLUMN "profile";"""
+
+
+MODELS_STATE = (
+    "eJztXG1z2jgQ/isaPrUzCZeQl7vp3NwMScgdVwqZQO41Nz5hC1BjSz5LTsq0/e+3EjbGb4"
+    "CTQA3jfkhhpZXkZ9fy7uoxn2sOt4gt6j8TRjwsKWe/8mHtHfpcY9gh8CG7wwGqYdeNmpVA"
+    "4qGtNcbzrsZHPtRteCikh00JzSNsCwIiiwjTo67qppRuiCeokIRJ9J9PfILgkzdFI+4hzB"
+    "AWU2ZOPM64L5Dr8Y/ElCiap67msLgJk1A2fvlw9+yeXRFBxwzdwIgmdW0i3t2zw9Q/kKHB"
+    "hCB98ajdRxK+6BnfoSfuPcAykGlj6qB/tdT6F3n8SaAnKif3DKF+q9O6HKB6vY6ue7fo7u"
+    "aqOWih/vv2Der0Lt+3rg6Q4EiQR1iajZo3bcQAcBgTM6VueZgyRCUSeETsaV0t58bjY48I"
+    "gShM41EJIKDhVC9stiL4iCXiT0xoIdgIcQbKCkSfUVinIfmYQJsHUP79D4gps8gnIsKv7o"
+    "MxosS2Yo5CLTWAlhty6mrZ3V376lr3VAYaGia3fYdFvd2pnICbhN19n1p1paPaAnsQa8Fp"
+    "mG/bgZuFotmKQSA9n8yXakUCi4ywbyvXq/048pmpLIz0TOrP6U/B0ha6GUa3NzD6rYFh1F"
+    "KeqpaQ8LZAZHKmvJwyqYD6/HU2bgSIltbUBJe/NG/fnJy/1RBwIZW9QrhqX7UilnimqkGP"
+    "UAZvdVyZRnpAPslspCONBNqw2OfgHAoioKNbOoQwBGm7sA5afwzUyI4Q/9lK0P2teaux/t"
+    "D8Q4PtTIOWTq/7c9idw84027m6l53ehTZABLiQWPoiDfjlBHvZgEcamwI87dmzzWVTrlxz"
+    "8CfDJmwsJ/D1pLHEBiHiJ423CWyDloZuSmE8JgUhnik8C+EAvrJ49KbRlVxi24CHoZvhxm"
+    "2Ws20ktBJAw9o3tXccbQrmsVrBYeP49PvTH07OT3+ALnqVc8n3S5BvdwcJWE3YVm0C114Y"
+    "2gzNCt4kvG4QxqRx/bXf6+Y+6uY6CUQtCiHeF2RDULgpZBfCi6FPbUmZqKv5vkWEoTBa/i"
+    "hMPvUSoYgaIPkoJJ7HvSKhx1xhH7bpbQcepkcUNgbOiPauoEVSh+TsLzHN5I0QqNbDDzsY"
+    "A9bgAq0e5CyBlywzTftDqz9ofriJ2UdlWaqlEbNNKH1znrhD5oOg39uDX5D6iv7qdVvJm2"
+    "beb/BXTa0J+5IbjD8Z2FoI20JpiFoyFPKeZ/W45itYfYfuvxIZOcRkqZVHlFExeZaZE6qV"
+    "nctsZ9+1nrmHxzWrPbzEZg9WH1mdP4EljGL1sEWd16yKlfdmXlkEi+UCqkRbENK41gtA3Z"
+    "0NcgWmqnY7esisK2r/S6N7zT1Cx+w9mWqM27AQzMys0ktwTnAnyA5XFSNpZHYPP82r3bHb"
+    "FC4eLhnyeI18s3/ZvGrVsvz2FWC9iUbaSWddCWz8Zo1BC0tA3btOp6b9d4jNhyfsWUbMkV"
+    "ULb/CEZN433eQ0nKQEMzzWAKkrUetOYJ9xKrZglvzzsODS1jsIywc242jm7+i21Qv7pzqr"
+    "KdNZjf4/hXN+VTvsv7Vjg60VtRtnZ2tUtaFXbllbt2VHBR7nGVtsPsxJvb04FovjfXzUOF"
+    "0DcNUtF/FZY1WT2u98Zp2aVJXPVLF3CULE1bF3fnwYgZ3BTorDfhEMcP3+lti6Yz7iKVbU"
+    "fgTnXwuF0xG2ns/C3Tsb0x4jAw5/ViMbRNa30Yh7BG3x5CPEIT8HWUBqZSpiLBiqEDUv0E"
+    "OK4kI0m45gc4LmpgnJdEsJeWsPUoyGp3yMMAvNoBSo1+38qQluV9xUrDcwhQRDwCebjog5"
+    "heeo5ss1XdempnZHNbNJhADtN9c2Fg/oO3SNhVS8u+9QX8Ij3rGphM8wAxj6reLgYY8gH3"
+    "beQzWBx20bruCRYvQ7GfbVzBJJ4jmUYVtP1+VoOFvpoU0eiR3OiZQVHgAtxdtziQe4OMTS"
+    "GAwmINLWROBIMDEsFdv2FOFHTi0RjhCMp2G9Z5KDHAQAuLYrApwdKmyIUtQkoREoUxNFLM"
+    "qKAFiCWOFgSVK5POtZSgPcv6xn62fy4R5iFM3t05qvY4DVTr/bST51ClID5wrbc/Bgqncn"
+    "9ePjQ2FTZ1M7yhbwLiPdNQNxIbnr7i7hFTbjEbUL+fWCyhZxhhCE+lvy5+PzdUpWyTrIQs"
+    "HqPAmzQxzuTQ1nmAY6l5wZ09keLbNxpBmTu8DMNN2sDeLa5jiP7+pm7g8jpbExPOubIrou"
+    "weqqd3fRaaGb29Zlu98OGJjzSp5uVCIQ0Fnl4rbV7CTQhbRDAnYOpDEZ8XR+fJfUqyiXFe"
+    "WyKm+vU96uSFr7ZvV1SFrfmFNUrkTuFY81inA01mDKhBXjV+fJlNIAL6HJZJ+CvIj5cktG"
+    "YO3JgD8QVssoPcfaD5YVnr1ZT0OqrhtgwlQ1yjLVKCdYM9Rl6Bfr5rhJvb0rkZ0frZHinh"
+    "/lpriqKR6yfpS0CMJB970D9mSd2sFJfu3gJFU7IJ9cCh7/jKgwrrmHUeHuRoHp4J8KwyOP"
+    "sOFkPBguOLcJZjnPhphiwspD0NyUYeeS7Vr2otfrxIx60U5m1HcfLlq3b47fxmscGQWkKs"
+    "3es4RrrTRbFCaRLahUHLLlHDJfVBSy1enTgkMVZZBt8g0DjXpGfhVaIz+vUhdUpVN7nk4p"
+    "IxflGyzq7F20f7ZOGnWWn0adpdKosr2q8U3fHVgHXei15M2BFL7EwdQuAvBcYe+cdzPvwg"
+    "BGxegEocL+4buO+zbyvbeRcl7T9zzCpFGcG5PWLPOGUVM/BfkFCelbijb6BXEdDzzDBhtg"
+    "zGAhnjgEWqpGWMjRk4pltkCZthQqILlzaEYBd1VdZK5WVUUKVEUUcBCoPma9PrEK8LneFh"
+    "EPd/idBbwqQ+VvL3tchqrYHntm9Ty2RwFqQkleDyybQ+S+xJZBpHkhVC8gbuwCSGn+w/Oh"
+    "SrIu9gWvTVZYm8Sj5qSWUWMNWg6WVVlx1Kc0ZdZcAntmlTWDuR48LMub1b8KbT2/qvqo3k"
+    "jlhfgpCypVFrleFqluqgIIB933EN2NlFXVW4WEZUSy+b+RvaCy/Z/I/janqq/2Y9gvIru+"
+    "9GH29X9eC2Ye"
+)
@@ -0,0 +1,30 @@
+import asyncio
+import os
+
+import pytest
+from tortoise import Tortoise
+
+# Settings are read at import time; the tests need no real database
+os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+
+@pytest.fixture
+def run_db():
+    """Run a coroutine function against a fresh in-memory database."""
+
+    def run(main):
+        async def wrapper():
+            await Tortoise.init(
+                db_url="sqlite://:memory:",
+                modules={"models": ["agent_v1.api.db.models"]},
+            )
+            await Tortoise.generate_schemas()
+            try:
+                return await main()
+            finally:
+                await Tortoise.close_connections()
+
+        return asyncio.run(wrapper())
+
+    return run
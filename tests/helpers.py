@@ -0,0 +1,31 @@
+from agent_v1.api.db.models import Project, ProjectRuntime, User
+
+
+async def create_user(username: str = "alice", **fields) -> User:
+    return await User.create(
+        username=username,
+        name=username.title(),
+        email=f"{username}@example.com",
+        phone=str(abs(hash(username)) % 10 ** 9),
+        current_status="other",
+        password_hash="x",
+        **fields,
+    )
+
+
+async def create_project(owner: User, name: str, root: str = None) -> Project:
+    return await Project.create(
+        name=name,
+        project_root=root or f"/projects/{name}",
+        owner=owner,
+    )
+
+
+async def create_runtime(project: Project, status: str, **fields) -> ProjectRuntime:
+    return await ProjectRuntime.create(
+        project=project,
+        project_root=project.project_root,
+        container_name=f"ai-builder-{project.name}",
+        status=status,
+        **fields,
+    )
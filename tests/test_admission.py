@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from agent_v1.api import runtime_routes
+from agent_v1.runtime import admission as admission_module
+from agent_v1.runtime.admission import AdmissionController, AdmissionRefused
+from agent_v1.runtime.container_spec import Resources
+from tests.helpers import create_project, create_runtime, create_user
+
+
+def _controller(wait_seconds=5.0, **fields) -> AdmissionController:
+    options = dict(
+        host_memory_mb=1024,
+        host_cpus=2.0,
+        memory_overcommit=1.0,
+        cpu_overcommit=1.0,
+    )
+    options.update(fields)
+    return AdmissionController(wait_seconds=wait_seconds, **options)
+
+
+def test_capacity_comes_from_config_or_docker_info(monkeypatch):
+    class FakeDocker:
+        async def get(self, path, **params):
+            assert path == "/info"
+            return {"MemTotal": 8 * 1024 ** 3, "NCPU": 4}
+
+    monkeypatch.setattr(admission_module, "docker_client", FakeDocker())
+
+    async def main():
+        reported = _controller(
+            host_memory_mb=None, host_cpus=None,
+            memory_overcommit=1.5, cpu_overcommit=4.0,
+        )
+        configured = _controller(memory_overcommit=1.5, cpu_overcommit=4.0)
+        return await reported.capacity(), await configured.capacity()
+
+    reported, configured = asyncio.run(main())
+
+    assert reported == Resources(memory_mb=12288, cpus=16.0)
+    assert configured == Resources(memory_mb=1536, cpus=8.0)
+
+
+def test_start_is_refused_after_the_wait(run_db):
+    async def main():
+        project = await create_project(await create_user(), "busy")
+        await create_runtime(project, "paused", memory_mb=768, cpus=1.0)
+
+        controller = _controller(wait_seconds=0.1)
+        with pytest.raises(AdmissionRefused, match="Not enough capacity"):
+            async with controller.reserve("web", Resources(memory_mb=512, cpus=0.5)):
+                pass
+
+        # Without the paused runtime's limits it fits
+        async with controller.reserve("busy", Resources(memory_mb=1024, cpus=2.0)):
+            pass
+
+    run_db(main)
+
+
+def test_waiting_start_is_admitted_when_a_reservation_ends(run_db):
+    async def main():
+        controller = _controller()
+        admitted = []
+        first_in = asyncio.Event()
+        release = asyncio.Event()
+
+        async def start(name):
+            async with controller.reserve(name, Resources(memory_mb=1024, cpus=1.0)):
+                admitted.append(name)
+                first_in.set()
+                await release.wait()
+
+        first = asyncio.create_task(start("a"))
+        await first_in.wait()
+        second = asyncio.create_task(start("b"))
+        await asyncio.sleep(0.05)
+        waiting = list(admitted)
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, second), 1)
+        return waiting, admitted
+
+    waiting, admitted = run_db(main)
+
+    assert waiting == ["a"]
+    assert admitted == ["a", "b"]
+
+
+@pytest.mark.parametrize("route", ["start", "resources"])
+def test_refused_admission_maps_to_503(monkeypatch, route):
+    async def ensure_project_access(project_name, user):
+        return type("Project", (), {"name": project_name})()
+
+    async def refuse(*args, **kwargs):
+        raise AdmissionRefused("Not enough capacity on this host")
+
+    monkeypatch.setattr(runtime_routes, "ensure_project_access", ensure_project_access)
+    monkeypatch.setattr(runtime_routes.docker_manager, "ensure_running", refuse)
+    monkeypatch.setattr(runtime_routes.docker_manager, "set_resources", refuse)
+
+    async def main():
+        if route == "start":
+            await runtime_routes.start_runtime("web", user=None)
+        else:
+            await runtime_routes.update_runtime_resources(
+                "web", runtime_routes.RuntimeResourcesRequest(profile="large"), user=None
+            )
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(main())
+
+    assert raised.value.status_code == 503
+    assert "Not enough capacity" in raised.value.detail
@@ -0,0 +1,68 @@
+import pytest
+
+from agent_v1.tools.utils import BATCH_STAGING_PREFIX, ProjectFS, api_apply_batch
+
+
+@pytest.fixture
+def fs(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    return ProjectFS(tmp_path)
+
+
+def _tree(root):
+    return sorted(
+        (str(p.relative_to(root)), p.read_text() if p.is_file() else None)
+        for p in root.rglob("*")
+    )
+
+
+def test_invalid_path_fails_the_batch_before_anything_is_written(fs):
+    before = _tree(fs.root)
+
+    with pytest.raises(ValueError):
+        api_apply_batch(fs, [
+            {"op": "write", "path": "new.txt", "content": "new"},
+            {"op": "delete", "path": "a.txt"},
+            {"op": "write", "path": "../escape.txt", "content": "x"},
+        ])
+
+    assert _tree(fs.root) == before
+    assert not (fs.root.parent / "escape.txt").exists()
+
+
+def test_failure_skips_the_rest_and_leaves_no_staging(fs):
+    results = api_apply_batch(fs, [
+        {"op": "write", "path": "a.txt", "content": "a2"},
+        {"op": "delete", "path": "missing.txt"},
+        {"op": "write", "path": "b.txt", "content": "b2"},
+        {"op": "mkdir", "path": "lib"},
+    ])
+
+    assert [r["status"] for r in results] == ["ok", "error", "skipped", "skipped"]
+    assert (fs.root / "a.txt").read_text() == "a2"
+    assert (fs.root / "b.txt").read_text() == "b"
+    assert not (fs.root / "lib").exists()
+    assert list(fs.root.glob(f"{BATCH_STAGING_PREFIX}*")) == []
+
+
+def test_operations_apply_in_order(fs):
+    # Replace b.txt by a.txt, then write a fresh a.txt
+    results = api_apply_batch(fs, [
+        {"op": "delete", "path": "b.txt"},
+        {"op": "move", "path": "a.txt", "to": "b.txt"},
+        {"op": "write", "path": "a.txt", "content": "fresh"},
+    ])
+
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert _tree(fs.root) == [("a.txt", "fresh"), ("b.txt", "a")]
+
+
+def test_move_onto_an_existing_file_fails(fs):
+    results = api_apply_batch(fs, [
+        {"op": "move", "path": "a.txt", "to": "b.txt"},
+        {"op": "delete", "path": "b.txt"},
+    ])
+
+    assert [r["status"] for r in results] == ["error", "skipped"]
+    assert _tree(fs.root) == [("a.txt", "a"), ("b.txt", "b")]
@@ -0,0 +1,110 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from agent_v1.tools.archive import api_export_archive, api_import_archive
+from agent_v1.tools.utils import ProjectFS
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    outside = tmp_path / "host"
+    outside.mkdir()
+    (outside / ".env").write_text("SECRET=1\n")
+
+    root = tmp_path / "project"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.py").write_text("print('hi')\n")
+    os.symlink(outside / ".env", root / "leak")
+    os.symlink(outside, root / "hostdir")
+
+    return root
+
+
+def _export(root, fmt) -> bytes:
+    chunks = []
+    count = api_export_archive(ProjectFS(root), fmt, chunks.append)
+    assert count == 1
+    return b"".join(chunks)
+
+
+def test_zip_export_skips_symlinks(workspace):
+    with zipfile.ZipFile(io.BytesIO(_export(workspace, "zip"))) as zf:
+        names = zf.namelist()
+        assert sorted(names) == ["src/", "src/app.py"]
+        assert zf.read("src/app.py") == b"print('hi')\n"
+
+
+def test_tar_export_skips_symlinks(workspace):
+    with tarfile.open(fileobj=io.BytesIO(_export(workspace, "tar.gz")), mode="r:gz") as tar:
+        assert sorted(tar.getnames()) == ["src", "src/app.py"]
+        assert tar.extractfile("src/app.py").read() == b"print('hi')\n"
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar.gz"])
+def test_export_does_not_read_through_late_symlinks(workspace, monkeypatch, fmt):
+    # A file swapped for a symlink after the walk listed it
+    from agent_v1.tools import archive
+    from agent_v1.tools.listing import WalkEntry
+
+    def walk(*args, **kwargs):
+        yield WalkEntry(path="src", type="dir")
+        yield WalkEntry(path="src/app.py", type="file")
+        yield WalkEntry(path="leak", type="file")
+
+    monkeypatch.setattr(archive, "iter_tree", walk)
+
+    data = io.BytesIO(_export(workspace, fmt))
+    if fmt == "zip":
+        with zipfile.ZipFile(data) as zf:
+            assert "leak" not in zf.namelist()
+    else:
+        with tarfile.open(fileobj=data, mode="r:gz") as tar:
+            assert "leak" not in tar.getnames()
+
+
+def _zip(members) -> bytes:
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return data.getvalue()
+
+
+def _import(root, tmp_path, members):
+    archive = tmp_path / "upload.zip"
+    archive.write_bytes(_zip(members))
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    return api_import_archive(
+        ProjectFS(root), archive, "zip", staging, max_files=100, max_bytes=1 << 20
+    )
+
+
+@pytest.mark.parametrize(
+    "members",
+    [
+        {"src": b"file over a directory"},
+        {"src/app.py/inner.txt": b"directory over a file"},
+        {"x": b"file", "x/y": b"and directory in one archive"},
+    ],
+)
+def test_import_conflict_changes_nothing(workspace, tmp_path, members):
+    members = {"README.md": b"new", **members}
+
+    with pytest.raises(ValueError):
+        _import(workspace, tmp_path, members)
+
+    assert not (workspace / "README.md").exists()
+    assert (workspace / "src" / "app.py").read_text() == "print('hi')\n"
+
+
+def test_import_replaces_files(workspace, tmp_path):
+    result = _import(workspace, tmp_path, {"src/app.py": b"new", "docs/a.md": b"a"})
+
+    assert result["files"] == 2
+    assert (workspace / "src" / "app.py").read_bytes() == b"new"
+    assert (workspace / "docs" / "a.md").read_bytes() == b"a"
@@ -0,0 +1,63 @@
+import os
+import stat
+
+import pytest
+
+from agent_v1.tools.atomic_io import atomic_write_text
+from agent_v1.tools.utils import ProjectFS, api_write_file
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_same_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text("print('hi')\n")
+    os.utime(path, ns=(10 ** 18, 10 ** 18))
+    inode = os.stat(path).st_ino
+
+    assert api_write_file(ProjectFS(tmp_path), "app.py", "print('hi')\n") == "UNCHANGED: app.py"
+    assert atomic_write_text(path, "print('hi')\n") is False
+
+    st = os.stat(path)
+    assert st.st_mtime_ns == 10 ** 18
+    assert st.st_ino == inode
+
+
+def test_changed_content_replaces_the_file(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text("v1")
+
+    assert api_write_file(ProjectFS(tmp_path), "app.py", "v2") == "WROTE: app.py"
+    assert path.read_text() == "v2"
+    assert [p.name for p in tmp_path.iterdir()] == ["app.py"]
+
+
+@pytest.mark.parametrize(
+    "before, after",
+    [
+        (0o644, 0o666),
+        (0o600, 0o666),
+        # Execute bits survive the replace
+        (0o755, 0o777),
+        (0o700, 0o766),
+    ],
+)
+def test_replaced_file_keeps_its_mode_and_stays_writable(tmp_path, before, after):
+    path = tmp_path / "run.sh"
+    path.write_text("v1")
+    os.chmod(path, before)
+
+    assert atomic_write_text(path, "v2") is True
+    assert _mode(path) == after
+
+
+def test_new_file_gets_the_default_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        atomic_write_text(tmp_path / "new.txt", "new")
+    finally:
+        os.umask(umask)
+
+    assert _mode(tmp_path / "new.txt") == 0o644
@@ -0,0 +1,102 @@
+import os
+import threading
+
+import pytest
+
+from agent_v1.storage import blob_store as blob_module
+from agent_v1.storage.blob_store import BlobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(root=tmp_path / ".blobs", enabled=True)
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    return root
+
+
+def test_ingest_links_identical_files(store, project):
+    (project / "a.txt").write_text("same")
+    (project / "b.txt").write_text("same")
+
+    manifest = store.ingest(project)
+
+    assert manifest["a.txt"]["object"] == manifest["b.txt"]["object"]
+    assert os.stat(project / "a.txt").st_ino == os.stat(project / "b.txt").st_ino
+
+
+def test_ingest_skips_file_rewritten_while_hashing(store, project, monkeypatch):
+    (project / "app.py").write_text("v1")
+    hash_file = blob_module._hash_file
+
+    def rewrite_after_hash(path, st):
+        digest = hash_file(path, st)
+        tmp = path.with_name("app.py.new")
+        tmp.write_text("v2 from the user")
+        os.replace(tmp, path)
+        return digest
+
+    monkeypatch.setattr(blob_module, "_hash_file", rewrite_after_hash)
+    manifest = store.ingest(project)
+
+    assert manifest == {}
+    assert (project / "app.py").read_text() == "v2 from the user"
+    assert list(store.objects_dir.rglob("*.*")) == []
+
+
+def test_ingest_never_undoes_edit_made_while_hashing(store, project, monkeypatch):
+    (project / "a.txt").write_text("same")
+    store.ingest(project)
+    (project / "b.txt").write_text("same")
+    hash_file = blob_module._hash_file
+
+    def edit_after_hash(path, st):
+        digest = hash_file(path, st)
+        if path.name == "b.txt":
+            path.write_text("edit")
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        return digest
+
+    monkeypatch.setattr(blob_module, "_hash_file", edit_after_hash)
+    manifest = store.ingest(project)
+
+    assert "b.txt" not in manifest
+    assert (project / "b.txt").read_text() == "edit"
+    assert os.stat(project / "b.txt").st_nlink == 1
+
+
+def test_ingest_and_materialize_are_serialized(store, project, monkeypatch):
+    (project / "a.txt").write_text("same")
+    (project / "b.txt").write_text("same")
+    hashing = threading.Event()
+    release = threading.Event()
+    hash_file = blob_module._hash_file
+
+    def slow_hash(path, st):
+        hashing.set()
+        release.wait(5)
+        return hash_file(path, st)
+
+    monkeypatch.setattr(blob_module, "_hash_file", slow_hash)
+    ingest = threading.Thread(target=store.ingest, args=(project,))
+    ingest.start()
+    assert hashing.wait(5)
+
+    done = threading.Event()
+    materialize = threading.Thread(
+        target=lambda: (store.materialize(project), done.set())
+    )
+    materialize.start()
+    assert not done.wait(0.2)
+
+    release.set()
+    ingest.join(5)
+    materialize.join(5)
+
+    assert done.is_set()
+    assert os.stat(project / "a.txt").st_nlink == 1
+    assert os.stat(project / "b.txt").st_nlink == 1
@@ -0,0 +1,48 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from agent_v1.graph import graph
+from agent_v1.graph.states import CoderState, ImplementationTask, TaskPlan
+from agent_v1.tools.filesystem import get_current_directory, write_file
+
+FILES = ["index.html", "style.css", "app.js", "lib/util.js"]
+
+
+def test_concurrent_coder_runs_write_under_their_own_roots(tmp_path, monkeypatch):
+    runs = 2
+    # Every step of every run is in flight at once, so writes interleave
+    barrier = threading.Barrier(runs * len(FILES), timeout=10)
+
+    def fake_coder_step(task: ImplementationTask):
+        barrier.wait()
+        root = get_current_directory.invoke({})
+        write_file.invoke({"path": task.filepath, "content": f"{root}:{task.filepath}"})
+
+    monkeypatch.setattr(graph, "coder_step", fake_coder_step)
+    monkeypatch.setattr(graph, "get_stream_writer", lambda: lambda event: None)
+
+    roots = [tmp_path / f"project-{i}" for i in range(runs)]
+
+    def run(root):
+        root.mkdir()
+        coder_state = CoderState(
+            task_plan=TaskPlan(implementation_steps=[
+                ImplementationTask(filepath=f, task_description="write it") for f in FILES
+            ]),
+            project_root=str(root),
+        )
+        return graph.coder_agent({
+            "coder_state": coder_state,
+            "max_coder_workers": len(FILES),
+            "snapshot_steps": False,
+        })
+
+    with ThreadPoolExecutor(max_workers=runs) as executor:
+        results = list(executor.map(run, roots))
+
+    for root, result in zip(roots, results):
+        assert sorted(result["coder_state"].completed_steps) == list(range(len(FILES)))
+        written = sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+        assert written == sorted(FILES)
+        for f in FILES:
+            assert (root / f).read_text() == f"{root.resolve()}:{f}"
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import tempfile
+
+import pytest
+
+from agent_v1.runtime.docker_client import DockerClient, DockerError, DockerNotFound
+
+
+class FakeDocker:
+    """
+    Docker Engine API stand-in on a unix socket, speaking keep-alive
+    HTTP/1.1. `behaviors` is consumed one entry per request:
+    "ok" answers, "drop" closes the connection without answering.
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.requests = []
+        self.connections = 0
+        self.behaviors = []
+        self._writers = []
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_unix_server(self._handle, self.socket_path)
+
+    async def stop(self):
+        self._server.close()
+        self.close_idle()
+        await self._server.wait_closed()
+
+    def close_idle(self):
+        """What the daemon does to keep-alive connections it times out."""
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ")
+                headers = dict(
+                    (k.strip().lower(), v.strip())
+                    for k, _, v in (line.partition(":") for line in lines[1:] if line)
+                )
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((method, target, body))
+
+                behavior = self.behaviors.pop(0) if self.behaviors else "ok"
+                if behavior == "drop":
+                    writer.close()
+                    return
+
+                if target.endswith("/missing/json"):
+                    payload, status = b'{"message": "No such container: missing"}', "404 Not Found"
+                else:
+                    payload, status = json.dumps({"Id": "abc"}).encode(), "200 OK"
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+
+@pytest.fixture
+def socket_path():
+    # unix socket paths are limited to ~100 bytes, pytest's tmp_path can be longer
+    with tempfile.TemporaryDirectory(prefix="dk") as d:
+        yield f"{d}/docker.sock"
+
+
+def _run(socket_path, scenario):
+    async def main():
+        server = FakeDocker(socket_path)
+        await server.start()
+        client = DockerClient(socket_path, "1.41", max_connections=2)
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_requests_reuse_one_connection(socket_path):
+    async def scenario(server, client):
+        assert await client.get("/containers/web/json") == {"Id": "abc"}
+        assert await client.post("/containers/web/start") == {"Id": "abc"}
+        return server
+
+    server = _run(socket_path, scenario)
+
+    assert server.connections == 1
+    assert [(m, t) for m, t, _ in server.requests] == [
+        ("GET", "/v1.41/containers/web/json"),
+        ("POST", "/v1.41/containers/web/start"),
+    ]
+
+
+def test_error_status_raises(socket_path):
+    async def scenario(server, client):
+        with pytest.raises(DockerNotFound, match="No such container"):
+            await client.get("/containers/missing/json")
+
+    _run(socket_path, scenario)
+
+
+def test_connection_closed_while_idle_is_replaced(socket_path):
+    async def scenario(server, client):
+        await client.get("/info")
+        server.close_idle()
+        await asyncio.sleep(0.05)
+
+        assert await client.post("/containers/create", {"Image": "python"}) == {"Id": "abc"}
+        return server
+
+    server = _run(socket_path, scenario)
+
+    assert server.connections == 2
+    assert [m for m, _, _ in server.requests] == ["GET", "POST"]
+
+
+def test_get_is_retried_after_failing_on_reused_connection(socket_path):
+    async def scenario(server, client):
+        await client.get("/info")
+        server.behaviors = ["drop"]
+
+        assert await client.get("/containers/web/json") == {"Id": "abc"}
+        return server
+
+    server = _run(socket_path, scenario)
+
+    assert [m for m, _, _ in server.requests] == ["GET", "GET", "GET"]
+
+
+def test_post_is_not_resent_after_failing_on_reused_connection(socket_path):
+    async def scenario(server, client):
+        await client.get("/info")
+        server.behaviors = ["drop"]
+
+        with pytest.raises(DockerError, match="connection failed"):
+            await client.post("/containers/create", {"Image": "python"})
+        return server
+
+    server = _run(socket_path, scenario)
+
+    # The daemon received (and may have applied) the create exactly once
+    assert [m for m, _, _ in server.requests] == ["GET", "POST"]
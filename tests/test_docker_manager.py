@@ -0,0 +1,38 @@
+from agent_v1.runtime import docker_manager as manager_module
+from agent_v1.runtime.docker_manager import DockerManager
+from tests.helpers import create_project, create_runtime, create_user
+
+
+class FakeDocker:
+    def __init__(self, calls, state):
+        self.calls = calls
+        self.state = state
+
+    async def get(self, path, **params):
+        return {"State": self.state}
+
+    async def post(self, path, body=None, **params):
+        self.calls.append(("post", path.rsplit("/", 1)[-1]))
+
+
+def test_resume_materializes_before_unpausing(run_db, monkeypatch, tmp_path):
+    calls = []
+
+    def materialize(project_root):
+        calls.append(("materialize", project_root))
+        return 0
+
+    monkeypatch.setattr(manager_module.blob_store, "materialize", materialize)
+
+    async def main():
+        project = await create_project(await create_user(), "web", str(tmp_path))
+        await create_runtime(project, "paused")
+
+        manager = DockerManager()
+        manager.docker = FakeDocker(calls, {"Paused": True, "Running": True})
+        await manager._start("web")
+
+        return (await manager.repo.get("web")).status
+
+    assert run_db(main) == "running"
+    assert calls == [("materialize", str(tmp_path)), ("post", "unpause")]
@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from agent_v1.api import file_routes
+from agent_v1.api.file_watcher import FileChange
+from agent_v1.api.auth.dependencies import AuthDependency
+from agent_v1.api.auth.rate_limits import file_ops_limit
+
+CONTENT = b"0123456789" * 10
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "data.bin").write_bytes(CONTENT)
+
+    async def ensure_project_access(project_name, user):
+        return SimpleNamespace(name=project_name, project_root=str(tmp_path))
+
+    monkeypatch.setattr(file_routes, "ensure_project_access", ensure_project_access)
+    monkeypatch.setattr(
+        file_routes,
+        "ensure_websocket_project_access",
+        lambda websocket, project_name: ensure_project_access(project_name, None),
+    )
+
+    app = FastAPI()
+    app.include_router(file_routes.router)
+    app.dependency_overrides[AuthDependency.get_current_user] = lambda: object()
+    app.dependency_overrides[file_ops_limit] = lambda: None
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("route", ["read", "raw"])
+def test_matching_etag_answers_304(client, route):
+    url = f"/projects/web/files/{route}?file_path=data.bin"
+
+    first = client.get(url)
+    etag = first.headers["etag"]
+    cached = client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'})
+    stale = client.get(url, headers={"If-None-Match": '"other"'})
+
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    assert stale.status_code == 200
+
+
+def test_raw_range_answers_206(client):
+    response = client.get(
+        "/projects/web/files/raw?file_path=data.bin",
+        headers={"Range": "bytes=10-19"},
+    )
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+    assert response.content == CONTENT[10:20]
+
+
+def test_raw_if_range_with_a_stale_etag_sends_the_whole_file(client):
+    response = client.get(
+        "/projects/web/files/raw?file_path=data.bin",
+        headers={"Range": "bytes=10-19", "If-Range": '"stale"'},
+    )
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+class FakeWatchHub:
+    """Reports `changes` shortly after a client subscribes."""
+
+    def __init__(self, *changes):
+        self.changes = list(changes)
+        self.subscribed = 0
+
+    def subscribe(self, root, listener):
+        self.subscribed += 1
+        asyncio.get_running_loop().call_later(0.01, listener, self.changes)
+
+        def unsubscribe():
+            self.subscribed -= 1
+
+        return unsubscribe
+
+
+def test_ws_pushes_coalesced_changes(client, monkeypatch):
+    hub = FakeWatchHub(FileChange("created", "app.py"), FileChange("modified", "app.py"))
+    monkeypatch.setattr(file_routes, "file_watch_hub", hub)
+    monkeypatch.setattr(file_routes, "FILE_EVENTS_FLUSH_SECONDS", 0.01)
+
+    with client.websocket_connect("/projects/web/ws/files") as ws:
+        message = ws.receive_json()
+
+    assert message == {"type": "changes", "changes": [{"kind": "created", "path": "app.py"}]}
+
+
+def test_ws_is_closed_when_pushing_fails(client, monkeypatch):
+    hub = FakeWatchHub(FileChange("modified", ".gitignore"))
+    monkeypatch.setattr(file_routes, "file_watch_hub", hub)
+    monkeypatch.setattr(file_routes, "FILE_EVENTS_FLUSH_SECONDS", 0.01)
+
+    rules = file_routes.IgnoreRules.for_project
+    loads = []
+
+    def for_project(root):
+        loads.append(root)
+        if len(loads) > 1:
+            raise OSError("gitignore unreadable")
+        return rules(root)
+
+    monkeypatch.setattr(file_routes.IgnoreRules, "for_project", for_project)
+
+    with client.websocket_connect("/projects/web/ws/files") as ws:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+
+    assert closed.value.code == 1011
+    assert hub.subscribed == 0
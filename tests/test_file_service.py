@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from agent_v1.api.file_service import FileService
+from agent_v1.tools.utils import ProjectFS, api_read_file
+
+FILE_MB = 32
+READS = 4
+TICK_SECONDS = 0.001
+
+
+async def _max_loop_lag(work) -> float:
+    """Longest stall of a 1 ms ticker on the loop while `work()` runs."""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            start = time.monotonic()
+            await asyncio.sleep(TICK_SECONDS)
+            lag = max(lag, time.monotonic() - start - TICK_SECONDS)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    try:
+        await work()
+    finally:
+        done.set()
+        await task
+    return lag
+
+
+def test_large_reads_do_not_block_the_event_loop(tmp_path):
+    (tmp_path / "big.txt").write_text("x" * (FILE_MB << 20))
+    fs = ProjectFS(tmp_path)
+    service = FileService(max_workers=READS)
+
+    async def inline():
+        for _ in range(READS):
+            api_read_file(fs, "big.txt")
+
+    async def pooled():
+        contents = await asyncio.gather(
+            *(service.read_file(fs, "big.txt") for _ in range(READS))
+        )
+        assert all(len(c) == FILE_MB << 20 for c in contents)
+
+    async def main():
+        return await _max_loop_lag(inline), await _max_loop_lag(pooled)
+
+    try:
+        blocked, lag = asyncio.run(main())
+    finally:
+        service.shutdown()
+
+    # Inline reads stall the loop for their whole duration; the same
+    # reads on the pool must not
+    assert lag < blocked / 2, (lag, blocked)
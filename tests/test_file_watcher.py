@@ -0,0 +1,95 @@
+import asyncio
+import os
+
+import pytest
+from watchfiles import Change, awatch
+
+from agent_v1.api import file_watcher
+from agent_v1.api.file_watcher import FileChange, _Watcher, watched_dirs
+from agent_v1.tools.listing import DEFAULT_IGNORE_PATTERNS, IgnoreRules
+
+
+@pytest.mark.parametrize(
+    "rel, kept",
+    [
+        ("src/app.py", True),
+        ("node_modules/react/index.js", False),
+        ("pkg/__pycache__/mod.cpython-312.pyc", False),
+        ("app.pyc", False),
+        # Might be a directory (dropped by consumers) or a plain file
+        ("node_modules", True),
+        ("venv", True),
+    ],
+)
+def test_filter_never_stats_paths(tmp_path, monkeypatch, rel, kept):
+    def no_disk(*args, **kwargs):
+        raise AssertionError("watch filter touched the disk")
+
+    async def main():
+        watcher = _Watcher(tmp_path, debounce_ms=10, force_polling=False)
+        try:
+            with monkeypatch.context() as m:
+                m.setattr(os.path, "isdir", no_disk)
+                m.setattr(os, "stat", no_disk)
+                return [
+                    watcher._filter(change, str(tmp_path / rel))
+                    for change in (Change.added, Change.modified, Change.deleted)
+                ]
+        finally:
+            await watcher.close()
+
+    assert asyncio.run(main()) == [kept] * 3
+
+
+def test_ignored_trees_get_no_watch(tmp_path):
+    for rel in ["src/app", "node_modules/react/lib", ".git/objects", "pkg/__pycache__"]:
+        (tmp_path / rel).mkdir(parents=True)
+    (tmp_path / "link").symlink_to(tmp_path / "src")
+
+    dirs = watched_dirs(tmp_path, IgnoreRules(DEFAULT_IGNORE_PATTERNS))
+
+    assert sorted(os.path.relpath(d, tmp_path) for d in dirs) == [
+        ".", "pkg", "src", "src/app",
+    ]
+
+
+async def _wait_for(predicate, what):
+    for _ in range(500):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"timed out waiting for {what}")
+
+
+def test_created_directory_is_watched(tmp_path, monkeypatch):
+    (tmp_path / "node_modules").mkdir()
+    watches = []
+
+    def spy_awatch(*paths, **options):
+        assert options["recursive"] is False
+        watches.append(sorted(os.path.relpath(p, tmp_path) for p in paths))
+        return awatch(*paths, **options)
+
+    monkeypatch.setattr(file_watcher, "awatch", spy_awatch)
+
+    async def main():
+        changes = []
+        watcher = _Watcher(tmp_path, debounce_ms=10, force_polling=False)
+        watcher.listeners.add(changes.extend)
+        try:
+            await _wait_for(lambda: watches, "the first watch")
+            await asyncio.sleep(0.1)
+            (tmp_path / "lib").mkdir()
+            await _wait_for(lambda: len(watches) == 2, "the watch to restart")
+
+            await asyncio.sleep(0.1)
+            (tmp_path / "lib" / "app.py").write_text("x")
+            await _wait_for(lambda: FileChange("created", "lib/app.py") in changes, "lib/app.py")
+            return changes
+        finally:
+            await watcher.close()
+
+    changes = asyncio.run(main())
+
+    assert watches == [["."], [".", "lib"]]
+    assert FileChange("created", "lib") in changes
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+
+from agent_v1.api import generation_routes
+from agent_v1.api.db.models import GenerationJob, Project, User
+from agent_v1.api.schemas.graph import GenerateProjectRequest
+from agent_v1.jobs import worker_pool
+from agent_v1.jobs.worker_pool import GenerationWorkerPool
+
+
+def _user(**fields) -> dict:
+    return dict(
+        username="alice",
+        name="Alice",
+        email="alice@example.com",
+        phone="1",
+        current_status="other",
+        password_hash="x",
+        **fields,
+    )
+
+
+def _frames(body: str):
+    for block in body.strip().split("\n\n"):
+        lines = block.split("\n")
+        if lines[0].startswith("event: "):
+            yield lines[0][len("event: "):], json.loads(lines[1][len("data: "):])
+
+
+def test_stream_route_runs_through_the_job_queue(run_db, monkeypatch, tmp_path):
+    def fake_stream_agent(prompt, workers, snapshot_steps):
+        yield {"event": "coder_started", "project_root": str(tmp_path / "demo"), "total": 1}
+        yield {"event": "step_completed", "step": 0, "filepath": "index.html", "completed": 1, "total": 1}
+        yield {
+            "event": "generation_completed",
+            "coder_state": SimpleNamespace(project_root=str(tmp_path / "demo")),
+        }
+
+    async def fake_create(project_root, owner_id):
+        return await Project.create(name="demo", project_root=project_root, owner_id=owner_id)
+
+    monkeypatch.setattr(worker_pool, "stream_agent", fake_stream_agent)
+    monkeypatch.setattr(worker_pool, "create_generated_project", fake_create)
+
+    async def main():
+        pool = GenerationWorkerPool(workers=1, poll_interval=60, stale_after=timedelta(minutes=5))
+        monkeypatch.setattr(generation_routes, "generation_workers", pool)
+        await pool.start()
+
+        try:
+            user = await User.create(**_user())
+            response = await generation_routes.generate_project_stream(
+                GenerateProjectRequest(prompt="a demo page"), user
+            )
+            body = "".join([chunk async for chunk in response.body_iterator])
+            job = await GenerationJob.get()
+        finally:
+            await pool.stop()
+
+        return job, list(_frames(body))
+
+    job, frames = run_db(main)
+
+    assert [event for event, _ in frames] == [
+        "job_queued", "coder_started", "step_completed", "generation_completed",
+    ]
+    assert frames[0][1]["job_id"] == str(job.id)
+    assert frames[-1][1]["project_name"] == "demo"
+    assert job.status == "succeeded"
+
+
+def test_stream_disconnect_leaves_job_running(run_db, monkeypatch):
+    async def main():
+        pool = GenerationWorkerPool(workers=1, poll_interval=60, stale_after=timedelta(minutes=5))
+        monkeypatch.setattr(generation_routes, "generation_workers", pool)
+
+        user = await User.create(**_user())
+        response = await generation_routes.generate_project_stream(
+            GenerateProjectRequest(prompt="a demo page"), user
+        )
+        job = await GenerationJob.get()
+        assert pool._listeners[job.id]
+
+        # Client goes away after the first frame
+        frames = response.body_iterator
+        await frames.__anext__()
+        await frames.aclose()
+
+        assert job.id not in pool._listeners
+        return await GenerationJob.get(id=job.id)
+
+    job = run_db(main)
+
+    assert job.status == "queued"
+
+
+def _pipeline(tmp_path, first_run_gate):
+    """Fake stream_agent; the first run blocks (a long LLM call) until released."""
+    runs = []
+
+    def fake_stream_agent(prompt, workers, snapshot_steps):
+        runs.append(prompt)
+        if len(runs) == 1:
+            assert first_run_gate.wait(10)
+        yield {
+            "event": "generation_completed",
+            "coder_state": SimpleNamespace(project_root=str(tmp_path / f"demo-{len(runs)}")),
+        }
+
+    return fake_stream_agent, runs
+
+
+async def _wait_for_status(job_id, status):
+    for _ in range(500):
+        job = await GenerationJob.get(id=job_id)
+        if job.status == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stayed {job.status}")
+
+
+def test_heartbeat_keeps_silent_job_from_turning_stale(run_db, monkeypatch, tmp_path):
+    gate = threading.Event()
+    fake_stream_agent, runs = _pipeline(tmp_path, gate)
+    monkeypatch.setattr(worker_pool, "stream_agent", fake_stream_agent)
+
+    async def fake_create(project_root, owner_id):
+        return await Project.create(name="demo", project_root=project_root, owner_id=owner_id)
+
+    monkeypatch.setattr(worker_pool, "create_generated_project", fake_create)
+
+    async def main():
+        pool = GenerationWorkerPool(
+            workers=1, poll_interval=60, stale_after=timedelta(minutes=5),
+            heartbeat_interval=0.05,
+        )
+        await pool.start()
+        try:
+            user = await User.create(**_user())
+            job = await pool.repo.create(owner=user, prompt="a demo page")
+            pool.notify()
+            await _wait_for_status(job.id, "running")
+
+            # The pipeline emits nothing for a while
+            await asyncio.sleep(0.5)
+            requeued = await pool.repo.requeue_stale(timedelta(seconds=0.3))
+
+            gate.set()
+            return requeued, await _wait_for_status(job.id, "succeeded")
+        finally:
+            gate.set()
+            await pool.stop()
+
+    requeued, job = run_db(main)
+
+    assert requeued == 0
+    assert runs == ["a demo page"]
+
+
+def test_requeued_job_is_not_completed_by_its_old_run(run_db, monkeypatch, tmp_path):
+    gate = threading.Event()
+    fake_stream_agent, runs = _pipeline(tmp_path, gate)
+    monkeypatch.setattr(worker_pool, "stream_agent", fake_stream_agent)
+
+    async def fake_create(project_root, owner_id):
+        name = project_root.rsplit("/", 1)[-1]
+        return await Project.create(name=name, project_root=project_root, owner_id=owner_id)
+
+    monkeypatch.setattr(worker_pool, "create_generated_project", fake_create)
+
+    async def main():
+        pool = GenerationWorkerPool(
+            workers=1, poll_interval=0.05, stale_after=timedelta(minutes=5),
+            heartbeat_interval=60,
+        )
+        await pool.start()
+        try:
+            user = await User.create(**_user())
+            job = await pool.repo.create(owner=user, prompt="a demo page")
+            pool.notify()
+            await _wait_for_status(job.id, "running")
+
+            # Another node's startup considers the job abandoned
+            assert await pool.repo.requeue_stale(timedelta(0)) == 1
+
+            gate.set()
+            job = await _wait_for_status(job.id, "succeeded")
+            return job, await Project.all().values_list("name", flat=True)
+        finally:
+            gate.set()
+            await pool.stop()
+
+    job, projects = run_db(main)
+
+    # The first run lost its claim and registered nothing; the second
+    # run (claimed after the requeue) completed the job
+    assert len(runs) == 2
+    assert projects == ["demo-2"]
+    assert job.project_id is not None
+
+
+def test_stale_job_is_reclaimed_while_the_pool_runs(run_db, monkeypatch, tmp_path):
+    fake_stream_agent, runs = _pipeline(tmp_path, threading.Event())
+    runs.append("the dead worker's run")  # only the first run blocks
+    monkeypatch.setattr(worker_pool, "stream_agent", fake_stream_agent)
+
+    async def fake_create(project_root, owner_id):
+        return await Project.create(name="demo", project_root=project_root, owner_id=owner_id)
+
+    monkeypatch.setattr(worker_pool, "create_generated_project", fake_create)
+
+    async def main():
+        pool = GenerationWorkerPool(
+            workers=1, poll_interval=60, stale_after=timedelta(seconds=0.2),
+            heartbeat_interval=0.05,
+        )
+        await pool.start()
+        try:
+            # Claimed by a worker that died without a heartbeat since
+            user = await User.create(**_user())
+            job = await pool.repo.create(owner=user, prompt="a demo page")
+            await GenerationJob.filter(id=job.id).update(
+                status="running",
+                started_at=job.created_at - timedelta(minutes=1),
+                updated_at=job.created_at - timedelta(minutes=1),
+            )
+
+            return await _wait_for_status(job.id, "succeeded")
+        finally:
+            await pool.stop()
+
+    job = run_db(main)
+
+    assert runs == ["the dead worker's run", "a demo page"]
+    assert job.project_id is not None
+
+
+def test_stream_ends_with_error_when_the_job_is_deleted(run_db, monkeypatch):
+    monkeypatch.setattr(generation_routes, "SSE_KEEPALIVE_SECONDS", 0.01)
+
+    async def main():
+        pool = GenerationWorkerPool(workers=1, poll_interval=60, stale_after=timedelta(minutes=5))
+        monkeypatch.setattr(generation_routes, "generation_workers", pool)
+
+        user = await User.create(**_user())
+        response = await generation_routes.generate_project_stream(
+            GenerateProjectRequest(prompt="a demo page"), user
+        )
+        frames = response.body_iterator
+        first = await frames.__anext__()
+
+        await GenerationJob.all().delete()
+        rest = [chunk async for chunk in frames]
+        return "".join([first, *rest])
+
+    frames = list(_frames(run_db(main)))
+
+    assert [event for event, _ in frames] == ["job_queued", "error"]
+    assert frames[-1][1] == {"detail": "Job no longer exists"}
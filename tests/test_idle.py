@@ -0,0 +1,47 @@
+from agent_v1.runtime import idle as idle_module
+from agent_v1.runtime.idle import IdleReaper
+from agent_v1.runtime.metrics import MetricSample, MetricsCollector
+from tests.helpers import create_project, create_runtime, create_user
+
+
+def _sample(time: float, cpu_percent: float = 0.0, network_bytes: int = 0) -> MetricSample:
+    return MetricSample(
+        time=time,
+        cpu_percent=cpu_percent,
+        memory_bytes=0,
+        memory_limit_bytes=0,
+        network_rx_bytes=network_bytes,
+        network_tx_bytes=0,
+        block_read_bytes=0,
+        block_write_bytes=0,
+        pids=1,
+    )
+
+
+def test_idle_detection_reads_collected_samples(run_db, monkeypatch):
+    collector = MetricsCollector(history=10)
+    hibernated = []
+
+    async def hibernate_container(project_name, action):
+        hibernated.append(project_name)
+
+    monkeypatch.setattr(idle_module, "metrics_collector", collector)
+    monkeypatch.setattr(idle_module.docker_manager, "hibernate_container", hibernate_container)
+
+    async def main():
+        user = await create_user()
+        for name in ("busy", "quiet", "new"):
+            await create_runtime(await create_project(user, name), "running")
+
+        reaper = IdleReaper(idle_minutes=0, action="stop")
+        for name in ("busy", "quiet"):
+            collector._record(name, _sample(1))
+        collector._record("busy", _sample(2, network_bytes=1 << 20))
+        collector._record("quiet", _sample(2, cpu_percent=0.5, network_bytes=100))
+
+        await reaper.sweep()
+
+    run_db(main)
+
+    # "new" has no samples yet and is left alone
+    assert hibernated == ["quiet"]
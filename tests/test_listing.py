@@ -0,0 +1,77 @@
+import pytest
+
+from agent_v1.tools.listing import IgnoreRules, iter_tree, list_tree
+
+
+@pytest.mark.parametrize(
+    "patterns, path, is_dir, ignored",
+    [
+        # Negation: later rules override earlier ones
+        (["*.log", "!keep.log"], "debug.log", False, True),
+        (["*.log", "!keep.log"], "logs/keep.log", False, False),
+        (["!keep.log", "*.log"], "keep.log", False, True),
+        # Directory-only rules
+        (["build/"], "build", True, True),
+        (["build/"], "build", False, False),
+        (["build/"], "src/build", True, True),
+        # Anchored rules (leading or inner slash) only match from the root
+        (["/dist"], "dist", True, True),
+        (["/dist"], "src/dist", True, False),
+        (["docs/*.md"], "docs/intro.md", False, True),
+        (["docs/*.md"], "src/docs/intro.md", False, False),
+        (["docs/**/*.md"], "docs/api/v1/intro.md", False, True),
+        # Unanchored rules match at any depth
+        (["*.tmp"], "a/b/c.tmp", False, True),
+        (["# comment", "", "\\#notes"], "#notes", False, True),
+    ],
+)
+def test_ignore_rules(patterns, path, is_dir, ignored):
+    assert IgnoreRules(patterns).is_ignored(path, is_dir) is ignored
+
+
+def test_ignored_parent_hides_single_path_lookups():
+    rules = IgnoreRules(["node_modules/", "!node_modules/keep.js"])
+
+    assert not rules.is_ignored("node_modules/keep.js", False)
+    assert rules.is_ignored_path("node_modules/keep.js", False)
+
+
+@pytest.fixture
+def project(tmp_path):
+    for rel in ["a.txt", "lib/b.js", "lib/c/d.js", "lib/e.js", "z.txt", "node_modules/x.js"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    return tmp_path
+
+
+def _paths(entries):
+    return [entry.path for entry in entries]
+
+
+@pytest.mark.parametrize("include_dirs", [False, True])
+def test_pages_concatenate_to_the_full_listing(project, include_dirs):
+    ignore = IgnoreRules.for_project(project)
+    options = dict(ignore=ignore, include_dirs=include_dirs)
+    expected = _paths(iter_tree(project, project, **options))
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = list_tree(project, project, limit=2, cursor=cursor, **options)
+        pages.extend(page)
+        if cursor is None:
+            break
+
+    assert _paths(pages) == expected
+    assert "node_modules/x.js" not in expected
+
+
+def test_cursor_on_a_directory_resumes_inside_it(project):
+    ignore = IgnoreRules.for_project(project)
+
+    page, cursor = list_tree(project, project, limit=2, ignore=ignore, include_dirs=True)
+    rest, _ = list_tree(project, project, cursor=cursor, ignore=ignore, include_dirs=True)
+
+    assert _paths(page) == ["a.txt", "lib"]
+    assert cursor == "lib"
+    assert _paths(rest) == ["lib/b.js", "lib/c", "lib/c/d.js", "lib/e.js", "z.txt"]
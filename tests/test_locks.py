@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from agent_v1.runtime.locks import RuntimeLocks
+
+
+def _counting_operation():
+    calls = []
+    release = asyncio.Event()
+
+    async def operation(project_name, *args):
+        calls.append((project_name, *args))
+        await release.wait()
+        return f"{project_name}:{len(calls)}"
+
+    return operation, calls, release
+
+
+def test_identical_concurrent_operations_run_once():
+    async def main():
+        locks = RuntimeLocks(backend="local")
+        operation, calls, release = _counting_operation()
+
+        callers = [
+            asyncio.create_task(locks.run("start", "web", operation))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+
+        return await asyncio.gather(*callers), calls, locks
+
+    results, calls, locks = asyncio.run(main())
+
+    assert calls == [("web",)]
+    assert results == ["web:1"] * 3
+    assert locks._inflight == {} and locks._locks == {}
+
+
+def test_operations_with_other_args_or_projects_are_not_coalesced():
+    async def main():
+        locks = RuntimeLocks(backend="local")
+        operation, calls, release = _counting_operation()
+
+        callers = [
+            asyncio.create_task(locks.run("resize", "web", operation, "small")),
+            asyncio.create_task(locks.run("resize", "web", operation, "large")),
+            asyncio.create_task(locks.run("resize", "api", operation, "small")),
+        ]
+        await asyncio.sleep(0.01)
+        # The project lock serializes the two "web" operations
+        in_flight = list(calls)
+
+        release.set()
+        await asyncio.gather(*callers)
+        return in_flight, calls
+
+    in_flight, calls = asyncio.run(main())
+
+    assert in_flight == [("web", "small"), ("api", "small")]
+    assert sorted(calls) == [("api", "small"), ("web", "large"), ("web", "small")]
+
+
+def test_caller_going_away_does_not_cancel_the_shared_operation():
+    async def main():
+        locks = RuntimeLocks(backend="local")
+        operation, calls, release = _counting_operation()
+
+        leaving = asyncio.create_task(locks.run("start", "web", operation))
+        staying = asyncio.create_task(locks.run("start", "web", operation))
+        await asyncio.sleep(0.01)
+
+        leaving.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying, calls
+
+    result, calls = asyncio.run(main())
+
+    assert result == "web:1"
+    assert calls == [("web",)]
@@ -0,0 +1,82 @@
+import asyncio
+
+from agent_v1.runtime import metrics as metrics_module
+from agent_v1.runtime.metrics import MetricsCollector
+from tests.helpers import create_project, create_runtime, create_user
+
+
+def _stats(cpu_ns: int, system_ns: int) -> dict:
+    return {
+        "read": "2026-01-01T00:00:00Z",
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": cpu_ns},
+            "system_cpu_usage": system_ns,
+            "online_cpus": 1,
+        },
+        "memory_stats": {"usage": 1024, "limit": 4096},
+    }
+
+
+class FakeDocker:
+    def __init__(self):
+        self.one_shots = []
+        self.streams = []
+        self.readings = iter([_stats(0, 0), _stats(10, 100)])
+
+    async def get(self, path, **params):
+        self.one_shots.append(path)
+        return next(self.readings)
+
+    async def stream(self, method, path, params=None):
+        self.streams.append(path)
+        yield _stats(20, 200)
+        await asyncio.Event().wait()
+
+
+def test_unwatched_runtimes_are_sampled_without_streams(run_db, monkeypatch):
+    docker = FakeDocker()
+    monkeypatch.setattr(metrics_module, "docker_client", docker)
+
+    async def main():
+        await create_runtime(await create_project(await create_user(), "web"), "running")
+
+        collector = MetricsCollector(history=10)
+        await collector.sweep()
+        await collector.sweep()
+        return collector.samples("web")
+
+    samples = run_db(main)
+
+    assert docker.streams == []
+    assert docker.one_shots == ["/containers/ai-builder-web/stats"] * 2
+    # The second one-shot sample is measured against the first
+    assert [s.cpu_percent for s in samples] == [0.0, 10.0]
+
+
+def test_stream_lives_as_long_as_its_subscribers(run_db, monkeypatch):
+    docker = FakeDocker()
+    monkeypatch.setattr(metrics_module, "docker_client", docker)
+
+    async def main():
+        await create_runtime(await create_project(await create_user(), "web"), "running")
+
+        collector = MetricsCollector(history=10)
+        received = []
+        unsubscribe = collector.subscribe("web", received.append)
+
+        await collector.sweep()
+        await asyncio.sleep(0.01)
+        stream = collector._streams["web"]
+
+        unsubscribe()
+        await asyncio.sleep(0.01)
+        return received, stream, collector._streams
+
+    received, stream, streams = run_db(main)
+
+    # Watched projects stream instead of being sampled
+    assert docker.one_shots == []
+    assert docker.streams == ["/containers/ai-builder-web/stats"]
+    assert len(received) == 1
+    assert stream.cancelled()
+    assert streams == {}
@@ -0,0 +1,87 @@
+from agent_v1.api.db.models import Project, ProjectRuntime, User
+from agent_v1.runtime import reconcile
+
+
+async def _runtime(owner: User, name: str, status: str) -> ProjectRuntime:
+    project = await Project.create(name=name, project_root=f"/projects/{name}", owner=owner)
+    return await ProjectRuntime.create(
+        project=project,
+        project_root=project.project_root,
+        container_name=f"ai-builder-{name}",
+        status=status,
+    )
+
+
+async def _owner() -> User:
+    return await User.create(
+        username="alice",
+        name="Alice",
+        email="alice@example.com",
+        phone="1",
+        current_status="other",
+        password_hash="x",
+    )
+
+
+def test_reconcile_applies_docker_state(run_db, monkeypatch):
+    async def states():
+        return {"ai-builder-web": "running", "ai-builder-api": "paused"}
+
+    monkeypatch.setattr(reconcile, "container_states", states)
+
+    async def main():
+        owner = await _owner()
+        await _runtime(owner, "web", "stopped")
+        await _runtime(owner, "api", "running")
+        await _runtime(owner, "gone", "running")
+        await _runtime(owner, "asleep", "hibernated")
+
+        changed = await reconcile.reconcile_runtimes()
+        rows = dict(await ProjectRuntime.all().values_list("container_name", "status"))
+        return changed, rows
+
+    changed, rows = run_db(main)
+
+    assert changed == {"running": 1, "paused": 1, "stopped": 1}
+    assert rows == {
+        "ai-builder-web": "running",
+        "ai-builder-api": "paused",
+        "ai-builder-gone": "stopped",
+        "ai-builder-asleep": "hibernated",
+    }
+
+
+def test_reconcile_keeps_status_changed_after_it_was_read(run_db, monkeypatch):
+    async def states():
+        return {}
+
+    monkeypatch.setattr(reconcile, "container_states", states)
+    all_runtimes = ProjectRuntime.all
+
+    class Racing:
+        """Rows are read, then the idle reaper hibernates the runtime."""
+
+        def values_list(self, *fields):
+            async def read():
+                rows = await all_runtimes().values_list(*fields)
+                await ProjectRuntime.filter(container_name="ai-builder-web").update(
+                    status="hibernated"
+                )
+                return rows
+
+            return read()
+
+    async def main():
+        owner = await _owner()
+        await _runtime(owner, "web", "running")
+
+        with monkeypatch.context() as m:
+            m.setattr(ProjectRuntime, "all", classmethod(lambda cls: Racing()))
+            changed = await reconcile.reconcile_runtimes()
+
+        return changed, await ProjectRuntime.get(container_name="ai-builder-web")
+
+    changed, runtime = run_db(main)
+
+    assert changed == {}
+    assert runtime.status == "hibernated"
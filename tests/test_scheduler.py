@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from agent_v1.graph.scheduler import build_step_dependencies, run_steps
+from agent_v1.graph.states import ImplementationTask
+
+
+def _step(filepath, *depends_on):
+    return ImplementationTask(
+        filepath=filepath, task_description="write it", depends_on=list(depends_on)
+    )
+
+
+def test_dependencies_follow_writers_and_readers():
+    steps = [
+        _step("lib/util.js"),                      # 0
+        _step("./index.html"),                     # 1
+        _step("app.js", "lib/util.js", "missing"),  # 2 reads util
+        _step("lib/util.js"),                      # 3 revisits util
+        _step("style.css"),                        # 4
+        _step("index.html", "app.js"),             # 5 revisits index
+    ]
+
+    assert build_step_dependencies(steps) == {
+        0: set(),
+        1: set(),
+        2: {0},
+        # Waits for the previous write and for the step still reading it
+        3: {0, 2},
+        4: set(),
+        5: {1, 2},
+    }
+
+
+def test_independent_steps_run_concurrently():
+    steps = [_step(f"file-{i}.txt") for i in range(3)]
+    barrier = threading.Barrier(len(steps), timeout=5)
+
+    # Deadlocks (BrokenBarrierError) unless all three run at once
+    order = run_steps(steps, lambda idx, step: barrier.wait(), max_workers=3)
+
+    assert sorted(order) == [0, 1, 2]
+
+
+def test_running_steps_are_bounded_by_max_workers():
+    steps = [_step(f"file-{i}.txt") for i in range(6)]
+    lock = threading.Lock()
+    running = peak = 0
+
+    def run_step(idx, step):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    order = run_steps(steps, run_step, max_workers=2)
+
+    assert sorted(order) == list(range(6))
+    assert peak == 2
+
+
+def test_dependents_wait_for_their_dependencies():
+    steps = [_step("util.js"), _step("app.js", "util.js")]
+    started = []
+
+    def run_step(idx, step):
+        started.append(idx)
+        if idx == 0:
+            time.sleep(0.05)
+
+    assert run_steps(steps, run_step, max_workers=2) == [0, 1]
+    assert started == [0, 1]
+
+
+def test_failing_step_stops_its_dependents():
+    steps = [_step("util.js"), _step("app.js", "util.js"), _step("index.html", "app.js")]
+    started = []
+
+    def run_step(idx, step):
+        started.append(idx)
+        if idx == 0:
+            raise RuntimeError("LLM call failed")
+
+    with pytest.raises(RuntimeError, match="LLM call failed"):
+        run_steps(steps, run_step, max_workers=3)
+
+    assert started == [0]
+
+
+def test_completed_steps_are_skipped():
+    steps = [_step("util.js"), _step("app.js", "util.js")]
+    started = []
+
+    order = run_steps(steps, lambda idx, step: started.append(idx), 2, completed={0})
+
+    assert order == started == [1]
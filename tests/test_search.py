@@ -0,0 +1,78 @@
+import os
+import re
+
+import pytest
+
+from agent_v1.tools.listing import IgnoreRules
+from agent_v1.tools.search import (
+    index_file,
+    index_tree,
+    nested_quantifier,
+    query_trigrams,
+    search_files,
+    trigrams,
+)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    outside = tmp_path / "host"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("TOKEN=hunter2\n")
+
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "app.py").write_text("TOKEN = None\n")
+    os.symlink(outside / "secret.txt", root / "leak.txt")
+    os.symlink(outside, root / "hostdir")
+
+    return root.resolve()
+
+
+def test_index_skips_symlinks(workspace):
+    docs = index_tree(workspace, workspace, IgnoreRules.for_project(workspace))
+
+    assert [doc.path for doc in docs] == ["app.py"]
+    assert index_file(workspace, "leak.txt") is None
+    assert index_file(workspace, "hostdir/secret.txt") is None
+
+
+def test_search_never_reads_through_symlinks(workspace):
+    paths = ["app.py", "leak.txt", "hostdir/secret.txt"]
+    matches, searched, truncated = search_files(
+        workspace, paths, re.compile("TOKEN"), limit=10
+    )
+
+    assert [m["path"] for m in matches] == ["app.py"]
+    assert searched == 1
+    assert not truncated
+
+
+@pytest.mark.parametrize(
+    "pattern, nested",
+    [
+        ("(a+)+$", True),
+        ("(\\w*x)*", True),
+        ("((ab)*c)+", True),
+        ("(a|b){2,}", False),
+        ("(ab)+c*", False),
+        ("def \\w+\\(", False),
+        ("[(+]+", False),
+    ],
+)
+def test_nested_quantifier(pattern, nested):
+    assert nested_quantifier(pattern) is nested
+
+
+def test_inline_flags_disable_pruning():
+    assert query_trigrams("(?x) foo bar", regex=True) is None
+    assert query_trigrams("(?i:hello)", regex=True) is None
+    assert query_trigrams("hello", regex=True) == trigrams("hello")
+
+
+def test_search_stops_at_deadline(workspace):
+    matches, searched, truncated = search_files(
+        workspace, ["app.py"], re.compile("TOKEN"), limit=10, deadline=0
+    )
+
+    assert (matches, searched, truncated) == ([], 0, True)
@@ -0,0 +1,25 @@
+import pytest
+
+from agent_v1.api.snapshot_routes import _can_link
+from tests.helpers import create_project, create_runtime, create_user
+
+
+@pytest.mark.parametrize(
+    "status, link",
+    [
+        (None, True),
+        ("stopped", True),
+        ("hibernated", True),
+        ("running", False),
+        # Resumes through unpause, writing to whatever inodes it has
+        ("paused", False),
+    ],
+)
+def test_snapshots_only_link_without_a_live_container(run_db, status, link):
+    async def main():
+        project = await create_project(await create_user(), "web")
+        if status is not None:
+            await create_runtime(project, status)
+        return await _can_link(project)
+
+    assert run_db(main) is link
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from agent_v1.storage.snapshots import SnapshotStore, _link_or_copy
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(root=tmp_path / "snapshots")
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    return root
+
+
+def test_link_or_copy_recreates_symlinks(tmp_path):
+    secret = tmp_path / "secret"
+    secret.write_text("host")
+    os.symlink(secret, tmp_path / "link")
+
+    for link in (True, False):
+        dst = tmp_path / f"copy-{link}"
+        assert _link_or_copy(tmp_path / "link", dst, link)
+        assert dst.is_symlink()
+        assert os.readlink(dst) == str(secret)
+
+
+def test_snapshot_skips_links_outside_root(store, project, tmp_path):
+    (tmp_path / "host").mkdir()
+    (tmp_path / "host" / ".env").write_text("SECRET=1")
+    (project / "app.py").write_text("v1")
+    os.symlink(tmp_path / "host" / ".env", project / "leak")
+
+    info = store.create(project)
+
+    tree = store.root / project.name / info.id / "tree"
+    assert sorted(os.listdir(tree)) == ["app.py"]
+    assert info.files == 1
+
+
+def test_restore_file_replaced_by_directory(store, project):
+    (project / "a").mkdir()
+    (project / "a" / "f.txt").write_text("in dir")
+    (project / "b").write_text("file")
+    info = store.create(project)
+
+    # a: directory -> file, b: file -> directory
+    (project / "a" / "f.txt").unlink()
+    (project / "a").rmdir()
+    (project / "a").write_text("now a file")
+    (project / "b").unlink()
+    (project / "b").mkdir()
+    (project / "b" / "g.txt").write_text("now a dir")
+
+    store.restore(project, info.id)
+
+    assert (project / "a" / "f.txt").read_text() == "in dir"
+    assert (project / "b").read_text() == "file"
+
+
+def test_restore_never_writes_through_symlinked_parent(store, project, tmp_path):
+    (project / "d").mkdir()
+    (project / "d" / "f.txt").write_text("mine")
+    info = store.create(project)
+
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (project / "d" / "f.txt").unlink()
+    (project / "d").rmdir()
+    os.symlink(outside, project / "d")
+
+    store.restore(project, info.id)
+
+    assert not (project / "d").is_symlink()
+    assert (project / "d" / "f.txt").read_text() == "mine"
+    assert os.listdir(outside) == []